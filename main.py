@@ -1,12 +1,15 @@
 import os
 import sys
+import json
 import time
 import signal
+import socket
 import subprocess
 from pathlib import Path
-import requests  
+import requests
 
 from src.vision_guided_robot_navigation.orchestration.app.bootstrap import run_workcell
+from src.vision_guided_robot_navigation.logging import create_logger, PhaseTimer
 
 REPO_ROOT = Path(__file__).resolve().parent
 
@@ -14,19 +17,86 @@ VISION_CONDA_ENV = os.getenv("VISION_CONDA_ENV", "vision313")
 VISION_HOST = os.getenv("VISION_HOST", "127.0.0.1")
 VISION_PORT = int(os.getenv("VISION_PORT", "8010"))
 VISION_HEALTH_URL = f"http://{VISION_HOST}:{VISION_PORT}/health"
+VISION_READY_URL = f"http://{VISION_HOST}:{VISION_PORT}/ready"
 
 # Запускается vision в py313 env:
 VISION_MODULE = os.getenv("VISION_MODULE", "vision_service.orchestration.app.bootstrap")
 
+# VISION_WORKERS > 1: несколько процессов с моделью за диспетчером на том же VISION_PORT
+VISION_WORKERS = int(os.getenv("VISION_WORKERS", "1"))
+VISION_FLEET_MODULE = "vision_service.orchestration.fleet.bootstrap"
+
+# Интерпретатор vision-окружения определяется через conda один раз и кэшируется здесь.
+# VISION_PYTHON задаёт его явно и отключает обращение к conda совсем.
+VISION_PYTHON = os.getenv("VISION_PYTHON")
+VISION_PYTHON_CACHE = REPO_ROOT / ".cache" / "vision_python.json"
+
+STARTUP_LOGGER = create_logger("ProjectR.startup", "startup.log")
+
+def _probe_conda_env(env_name: str) -> dict[str, str]:
+    """Медленный путь: один раз спрашиваем у conda, где лежит python окружения."""
+    out = subprocess.run(
+        [
+            "conda", "run", "-n", env_name,
+            "python", "-c", "import sys, json; print(json.dumps({'executable': sys.executable, 'prefix': sys.prefix}))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    # conda run может добавить свои строки — берём последнюю непустую
+    return json.loads(out.strip().splitlines()[-1])
+
+def _resolve_vision_python() -> dict[str, str]:
+    """Возвращает {'executable', 'prefix'} интерпретатора vision-окружения."""
+    if VISION_PYTHON:
+        executable = Path(VISION_PYTHON)
+        return {"executable": str(executable), "prefix": str(executable.parent.parent if os.name != "nt" else executable.parent)}
+
+    try:
+        cache = json.loads(VISION_PYTHON_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+
+    cached = cache.get(VISION_CONDA_ENV)
+    if cached and Path(cached["executable"]).exists():
+        return cached
+
+    resolved = _probe_conda_env(VISION_CONDA_ENV)
+    cache[VISION_CONDA_ENV] = resolved
+    VISION_PYTHON_CACHE.parent.mkdir(exist_ok=True)
+    VISION_PYTHON_CACHE.write_text(json.dumps(cache, indent=2), encoding="utf-8")
+    return resolved
+
+def _env_path_dirs(prefix: Path) -> list[str]:
+    """Каталоги, которые conda activate добавила бы в PATH (нужны для DLL на Windows)."""
+    if os.name == "nt":
+        return [str(prefix / d) for d in ("", "Library/mingw-w64/bin", "Library/usr/bin", "Library/bin", "Scripts")]
+    return [str(prefix / "bin")]
+
+def _open_ready_listener() -> socket.socket:
+    """Сокет, на который vision-процесс пришлёт 'ready' после старта сервера."""
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    return listener
+
 def _start_vision() -> subprocess.Popen:
-    cmd = [
-        "conda", "run",
-        "-n", VISION_CONDA_ENV,
-        "python", "-m", VISION_MODULE,
-    ]
+    python = _resolve_vision_python()
+    module = VISION_FLEET_MODULE if VISION_WORKERS > 1 else VISION_MODULE
+    cmd = [python["executable"], "-m", module]
+
+    ready_listener = _open_ready_listener()
+    ready_host, ready_port = ready_listener.getsockname()
 
     env = os.environ.copy()
     env["PYTHONPATH"] = str(REPO_ROOT / "src") + os.pathsep + env.get("PYTHONPATH", "")
+    env["PATH"] = os.pathsep.join(_env_path_dirs(Path(python["prefix"])) + [env.get("PATH", "")])
+    env["CONDA_PREFIX"] = python["prefix"]
+    env["VISION_READY_ADDR"] = f"{ready_host}:{ready_port}"
+    env["VISION_WORKERS"] = str(VISION_WORKERS)
+    # vision (и воркеры флота) завершаются, когда мы закрываем stdin или падаем сами
+    env["VISION_EXIT_WITH_PARENT"] = "1"
 
     log_dir = REPO_ROOT / "logs"
     log_dir.mkdir(exist_ok=True)
@@ -38,16 +108,22 @@ def _start_vision() -> subprocess.Popen:
         cmd,
         cwd=str(REPO_ROOT),
         env=env,
+        stdin=subprocess.PIPE,
         stdout=log_file,
         stderr=subprocess.STDOUT,
         text=True,
     )
     proc._vision_log_file = log_file  # лёгкий хак, чтобы закрыть потом
+    proc._vision_log_path = log_path
+    proc._vision_ready_listener = ready_listener
     return proc
 
 def _stop_proc(proc: subprocess.Popen, grace_s: float = 5.0) -> None:
-    if getattr(proc, "_vision_log_file", None):
-        log_file = proc._vision_log_file
+    if getattr(proc, "_vision_ready_listener", None):
+        proc._vision_ready_listener.close()
+
+    if proc.stdin:
+        proc.stdin.close()
 
     if proc.poll() is None:
         proc.terminate()
@@ -59,39 +135,69 @@ def _stop_proc(proc: subprocess.Popen, grace_s: float = 5.0) -> None:
     if getattr(proc, "_vision_log_file", None):
         proc._vision_log_file.close()
 
-def _wait_vision_ready(proc: subprocess.Popen, timeout_s: float = 20.0) -> None:
-    deadline = time.time() + timeout_s
-    last_err: Exception | None = None
+def _vision_log_tail(proc: subprocess.Popen, size: int = 2000) -> str:
+    try:
+        proc._vision_log_file.flush()
+        return proc._vision_log_path.read_text(encoding="utf-8", errors="replace")[-size:]
+    except Exception:
+        return ""
 
-    while time.time() < deadline:
+def _wait_vision_ready(proc: subprocess.Popen, timeout_s: float = 20.0) -> None:
+    """
+    Ждём сигнал 'ready' от vision-процесса на сокете готовности (модель загружена и прогрета),
+    затем один раз подтверждаем через /ready. 'failed' (прогрев упал) — ошибка сразу.
+    Таймаут accept короткий только для того, чтобы сразу заметить падение процесса.
+    """
+    listener: socket.socket = proc._vision_ready_listener
+    listener.settimeout(0.2)
+    deadline = time.monotonic() + timeout_s
+
+    while time.monotonic() < deadline:
         # Если процесс умер — сразу падаем и показываем последние строки
         if proc.poll() is not None:
-            out = ""
-            try:
-                if proc.stdout:
-                    out = proc.stdout.read()[-2000:]
-            except Exception:
-                pass
-            raise RuntimeError(f"Vision process exited early with code {proc.returncode}. Output tail:\n{out}")
+            raise RuntimeError(f"Vision process exited early with code {proc.returncode}. Output tail:\n{_vision_log_tail(proc)}")
 
         try:
-            r = requests.get(VISION_HEALTH_URL, timeout=0.5)
-            if r.status_code == 200:
-                return
-        except Exception as e:
-            last_err = e
-
-        time.sleep(0.25)
+            conn, _ = listener.accept()
+        except socket.timeout:
+            continue
 
-    raise TimeoutError(f"Vision service not ready after {timeout_s}s. Last error: {last_err}")
+        with conn:
+            conn.settimeout(1.0)
+            try:
+                message = conn.recv(256)
+            except OSError:
+                continue    # чужое / оборванное соединение (socket.timeout, reset) — ждём дальше до deadline
+        if message.startswith(b"failed"):
+            # vision не будет готов (например, прогрев модели упал) — не ждём таймаута
+            raise RuntimeError(
+                f"Vision сообщил об ошибке запуска: {message.decode(errors='replace').strip()}. "
+                f"Output tail:\n{_vision_log_tail(proc)}"
+            )
+        if not message.startswith(b"ready"):
+            continue
+
+        # Сигнал приходит после прогрева; /ready подтверждает это и отдаёт тайминги
+        r = requests.get(VISION_READY_URL, timeout=2.0)
+        if r.status_code == 200:
+            STARTUP_LOGGER.info(f"Vision готов: {r.json()}")
+            return
+        raise RuntimeError(f"Vision прислал сигнал готовности, но /ready ответил {r.status_code}: {r.text}")
+
+    raise TimeoutError(f"Vision service not ready after {timeout_s}s. Output tail:\n{_vision_log_tail(proc)}")
 
 def main() -> None:
-    vision_proc = _start_vision()
-    try:
-        _wait_vision_ready(vision_proc, timeout_s=30.0)
+    timer = PhaseTimer(STARTUP_LOGGER)
 
-        # Дальше запускаем оркестрацию робота  (py310)
-        run_workcell()
+    with timer.phase("vision_spawn"):
+        vision_proc = _start_vision()
+    try:
+        # Дальше запускаем оркестрацию робота  (py310): подключение робота и раскладка
+        # идут параллельно с запуском vision, ожидание — только перед стартом потоков
+        run_workcell(
+            wait_vision=lambda: _wait_vision_ready(vision_proc, timeout_s=30.0),
+            timer=timer,
+        )
 
     finally:
         _stop_proc(vision_proc)
@@ -102,4 +208,3 @@ def main() -> None:
 
 if __name__ == "__main__":
     main()
-
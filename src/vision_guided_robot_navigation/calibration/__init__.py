@@ -0,0 +1,28 @@
+# src/vision_guided_robot_navigation/calibration/__init__.py
+
+"""
+Калибровка камера -> база робота.
+"""
+
+from .solver import solve_rigid_transform
+from .store import (
+    CameraCalibration,
+    CalibrationStore,
+    CalibrationCache,
+    calibrate_from_pairs,
+    load_point_pairs,
+    CALIBRATION_PATH,
+)
+
+__all__ = [
+    # Solver
+    "solve_rigid_transform",
+
+    # Store
+    "CameraCalibration",
+    "CalibrationStore",
+    "CalibrationCache",
+    "calibrate_from_pairs",
+    "load_point_pairs",
+    "CALIBRATION_PATH",
+]
\ No newline at end of file
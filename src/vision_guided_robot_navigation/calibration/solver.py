@@ -0,0 +1,44 @@
+# src/vision_guided_robot_navigation/calibration/solver.py
+"""
+Решение калибровки камера -> база робота по парам точек.
+
+Жёсткое преобразование (поворот + смещение) ищется методом Кабша (SVD),
+что эквивалентно МНК по сумме квадратов расстояний между парами.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def solve_rigid_transform(camera_points: np.ndarray, robot_points: np.ndarray) -> tuple[np.ndarray, float]:
+    """
+    camera_points, robot_points: (N, 3) соответствующие точки, N >= 3.
+    Возвращает (T 4x4: камера -> база, RMS ошибки в мм).
+    """
+    cam = np.asarray(camera_points, dtype=np.float64)
+    rob = np.asarray(robot_points, dtype=np.float64)
+    if cam.shape != rob.shape or cam.ndim != 2 or cam.shape[1] != 3:
+        raise ValueError(f"solve_rigid_transform: ожидаются массивы (N, 3), получено {cam.shape} и {rob.shape}")
+    if cam.shape[0] < 3:
+        raise ValueError("solve_rigid_transform: нужно минимум 3 пары точек")
+
+    cam_center = cam.mean(axis=0)
+    rob_center = rob.mean(axis=0)
+    cam_c = cam - cam_center
+    rob_c = rob - rob_center
+
+    # Вырожденный набор (все точки на одной прямой) не определяет поворот
+    if np.linalg.matrix_rank(cam_c, tol=1e-6) < 2:
+        raise ValueError("solve_rigid_transform: точки камеры лежат на одной прямой")
+
+    u, _, vt = np.linalg.svd(cam_c.T @ rob_c)
+    d = np.sign(np.linalg.det(vt.T @ u.T))
+    rot = vt.T @ np.diag([1.0, 1.0, d]) @ u.T     # без отражения
+
+    transform = np.eye(4)
+    transform[:3, :3] = rot
+    transform[:3, 3] = rob_center - rot @ cam_center
+
+    residuals = cam @ rot.T + transform[:3, 3] - rob
+    rms = float(np.sqrt(np.mean(np.sum(residuals ** 2, axis=1))))
+    return transform, rms
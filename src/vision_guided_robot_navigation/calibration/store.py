@@ -0,0 +1,211 @@
+# src/vision_guided_robot_navigation/calibration/store.py
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import yaml
+
+from src.vision_guided_robot_navigation.calibration.solver import solve_rigid_transform
+from src.vision_guided_robot_navigation.domain import transform_poses
+from src.vision_guided_robot_navigation.infrastructure.vision_client import TubeCoordinates
+
+
+CALIBRATION_PATH = Path(__file__).resolve().parents[1] / "config" / "calibration" / "camera_to_base.yaml"
+
+
+@dataclass(frozen=True)
+class CameraCalibration:
+    """Одна версия калибровки камера -> база робота."""
+    version: int
+    matrix: np.ndarray          # 4x4
+    rms_error: float            # мм, по парам точек, на которых решали
+    points: int                 # сколько пар использовано
+    created_at: str
+
+    @classmethod
+    def identity(cls) -> "CameraCalibration":
+        return cls(version=0, matrix=np.eye(4), rms_error=0.0, points=0, created_at="")
+
+
+class CalibrationStore:
+    """
+    Хранение калибровки на диске.
+    Текущая версия лежит в path, каждая предыдущая — в history/<stem>.v<N>.yaml.
+    """
+
+    def __init__(self, path: Path = CALIBRATION_PATH):
+        self.path = Path(path)
+        self.history_dir = self.path.parent / "history"
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> CameraCalibration:
+        with self.path.open("r", encoding="utf-8") as f:
+            raw = yaml.safe_load(f)
+
+        matrix = np.asarray(raw["matrix"], dtype=np.float64)
+        if matrix.shape != (4, 4):
+            raise ValueError(f"{self.path}: матрица калибровки должна быть 4x4, получено {matrix.shape}")
+
+        return CameraCalibration(
+            version=int(raw["version"]),
+            matrix=matrix,
+            rms_error=float(raw["rms_error"]),
+            points=int(raw["points"]),
+            created_at=str(raw["created_at"]),
+        )
+
+    def save(self, calibration: CameraCalibration) -> CameraCalibration:
+        """Сохраняет калибровку следующей версией, прежнюю переносит в history/."""
+        version = 1
+        if self.exists():
+            previous = self.load()
+            version = previous.version + 1
+            self.history_dir.mkdir(parents=True, exist_ok=True)
+            os.replace(self.path, self.history_dir / f"{self.path.stem}.v{previous.version}{self.path.suffix}")
+
+        calibration = replace(
+            calibration,
+            version=version,
+            created_at=calibration.created_at or datetime.now().isoformat(timespec="seconds"),
+        )
+        raw = {
+            "version": calibration.version,
+            "created_at": calibration.created_at,
+            "points": calibration.points,
+            "rms_error": round(calibration.rms_error, 4),
+            "matrix": calibration.matrix.tolist(),
+        }
+
+        # Пишем через временный файл, чтобы читатель не увидел половину YAML
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            yaml.safe_dump(raw, f, sort_keys=False, allow_unicode=True)
+        os.replace(tmp_path, self.path)
+        return calibration
+
+
+def calibrate_from_pairs(camera_points: np.ndarray, robot_points: np.ndarray, store: CalibrationStore) -> CameraCalibration:
+    """Решает калибровку по записанным парам точек и сохраняет новой версией."""
+    matrix, rms = solve_rigid_transform(camera_points, robot_points)
+    return store.save(
+        CameraCalibration(version=0, matrix=matrix, rms_error=rms, points=len(camera_points), created_at="")
+    )
+
+def load_point_pairs(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Читает пары точек, записанные при калибровке:
+    pairs:
+      - {camera: [x, y, z], robot: [x, y, z]}
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+    pairs = raw["pairs"]
+    camera = np.array([p["camera"] for p in pairs], dtype=np.float64)
+    robot = np.array([p["robot"] for p in pairs], dtype=np.float64)
+    return camera, robot
+
+
+class CalibrationCache:
+    """
+    Кэш текущей калибровки для горячего пути.
+
+    - файл перечитывается только если изменились его mtime/size
+    - stat делается не чаще check_interval_s, между проверками — только чтение атрибута
+    - пока файла нет, применяется единичное преобразование (поведение как без калибровки)
+    - файл не читается (записан наполовину, испорчен) — остаётся последняя удачная
+      калибровка и предупреждение в лог; новая попытка — когда файл снова изменится
+    """
+
+    def __init__(
+        self,
+        store: CalibrationStore,
+        check_interval_s: float = 1.0,
+        logger: logging.Logger | None = None,
+    ):
+        self.store = store
+        self.check_interval_s = check_interval_s
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._calibration = CameraCalibration.identity()
+        self._file_stamp: tuple[int, int] | None = None
+        self._next_check = 0.0
+
+    def _read_file_stamp(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.store.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def get(self) -> CameraCalibration:
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._calibration
+
+        with self._lock:
+            if now >= self._next_check:
+                stamp = self._read_file_stamp()
+                if stamp != self._file_stamp:
+                    self._reload(stamp)
+                    self._file_stamp = stamp
+                self._next_check = now + self.check_interval_s
+        return self._calibration
+
+    def _reload(self, stamp: tuple[int, int] | None) -> None:
+        if stamp is None:
+            self._calibration = CameraCalibration.identity()
+            return
+        try:
+            self._calibration = self.store.load()
+        except (OSError, yaml.YAMLError, KeyError, TypeError, ValueError) as e:
+            self.logger.warning(
+                f"[calibration] Не удалось прочитать {self.store.path} ({type(e).__name__}: {e}), "
+                f"используется прежняя калибровка v{self._calibration.version}"
+            )
+
+    def apply(self, poses: np.ndarray) -> np.ndarray:
+        """(N, 6) поз в СК камеры -> (N, 6) поз в базовой СК робота."""
+        return transform_poses(self.get().matrix, poses)
+
+    def apply_to_coordinates(self, candidates: list[TubeCoordinates]) -> list[TubeCoordinates]:
+        """Переводит все кандидаты ответа vision одним пакетом."""
+        if not candidates:
+            return []
+        poses = np.array([(t.x, t.y, t.z, t.a, t.b, t.c) for t in candidates])
+        return [
+            TubeCoordinates(*row, confidence=t.confidence)
+            for row, t in zip(self.apply(poses).tolist(), candidates)
+        ]
+
+
+if __name__ == "__main__":
+    def main():
+        import sys
+        from time import perf_counter
+
+        store = CalibrationStore()
+        if len(sys.argv) > 1:
+            # python -m src.vision_guided_robot_navigation.calibration.store pairs.yaml
+            camera, robot = load_point_pairs(Path(sys.argv[1]))
+            calibration = calibrate_from_pairs(camera, robot, store)
+            print(f"Калибровка v{calibration.version}: {calibration.points} пар, RMS = {calibration.rms_error:.3f} мм")
+
+        cache = CalibrationCache(store)
+        candidates = [TubeCoordinates(300.0 + i, 10.0, 250.0, 180.0, 0.0, 90.0, 0.9) for i in range(16)]
+        cache.apply_to_coordinates(candidates)
+
+        st = perf_counter()
+        for _ in range(1000):
+            cache.apply_to_coordinates(candidates)
+        print(f"{(perf_counter()-st) / 1000 * 1e3:.4f} ms --- apply_to_coordinates x{len(candidates)}")
+    main()
@@ -4,14 +4,36 @@
 Публичный интерфейс загрузки конфигураций.
 """
 
-from .layout import load_system_layout_config
-from .unloader import load_unloader_config
+from .layout import (
+    load_system_layout_config,
+    SystemLayoutConfig,
+    LayoutGeometryConfig,
+    FixtureGridConfig,
+)
+from .protocol import load_protocol_config, ProtocolConfig, RoleProtocolConfig, RegisterMapSpec
+from .unloader import load_unloader_config, UnloaderConfig, UnloaderVisionConfig, UnloaderIOConfig, UnloaderConnectionConfig, UnloaderGuardConfig, UnloaderAlarmsConfig, UnloaderProgramsConfig, UnloaderWatchdogConfig
 
 __all__ = (
     # layout
     "load_system_layout_config",
+    "SystemLayoutConfig",
+    "LayoutGeometryConfig",
+    "FixtureGridConfig",
+
+    # protocol
+    "load_protocol_config",
+    "ProtocolConfig",
+    "RoleProtocolConfig",
+    "RegisterMapSpec",
 
     # modules
     "load_unloader_config",
     "UnloaderConfig",
+    "UnloaderVisionConfig",
+    "UnloaderIOConfig",
+    "UnloaderConnectionConfig",
+    "UnloaderGuardConfig",
+    "UnloaderAlarmsConfig",
+    "UnloaderProgramsConfig",
+    "UnloaderWatchdogConfig",
 )
\ No newline at end of file
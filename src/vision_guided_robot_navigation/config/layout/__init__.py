@@ -1,6 +1,14 @@
 # src/vision_guided_robot_navigation/config/layout/__init__.py
-from .config import load_system_layout_config
+from .config import (
+    load_system_layout_config,
+    SystemLayoutConfig,
+    LayoutGeometryConfig,
+    FixtureGridConfig,
+)
 
 __all__ = [
     "load_system_layout_config",
+    "SystemLayoutConfig",
+    "LayoutGeometryConfig",
+    "FixtureGridConfig",
 ]
\ No newline at end of file
@@ -3,12 +3,96 @@ from dataclasses import dataclass
 from pathlib import Path
 import yaml
 
+Origin = tuple[float, float, float, float]   # x, y, z, rz
+
+@dataclass(frozen=True)
+class FixtureGridConfig:
+    """Сетка слотов одного типа оснастки (штатив / рэк) и положения её экземпляров."""
+    rows: int
+    cols: int
+    pitch: tuple[float, float]                 # шаг сетки по X / Y оснастки
+    orientation: tuple[float, float, float]    # a, b, c инструмента над слотом
+    origins: tuple[Origin, ...]                # слот 0 каждого экземпляра (x, y, z, rz)
+
+    @property
+    def slots(self) -> int:
+        return self.rows * self.cols
+
+@dataclass(frozen=True)
+class LayoutGeometryConfig:
+    dump_center: tuple[float, float, float]
+    dump_size: tuple[float, float]
+    unloading_tripods: FixtureGridConfig
+    loading_tripods: FixtureGridConfig
+    racks: FixtureGridConfig                   # позиции "1".."N" зоны загрузки, затем зона выгрузки
+
 @dataclass
 class SystemLayoutConfig:
     unloading_tripods: int
     loading_tripods: int
     racks_in_loading_zone: int
     racks_in_unloading_zone: int
+    geometry: LayoutGeometryConfig | None = None
+
+def _as_origin(raw) -> Origin:
+    x, y, z, rz = (float(v) for v in raw)
+    return x, y, z, rz
+
+def _repeat_origins(raw: dict, count: int) -> tuple[Origin, ...]:
+    """Раскладывает origin + step на count позиций."""
+    x, y, z, rz = _as_origin(raw["origin"])
+    dx, dy, dz = (float(v) for v in raw["step"])
+    return tuple((x + i * dx, y + i * dy, z + i * dz, rz) for i in range(count))
+
+def _parse_grid(raw: dict, origins: tuple[Origin, ...], name: str, count: int) -> FixtureGridConfig:
+    if len(origins) != count:
+        raise ValueError(
+            f"layout.yaml: для '{name}' задано {len(origins)} позиций, а в системе их {count}"
+        )
+    px, py = (float(v) for v in raw["pitch"])
+    a, b, c = (float(v) for v in raw["orientation"])
+    return FixtureGridConfig(
+        rows=int(raw["rows"]),
+        cols=int(raw["cols"]),
+        pitch=(px, py),
+        orientation=(a, b, c),
+        origins=origins,
+    )
+
+def _parse_geometry(raw: dict, layout: SystemLayoutConfig) -> LayoutGeometryConfig:
+    tripods_raw = raw["tripods"]
+    racks_raw = raw["racks"]
+
+    rack_origins = (
+        _repeat_origins(racks_raw["loading_zone"], layout.racks_in_loading_zone)
+        + _repeat_origins(racks_raw["unloading_zone"], layout.racks_in_unloading_zone)
+    )
+
+    dump_x, dump_y, dump_z = (float(v) for v in raw["dump"]["center"])
+    dump_dx, dump_dy = (float(v) for v in raw["dump"]["size"])
+
+    return LayoutGeometryConfig(
+        dump_center=(dump_x, dump_y, dump_z),
+        dump_size=(dump_dx, dump_dy),
+        unloading_tripods=_parse_grid(
+            tripods_raw["unloading"],
+            tuple(_as_origin(o) for o in tripods_raw["unloading"]["origins"]),
+            "tripods.unloading",
+            layout.unloading_tripods,
+        ),
+        loading_tripods=_parse_grid(
+            tripods_raw["loading"],
+            tuple(_as_origin(o) for o in tripods_raw["loading"]["origins"]),
+            "tripods.loading",
+            layout.loading_tripods,
+        ),
+        racks=_parse_grid(
+            racks_raw,
+            rack_origins,
+            "racks",
+            layout.racks_in_loading_zone + layout.racks_in_unloading_zone,
+        ),
+    )
 
 def load_system_layout_config(path: Path | None = None) -> SystemLayoutConfig:
     if path is None:
@@ -18,9 +102,14 @@ def load_system_layout_config(path: Path | None = None) -> SystemLayoutConfig:
     with path.open("r", encoding="utf-8") as f:
         raw = yaml.safe_load(f)
 
-    return SystemLayoutConfig(
+    layout = SystemLayoutConfig(
         unloading_tripods=raw["tripods"]["unloading"],
         loading_tripods=raw["tripods"]["loading"],
         racks_in_loading_zone=raw["racks"]["loading_zone"],
         racks_in_unloading_zone=raw["racks"]["unloading_zone"],
     )
+
+    if "geometry" in raw:
+        layout.geometry = _parse_geometry(raw["geometry"], layout)
+
+    return layout
@@ -0,0 +1,14 @@
+# src/vision_guided_robot_navigation/config/protocol/__init__.py
+from .config import (
+    load_protocol_config,
+    ProtocolConfig,
+    RoleProtocolConfig,
+    RegisterMapSpec,
+)
+
+__all__ = [
+    "load_protocol_config",
+    "ProtocolConfig",
+    "RoleProtocolConfig",
+    "RegisterMapSpec",
+]
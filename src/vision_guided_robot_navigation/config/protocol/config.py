@@ -0,0 +1,79 @@
+# src/vision_guided_robot_navigation/config/protocol/config.py
+from dataclasses import dataclass
+from pathlib import Path
+import yaml
+
+
+CONFIG_PATH = Path(__file__).with_name("register_maps.yaml")
+
+SECTIONS = ("nr", "nr_values", "sr", "sr_values", "pr")
+
+@dataclass(frozen=True)
+class RegisterMapSpec:
+    """Карта регистров одной версии протокола (после разворачивания extends)."""
+    role: str
+    version: str
+    codec: str
+    nr: dict[str, int]
+    nr_values: dict[str, int]
+    sr: dict[str, int]
+    sr_values: dict[str, str]
+    pr: dict[str, int]
+
+@dataclass(frozen=True)
+class RoleProtocolConfig:
+    role: str
+    version_sr: int                 # SR, где контроллер сообщает версию
+    default_version: str            # для программ, которые версию не сообщают
+    versions: dict[str, RegisterMapSpec]
+
+@dataclass(frozen=True)
+class ProtocolConfig:
+    roles: dict[str, RoleProtocolConfig]
+
+def _resolve_version(role: str, name: str, versions_raw: dict, chain: tuple[str, ...] = ()) -> dict[str, dict]:
+    """Секции версии с учётом extends (родитель, затем переопределения по ключам)."""
+    if name in chain:
+        raise ValueError(f"register_maps.yaml: циклический extends в {role}: {' -> '.join(chain + (name,))}")
+    if name not in versions_raw:
+        raise ValueError(f"register_maps.yaml: {role}: версия '{name}' не описана")
+
+    raw = versions_raw[name] or {}
+    parent = raw.get("extends")
+    sections = _resolve_version(role, parent, versions_raw, chain + (name,)) if parent else {s: {} for s in SECTIONS}
+    return {s: {**sections[s], **(raw.get(s) or {})} for s in SECTIONS}
+
+def _parse_role(role: str, raw: dict) -> RoleProtocolConfig:
+    versions_raw = raw["versions"]
+    versions = {}
+    for name, version_raw in versions_raw.items():
+        sections = _resolve_version(role, name, versions_raw)
+        versions[name] = RegisterMapSpec(
+            role=role,
+            version=name,
+            codec=str((version_raw or {}).get("codec", name)),
+            nr={k: int(v) for k, v in sections["nr"].items()},
+            nr_values={k: int(v) for k, v in sections["nr_values"].items()},
+            sr={k: int(v) for k, v in sections["sr"].items()},
+            sr_values={k: str(v) for k, v in sections["sr_values"].items()},
+            pr={k: int(v) for k, v in sections["pr"].items()},
+        )
+
+    default_version = str(raw["default_version"])
+    if default_version not in versions:
+        raise ValueError(f"register_maps.yaml: {role}: default_version '{default_version}' не описана")
+    return RoleProtocolConfig(
+        role=role,
+        version_sr=int(raw["version_sr"]),
+        default_version=default_version,
+        versions=versions,
+    )
+
+def load_protocol_config(path: Path | None = None) -> ProtocolConfig:
+    cfg_path = path or CONFIG_PATH
+    with cfg_path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+
+    return ProtocolConfig(
+        roles={role: _parse_role(role, role_raw) for role, role_raw in raw["register_maps"].items()},
+    )
@@ -1,7 +1,14 @@
 # src/vision_guided_robot_navigation/config/unloader/__init__.py
-from .config import load_unloader_config, UnloaderConfig
+from .config import load_unloader_config, UnloaderConfig, UnloaderVisionConfig, UnloaderIOConfig, UnloaderConnectionConfig, UnloaderGuardConfig, UnloaderAlarmsConfig, UnloaderProgramsConfig, UnloaderWatchdogConfig
 
 __all__ = [
     "load_unloader_config",
     "UnloaderConfig",
+    "UnloaderVisionConfig",
+    "UnloaderIOConfig",
+    "UnloaderConnectionConfig",
+    "UnloaderGuardConfig",
+    "UnloaderAlarmsConfig",
+    "UnloaderProgramsConfig",
+    "UnloaderWatchdogConfig",
 ]
\ No newline at end of file
@@ -13,12 +13,91 @@ class UnloaderScannerConfig:
     name: str
     timeout: float
 
+@dataclass(frozen=True)
+class UnloaderVisionConfig:
+    base_url: str = "http://127.0.0.1:8010"
+    timeout_s: float = 2.0
+    stream: bool = False            # True: кадры идут потоком по WebSocket /stream, поток робота читает кэш
+    stream_period_s: float = 0.1    # интервал отправки кадров в поток
+    max_result_age_s: float = 1.0   # результат по более старому кадру не используется
+    camera: str | None = None       # ключ камеры в cameras.yaml vision-сервиса
+    roi: tuple[int, int, int, int] | None = None    # подсказка области поиска, пиксели кадра
+    empty_backoff_s: float = 0.2    # пауза после пустого ответа vision, растёт x2 ...
+    empty_backoff_max_s: float = 5.0    # ... до этого значения
+
+    @property
+    def stream_url(self) -> str:
+        query = []
+        if self.camera is not None:
+            query.append(f"camera={self.camera}")
+        if self.roi is not None:
+            query.append("roi=" + ",".join(str(v) for v in self.roi))
+        return "ws" + self.base_url.removeprefix("http") + "/stream" + ("?" + "&".join(query) if query else "")
+
+@dataclass(frozen=True)
+class UnloaderIOConfig:
+    executor: bool = True           # все вызовы SDK через один поток-владелец с приоритетной очередью
+    call_timeout_s: float = 5.0     # сколько синхронный вызов ждёт свою очередь и ответ SDK
+
+@dataclass(frozen=True)
+class UnloaderProgramsConfig:
+    refresh_s: float = 0.5          # фоновое обновление кэша состояний программ
+    max_age_s: float = 1.0          # снимок старше — перечитывается перед запросом / групповой командой
+
+@dataclass(frozen=True)
+class UnloaderConnectionConfig:
+    heartbeat_nr: int = 1           # регистр NR, который читается для проверки связи
+    heartbeat_s: float = 1.0
+    backoff_initial_s: float = 0.5  # переподключение: 0.5, 1, 2 ... с
+    backoff_max_s: float = 10.0
+    jitter: float = 0.3             # +-30 % к задержке
+
+@dataclass(frozen=True)
+class UnloaderAlarmsConfig:
+    enabled: bool = True            # фоновый опрос тревог; блокирующая прерывает итерацию сразу
+    poll_s: float = 0.5
+    blocking: tuple[str, ...] = ("*",)  # шаблоны fnmatch имён блокирующих тревог ...
+    ignore: tuple[str, ...] = ()        # ... кроме этих (предупреждения, которые не останавливают робота)
+
+@dataclass(frozen=True)
+class UnloaderGuardConfig:
+    percentile: float = 0.99        # дедлайн фазы = перцентиль прошлых длительностей ...
+    margin: float = 1.5             # ... x margin
+    min_samples: int = 20           # пока замеров меньше — cold_deadline_s
+    history: int = 200              # скользящее окно замеров на фазу
+    min_deadline_s: float = 5.0
+    max_deadline_s: float = 600.0
+    cold_deadline_s: float = 120.0
+    escalation: tuple[str, ...] = ("retry", "alarms", "reset")   # шаги после истечения дедлайна
+    breaker_failures: int = 3       # неудачных итераций подряд до паузы
+    breaker_cooldown_s: float = 30.0    # пауза 30, 60 ... с
+    breaker_cooldown_max_s: float = 300.0
+
+@dataclass(frozen=True)
+class UnloaderWatchdogConfig:
+    check_s: float = 1.0            # период проверки потоков сторожем
+    stall_s: float = 15.0           # нет витка дольше — зависание (стек потока в лог)
+    max_rate_hz: float = 500.0      # витков в секунду больше — цикл без ожидания
+    max_restarts: int = 5           # перезапусков подряд до остановки ячейки ...
+    healthy_s: float = 60.0         # ... подряд — если поток прожил меньше healthy_s
+    restart_backoff_s: float = 1.0  # перезапуск через 1, 2, 4 ... с
+    restart_backoff_max_s: float = 30.0
+
 @dataclass(frozen=True)
 class UnloaderConfig:
     ip: str                 # IP робота-загрузчика
     name: str               # имя робота (логическое)
     robot_program_name: str # имя программы на контроллере
     scanner: UnloaderScannerConfig
+    vision: UnloaderVisionConfig = UnloaderVisionConfig()
+    io: UnloaderIOConfig = UnloaderIOConfig()
+    connection: UnloaderConnectionConfig = UnloaderConnectionConfig()
+    programs: UnloaderProgramsConfig = UnloaderProgramsConfig()
+    guard: UnloaderGuardConfig = UnloaderGuardConfig()
+    alarms: UnloaderAlarmsConfig = UnloaderAlarmsConfig()
+    watchdog: UnloaderWatchdogConfig = UnloaderWatchdogConfig()
+    protocol_version: str = "robot_regs_v1"    # карта регистров из config/protocol/register_maps.yaml, если контроллер не сообщает свою
+    tripod_policy: str = "first"    # выбор штатива: first / sticky / fill_first / round_robin / nearest
 
 def load_unloader_config(path: Path | None = None) -> UnloaderConfig:
     cfg_path = path or CONFIG_PATH
@@ -35,9 +114,86 @@ def load_unloader_config(path: Path | None = None) -> UnloaderConfig:
         timeout=float(scanner_raw["timeout"]),
     )
 
+    vision_raw = unloader_raw.get("vision") or {}
+    vision = UnloaderVisionConfig(
+        base_url=str(vision_raw.get("base_url", UnloaderVisionConfig.base_url)).rstrip("/"),
+        timeout_s=float(vision_raw.get("timeout_s", UnloaderVisionConfig.timeout_s)),
+        stream=bool(vision_raw.get("stream", UnloaderVisionConfig.stream)),
+        stream_period_s=float(vision_raw.get("stream_period_s", UnloaderVisionConfig.stream_period_s)),
+        max_result_age_s=float(vision_raw.get("max_result_age_s", UnloaderVisionConfig.max_result_age_s)),
+        camera=vision_raw.get("camera"),
+        roi=tuple(int(v) for v in vision_raw["roi"]) if vision_raw.get("roi") else None,
+        empty_backoff_s=float(vision_raw.get("empty_backoff_s", UnloaderVisionConfig.empty_backoff_s)),
+        empty_backoff_max_s=float(vision_raw.get("empty_backoff_max_s", UnloaderVisionConfig.empty_backoff_max_s)),
+    )
+
+    io_raw = unloader_raw.get("io") or {}
+    io = UnloaderIOConfig(
+        executor=bool(io_raw.get("executor", UnloaderIOConfig.executor)),
+        call_timeout_s=float(io_raw.get("call_timeout_s", UnloaderIOConfig.call_timeout_s)),
+    )
+
+    connection_raw = unloader_raw.get("connection") or {}
+    connection = UnloaderConnectionConfig(
+        heartbeat_nr=int(connection_raw.get("heartbeat_nr", UnloaderConnectionConfig.heartbeat_nr)),
+        heartbeat_s=float(connection_raw.get("heartbeat_s", UnloaderConnectionConfig.heartbeat_s)),
+        backoff_initial_s=float(connection_raw.get("backoff_initial_s", UnloaderConnectionConfig.backoff_initial_s)),
+        backoff_max_s=float(connection_raw.get("backoff_max_s", UnloaderConnectionConfig.backoff_max_s)),
+        jitter=float(connection_raw.get("jitter", UnloaderConnectionConfig.jitter)),
+    )
+
+    programs_raw = unloader_raw.get("programs") or {}
+    programs = UnloaderProgramsConfig(
+        refresh_s=float(programs_raw.get("refresh_s", UnloaderProgramsConfig.refresh_s)),
+        max_age_s=float(programs_raw.get("max_age_s", UnloaderProgramsConfig.max_age_s)),
+    )
+
+    guard_raw = unloader_raw.get("guard") or {}
+    guard = UnloaderGuardConfig(
+        percentile=float(guard_raw.get("percentile", UnloaderGuardConfig.percentile)),
+        margin=float(guard_raw.get("margin", UnloaderGuardConfig.margin)),
+        min_samples=int(guard_raw.get("min_samples", UnloaderGuardConfig.min_samples)),
+        history=int(guard_raw.get("history", UnloaderGuardConfig.history)),
+        min_deadline_s=float(guard_raw.get("min_deadline_s", UnloaderGuardConfig.min_deadline_s)),
+        max_deadline_s=float(guard_raw.get("max_deadline_s", UnloaderGuardConfig.max_deadline_s)),
+        cold_deadline_s=float(guard_raw.get("cold_deadline_s", UnloaderGuardConfig.cold_deadline_s)),
+        escalation=tuple(str(step) for step in guard_raw.get("escalation", UnloaderGuardConfig.escalation)),
+        breaker_failures=int(guard_raw.get("breaker_failures", UnloaderGuardConfig.breaker_failures)),
+        breaker_cooldown_s=float(guard_raw.get("breaker_cooldown_s", UnloaderGuardConfig.breaker_cooldown_s)),
+        breaker_cooldown_max_s=float(guard_raw.get("breaker_cooldown_max_s", UnloaderGuardConfig.breaker_cooldown_max_s)),
+    )
+
+    alarms_raw = unloader_raw.get("alarms") or {}
+    alarms = UnloaderAlarmsConfig(
+        enabled=bool(alarms_raw.get("enabled", UnloaderAlarmsConfig.enabled)),
+        poll_s=float(alarms_raw.get("poll_s", UnloaderAlarmsConfig.poll_s)),
+        blocking=tuple(str(p) for p in alarms_raw.get("blocking", UnloaderAlarmsConfig.blocking)),
+        ignore=tuple(str(p) for p in alarms_raw.get("ignore") or UnloaderAlarmsConfig.ignore),
+    )
+
+    watchdog_raw = unloader_raw.get("watchdog") or {}
+    watchdog = UnloaderWatchdogConfig(
+        check_s=float(watchdog_raw.get("check_s", UnloaderWatchdogConfig.check_s)),
+        stall_s=float(watchdog_raw.get("stall_s", UnloaderWatchdogConfig.stall_s)),
+        max_rate_hz=float(watchdog_raw.get("max_rate_hz", UnloaderWatchdogConfig.max_rate_hz)),
+        max_restarts=int(watchdog_raw.get("max_restarts", UnloaderWatchdogConfig.max_restarts)),
+        healthy_s=float(watchdog_raw.get("healthy_s", UnloaderWatchdogConfig.healthy_s)),
+        restart_backoff_s=float(watchdog_raw.get("restart_backoff_s", UnloaderWatchdogConfig.restart_backoff_s)),
+        restart_backoff_max_s=float(watchdog_raw.get("restart_backoff_max_s", UnloaderWatchdogConfig.restart_backoff_max_s)),
+    )
+
     return UnloaderConfig(
         ip=unloader_raw["ip"],
         name=unloader_raw["name"],
         robot_program_name=unloader_raw["robot_program_name"],
         scanner=scanner,
+        vision=vision,
+        io=io,
+        connection=connection,
+        programs=programs,
+        guard=guard,
+        alarms=alarms,
+        watchdog=watchdog,
+        protocol_version=str(unloader_raw.get("protocol_version", UnloaderConfig.protocol_version)),
+        tripod_policy=str(unloader_raw.get("tripod_policy", UnloaderConfig.tripod_policy)),
     )
@@ -1,6 +1,7 @@
 # src/vision_guided_robot_navigation/devices/__init__.py
 from .base import Robot, DeviceError, ConnectionError, RobotIO, RobotRegisters, CellRobot
-from .robots import RobotAgilebot
+from .robots import RobotAgilebot, PoseWriteStats, ProgramStateStats
+from .io_executor import RobotIOExecutor, QueuedCellRobot, IOPriority
 
 __all__ = [
     "Robot",
@@ -10,5 +11,10 @@ __all__ = [
     "DeviceError",
     "ConnectionError",
     "RobotAgilebot",
+    "PoseWriteStats",
+    "ProgramStateStats",
+    "RobotIOExecutor",
+    "QueuedCellRobot",
+    "IOPriority",
 ]
 
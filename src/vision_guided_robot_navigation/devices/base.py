@@ -48,6 +48,11 @@ class RobotRegisters(ABC):
     @abstractmethod
     def set_pose_register(self, pr_id: int, x_val: int | float, y_val: int | float, z_val: int | float, a_val: int | float, b_val: int | float, c_val: int | float) -> None: ...
 
+    def set_pose_registers(self, poses: dict[int, tuple[float, float, float, float, float, float]]) -> None:
+        """Запись нескольких PR за один вызов: {pr_id: (x, y, z, a, b, c)}."""
+        for pr_id, (x, y, z, a, b, c) in poses.items():
+            self.set_pose_register(pr_id, x, y, z, a, b, c)
+
 
 class CellRobot(Robot, RobotIO, RobotRegisters, ABC):
     """Робот, подходящий для нашей автоматизированной ячейки."""
@@ -0,0 +1,270 @@
+# src/vision_guided_robot_navigation/devices/io_executor.py
+"""
+Последовательный доступ к SDK робота.
+
+Потокобезопасность Arm не гарантируется, а к роботу ходят поток робота (рукопожатие
+через регистры) и мониторы датчиков. RobotIOExecutor — единственный поток-владелец
+робота: вызовы ставятся в очередь с приоритетом и возвращают Future, так что
+- SDK никогда не вызывается из двух потоков одновременно;
+- запись рукопожатия обгоняет накопившиеся чтения датчиков;
+- внутри одного приоритета порядок строго FIFO — вызывающий может отправить
+  несколько записей подряд (submit) и дождаться только последней.
+
+QueuedCellRobot — тот же интерфейс CellRobot поверх исполнителя: синхронные методы
+для существующего кода и submit() для конвейера.
+
+stop_event исполнителя — собственный, не общий stop_event ячейки: его ставят, только
+когда все, кто ходит через очередь, уже остановлены (поток робота при остановке ещё
+сбрасывает регистр итерации). Перед выходом очередь дорабатывается до конца.
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable
+
+from src.vision_guided_robot_navigation.devices.base import CellRobot, ConnectionError, DeviceError
+
+
+class IOPriority(IntEnum):
+    HANDSHAKE = 0   # регистры рукопожатия, позы — от них зависит старт движения
+    CONTROL = 1     # программы, тревоги, сервоприводы
+    SENSOR = 2      # опрос DI/DO для мониторов
+
+
+# Приоритет по умолчанию для методов CellRobot; остальные — CONTROL
+DEFAULT_PRIORITIES: dict[str, IOPriority] = {
+    "set_number_register": IOPriority.HANDSHAKE,
+    "get_number_register": IOPriority.HANDSHAKE,
+    "set_string_register": IOPriority.HANDSHAKE,
+    "get_string_register": IOPriority.HANDSHAKE,
+    "set_pose_register": IOPriority.HANDSHAKE,
+    "set_pose_registers": IOPriority.HANDSHAKE,
+    "set_DO": IOPriority.HANDSHAKE,
+    "get_DI": IOPriority.SENSOR,
+    "get_DO": IOPriority.SENSOR,
+}
+
+
+@dataclass(order=True)
+class _Command:
+    priority: int
+    seq: int
+    fn: Callable[..., Any] = field(compare=False)
+    args: tuple = field(compare=False, default=())
+    kwargs: dict = field(compare=False, default_factory=dict)
+    future: Future = field(compare=False, default_factory=Future)
+    submitted_at: float = field(compare=False, default_factory=time.perf_counter)
+
+
+@dataclass
+class IOExecutorStats:
+    completed: int = 0
+    failed: int = 0
+    max_queue: int = 0
+    max_wait_s: dict[IOPriority, float] = field(default_factory=lambda: {p: 0.0 for p in IOPriority})
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "max_queue": self.max_queue,
+            "max_wait_ms": {p.name.lower(): round(v * 1e3, 2) for p, v in self.max_wait_s.items()},
+        }
+
+
+class RobotIOExecutor(threading.Thread):
+    """Поток-владелец робота: выполняет вызовы SDK по одному в порядке (приоритет, поступление)."""
+
+    def __init__(
+        self,
+        robot: CellRobot,
+        stop_event: threading.Event,
+        logger: logging.Logger,
+    ):
+        """stop_event — только для исполнителя (см. описание модуля)."""
+        super().__init__(daemon=True, name=f"{getattr(robot, 'name', 'robot')}-io")
+        self.robot = robot
+        self.stop_event = stop_event
+        self.logger = logger
+        self.stats = IOExecutorStats()
+        self._queue: queue.PriorityQueue[_Command] = queue.PriorityQueue()
+        self._seq = itertools.count()
+
+    def submit(self, priority: IOPriority, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        command = _Command(int(priority), next(self._seq), fn, args, kwargs)
+        if self.stop_event.is_set() and not self.is_alive():
+            command.future.set_exception(DeviceError(f"[{self.name}] Исполнитель I/O остановлен"))
+            return command.future
+        self._queue.put(command)
+        self.stats.max_queue = max(self.stats.max_queue, self._queue.qsize())
+        return command.future
+
+    def _execute(self, command: _Command) -> None:
+        if not command.future.set_running_or_notify_cancel():
+            return
+        wait_s = time.perf_counter() - command.submitted_at
+        priority = IOPriority(command.priority)
+        self.stats.max_wait_s[priority] = max(self.stats.max_wait_s[priority], wait_s)
+        try:
+            result = command.fn(*command.args, **command.kwargs)
+        except BaseException as e:
+            self.stats.failed += 1
+            command.future.set_exception(e)
+        else:
+            self.stats.completed += 1
+            command.future.set_result(result)
+
+    def run(self) -> None:
+        self.logger.info(f"Поток [{self.name}] запущен")
+        try:
+            # После stop_event очередь дорабатывается: выход, только когда она пуста
+            while True:
+                try:
+                    command = self._queue.get(timeout=0.2)
+                except queue.Empty:
+                    if self.stop_event.is_set():
+                        break
+                    continue
+                self._execute(command)
+        finally:
+            # Поставленные после выхода (или при ошибке) не должны висеть до своих таймаутов
+            while True:
+                try:
+                    command = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if command.future.set_running_or_notify_cancel():
+                    command.future.set_exception(DeviceError(f"[{self.name}] Исполнитель I/O остановлен"))
+            self.logger.info(f"Поток [{self.name}] остановлен, {self.stats.as_dict()}")
+
+
+def _queued(method: str):
+    priority = DEFAULT_PRIORITIES.get(method, IOPriority.CONTROL)
+
+    def call(self: "QueuedCellRobot", *args, **kwargs):
+        future = self.submit(method, *args, priority=priority, **kwargs)
+        try:
+            return future.result(self.call_timeout_s)
+        except FutureTimeoutError as e:
+            # вызов не вернулся из SDK (или не дошёл до него) — для вызывающего это обрыв связи
+            raise ConnectionError(
+                f"[{self.executor.name}] {method}: нет ответа за {self.call_timeout_s} с"
+            ) from e
+
+    call.__name__ = method
+    return call
+
+
+class QueuedCellRobot(CellRobot):
+    """
+    CellRobot, все вызовы которого идут через RobotIOExecutor.
+    Синхронные методы ждут результат не дольше call_timeout_s (иначе ConnectionError).
+    """
+
+    def __init__(self, executor: RobotIOExecutor, call_timeout_s: float | None = 5.0):
+        self.executor = executor
+        self.robot = executor.robot
+        self.call_timeout_s = call_timeout_s
+
+    def submit(self, method: str, *args, priority: IOPriority | None = None, **kwargs) -> Future:
+        """Поставить вызов в очередь, не дожидаясь результата."""
+        if priority is None:
+            priority = DEFAULT_PRIORITIES.get(method, IOPriority.CONTROL)
+        return self.executor.submit(priority, getattr(self.robot, method), *args, **kwargs)
+
+    def is_connected(self) -> bool:
+        return self.robot.is_connected()
+
+    connect = _queued("connect")
+    disconnect = _queued("disconnect")
+    start_program = _queued("start_program")
+    stop_program = _queued("stop_program")
+    stop_all_running_programms = _queued("stop_all_running_programms")
+    reset_errors = _queued("reset_errors")
+    get_DI = _queued("get_DI")
+    get_DO = _queued("get_DO")
+    set_DO = _queued("set_DO")
+    get_string_register = _queued("get_string_register")
+    set_string_register = _queued("set_string_register")
+    get_number_register = _queued("get_number_register")
+    set_number_register = _queued("set_number_register")
+    set_pose_register = _queued("set_pose_register")
+    set_pose_registers = _queued("set_pose_registers")    # пачка PR — одна запись в очереди
+
+    def __getattr__(self, name: str):
+        # Методы конкретного робота вне CellRobot (pause_program, get_all_active_alarms, ...)
+        if name in ("robot", "executor"):
+            raise AttributeError(name)
+        attr = getattr(self.robot, name)
+        if not callable(attr):
+            return attr
+        return _queued(name).__get__(self)
+
+    def __str__(self) -> str:
+        return f"{self.robot} (через {self.executor.name})"
+
+
+if __name__ == "__main__":
+    def main():
+        """Имитация: SDK-вызов 5 мс, монитор засыпает очередь чтениями датчиков."""
+        class SlowRobot:
+            name = "sim"
+            def __init__(self):
+                self.lock = threading.Lock()
+                self.overlaps = 0
+            def _sdk(self):
+                if not self.lock.acquire(blocking=False):
+                    self.overlaps += 1
+                    self.lock.acquire()
+                try:
+                    time.sleep(0.005)
+                finally:
+                    self.lock.release()
+            def get_DO(self, i):
+                self._sdk()
+                return True
+            def set_number_register(self, i, v):
+                self._sdk()
+
+        logger = logging.getLogger("io-bench")
+        for mode in ("прямые вызовы", "исполнитель"):
+            robot = SlowRobot()
+            stop = threading.Event()
+            handshake: list[float] = []
+
+            if mode == "исполнитель":
+                executor = RobotIOExecutor(robot, stop, logger)
+                executor.start()
+                read = lambda: executor.submit(IOPriority.SENSOR, robot.get_DO, 1).result()
+                write = lambda: executor.submit(IOPriority.HANDSHAKE, robot.set_number_register, 1, 1).result()
+            else:
+                read = lambda: robot.get_DO(1)
+                write = lambda: robot.set_number_register(1, 1)
+
+            def monitor():
+                while not stop.is_set():
+                    read()
+            monitors = [threading.Thread(target=monitor, daemon=True) for _ in range(3)]
+            for t in monitors:
+                t.start()
+
+            for _ in range(50):
+                st = time.perf_counter()
+                write()
+                handshake.append(time.perf_counter() - st)
+                time.sleep(0.01)
+            stop.set()
+
+            handshake.sort()
+            print(
+                f"{mode:<14} запись рукопожатия p50 {handshake[25] * 1e3:5.1f} ms, "
+                f"p95 {handshake[47] * 1e3:5.1f} ms, одновременных вызовов SDK {robot.overlaps}"
+            )
+    main()
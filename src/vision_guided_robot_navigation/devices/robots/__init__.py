@@ -1,7 +1,9 @@
 # src/vision_guided_robot_navigation/devices/robots/__init__.py
-from .robot_agilebot import RobotAgilebot
+from .robot_agilebot import RobotAgilebot, PoseWriteStats, ProgramStateStats
 
 __all__ = [
     "RobotAgilebot",
+    "PoseWriteStats",
+    "ProgramStateStats",
 ]
 
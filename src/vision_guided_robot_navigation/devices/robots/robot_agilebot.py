@@ -4,6 +4,8 @@ from Agilebot.IR.A.status_code import StatusCodeEnum
 from Agilebot.IR.A.sdk_types import SignalType, SignalValue
 from Agilebot.IR.A.sdk_classes import PoseRegister, Posture, PoseType
 
+import time
+from dataclasses import dataclass
 from typing import List, Callable
 from functools import wraps
 
@@ -14,12 +16,19 @@ from src.vision_guided_robot_navigation.devices.base import (
 )
 
 def require_connection(func: Callable):
-    """Декоратор для проверки соединения"""
+    """
+    Декоратор для проверки соединения. Сетевые ошибки SDK (OSError: сокет закрыт,
+    таймаут) выходят наружу как ConnectionError — по ней и только по ней
+    надзор за связью решает, что связь потеряна.
+    """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
         if not self._connection:
             raise ConnectionError(f"Робот {self.name} не подключен")
-        return func(self, *args, **kwargs)
+        try:
+            return func(self, *args, **kwargs)
+        except OSError as e:
+            raise ConnectionError(f"[{self.name}] Обрыв связи в {func.__name__}: {e}") from e
     return wrapper
 
 
@@ -36,17 +45,71 @@ class RobotProgrammStateDecoder:
         return programm_states.get(programm_state)
     
 
+@dataclass
+class PoseWriteStats:
+    writes: int = 0         # реальные записи PR в контроллер
+    skipped: int = 0        # поза совпала с последней подтверждённой в пределах допуска
+
+    def as_dict(self) -> dict[str, object]:
+        total = self.writes + self.skipped
+        return {
+            "writes": self.writes,
+            "skipped": self.skipped,
+            "hit_rate": round(self.skipped / total, 3) if total else None,
+        }
+
+
+@dataclass
+class ProgramStateStats:
+    refreshes: int = 0      # чтения списка программ из контроллера (all_running_programs)
+    hits: int = 0           # запросы состояния, отвеченные из кэша
+    commands: int = 0       # отправленные start / stop / pause / resume
+    skipped: int = 0        # программа уже в нужном состоянии, команда не отправлялась
+
+    def as_dict(self) -> dict[str, object]:
+        lookups = self.refreshes + self.hits
+        return {
+            "refreshes": self.refreshes,
+            "hits": self.hits,
+            "commands": self.commands,
+            "skipped": self.skipped,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
 class RobotAgilebot(CellRobot):
     """
     Класс, основанный на SDK Agilebot - содержит методы, которые позволяют 
     использовать оснонвые функции коллаборативного робота
     - Обязательно овыполнить подключение connect() после создания экземпляра для успешного использования
+
+    Запись PR кэшируется: объекты PoseRegister создаются один раз на номер регистра,
+    а поза, совпадающая с последней подтверждённой записью (pose_tolerance, мм/градусы),
+    не отправляется повторно. Кэш верен, пока PR пишет только этот клиент:
+    после переподключения он сбрасывается, для PR, которые меняет программа
+    контроллера, — invalidate_pose_cache(pr_id).
+
+    Состояния программ (RUNNING / PAUSED / IDLE по имени) тоже кэшируются: список
+    перечитывается, только если снимку больше program_state_max_age_s (фоновое
+    обновление — refresh_program_states() из ProgramStateRefresher), а свои команды
+    сразу отражаются в снимке. Групповые pause / resume шлют команды только
+    программам не в целевом состоянии; если контроллер отверг команду (снимок
+    разошёлся с ним), список перечитывается и операция повторяется один раз.
+    stop_all_running_programms снимку не верит и всегда читает список заново.
     """
-    def __init__(self, name: str, ip: str):
+    def __init__(self, name: str, ip: str, pose_tolerance: float = 1e-3, program_state_max_age_s: float = 1.0):
         self.name = name
         self.ip = ip
         self._connection = False
         self.arm = Arm()
+        self.pose_tolerance = pose_tolerance
+        self.pose_stats = PoseWriteStats()
+        self._pose_registers: dict[int, PoseRegister] = {}
+        self._confirmed_poses: dict[int, tuple[float, ...]] = {}
+        self.program_state_max_age_s = program_state_max_age_s
+        self.program_stats = ProgramStateStats()
+        self._programs: dict[str, str] = {}
+        self._programs_at: float | None = None      # момент снимка; None — перечитать
 
     def _check_status(self, ret, msg: str = ""):
         "Безопасная замена assert ret для надженого дебага"
@@ -57,20 +120,25 @@ class RobotAgilebot(CellRobot):
 
     def connect(self) -> None:
         print(f"[{self.name}] Подключение к роботу {self.ip}")
-        ret = self.arm.connect(self.ip)
         try:
+            ret = self.arm.connect(self.ip)
             self._check_status(ret, "connect")
-        except DeviceError as e:
+        except (DeviceError, OSError) as e:
             self._connection = False
             raise ConnectionError(f"[{self.name}] Не удалось подключиться к {self.ip}") from e
         else:
             self._connection = True
+            self.invalidate_pose_cache()    # контроллер мог перезагрузиться, пока связи не было
+            self.invalidate_program_states()
 
-    @require_connection
     def disconnect(self) -> None:
-        """Отключение от робота"""
+        """
+        Отключение от робота: закрывает соединение SDK.
+        Без проверки подключения — нужно и для закрытия оборванного соединения перед connect().
+        """
         print(f"[{self.name}] Отключение от робота")
         self._connection = False
+        self.arm.disconnect()
 
     def is_connected(self) -> bool:
         return self._connection
@@ -92,30 +160,83 @@ class RobotAgilebot(CellRobot):
         """Запуск программы с выбранным именем"""
         ret = self.arm.execution.start(program_name)
         self._check_status(ret)
+        self.program_stats.commands += 1
+        self._programs[program_name] = "RUNNING"
 
     @require_connection
     def pause_program(self) -> None:
-        """Постановка программы на паузу"""
-        programs_list, ret = self.arm.execution.all_running_programs()
-        self._check_status(ret)
-        for program in programs_list:
-            ret = self.arm.execution.pause(program.program_name)
-            self._check_status(ret)
+        """Постановка на паузу всех выполняющихся программ"""
+        self._for_programs(("RUNNING",), self.arm.execution.pause, "PAUSED", "pause")
 
     @require_connection
     def resume_program(self) -> None:
-        """Снятие программы с паузы"""
-        programs_list, ret = self.arm.execution.all_running_programs()
-        self._check_status(ret)
-        for program in programs_list:
-            ret = self.arm.execution.resume(program.program_name)
-            self._check_status(ret)
+        """Снятие с паузы всех программ на паузе"""
+        self._for_programs(("PAUSED",), self.arm.execution.resume, "RUNNING", "resume")
 
     @require_connection
     def stop_program(self, program_name) -> None:
         """Остановка и завершение программы"""
         ret = self.arm.execution.stop(program_name)
         self._check_status(ret)
+        self.program_stats.commands += 1
+        self._programs.pop(program_name, None)
+
+    # ---------- состояния программ ----------
+    def invalidate_program_states(self) -> None:
+        """Следующий запрос состояния перечитает список программ из контроллера."""
+        self._programs_at = None
+
+    @require_connection
+    def refresh_program_states(self) -> dict[str, str]:
+        """Один вызов all_running_programs -> {имя программы: RUNNING / PAUSED / IDLE}."""
+        programs_list, ret = self.arm.execution.all_running_programs()
+        self._check_status(ret)
+        self.program_stats.refreshes += 1
+        self._programs = {
+            program.program_name: RobotProgrammStateDecoder.decode_programm_state(program.program_status)
+            for program in programs_list
+        }
+        self._programs_at = time.monotonic()
+        return dict(self._programs)
+
+    def program_states(self, max_age_s: float | None = None) -> dict[str, str]:
+        """Снимок состояний программ не старше max_age_s (по умолчанию program_state_max_age_s)."""
+        max_age_s = self.program_state_max_age_s if max_age_s is None else max_age_s
+        if self._programs_at is None or time.monotonic() - self._programs_at > max_age_s:
+            return self.refresh_program_states()
+        self.program_stats.hits += 1
+        return dict(self._programs)
+
+    def _for_programs(
+        self,
+        states: tuple[str, ...] | None,
+        command: Callable[[str], object],
+        new_state: str | None,
+        what: str,
+        max_age_s: float | None = None,
+    ) -> None:
+        """
+        command(имя) каждой программе в одном из states (None — всем из списка);
+        new_state None — программа завершена и уходит из снимка.
+        max_age_s — возраст снимка, которому можно верить (0 — всегда перечитать список).
+        """
+        for attempt in range(2):
+            programs = self.program_states(max_age_s)
+            targets = [name for name, state in programs.items() if states is None or state in states]
+            self.program_stats.skipped += len(programs) - len(targets)
+            try:
+                for name in targets:
+                    self._check_status(command(name), f"{what} {name}")
+                    self.program_stats.commands += 1
+                    if new_state is None:
+                        self._programs.pop(name, None)
+                    else:
+                        self._programs[name] = new_state
+                return
+            except DeviceError:
+                if attempt:
+                    raise
+                self.invalidate_program_states()    # программа могла завершиться сама — снимок устарел
 
     @require_connection
     def reset_errors(self) -> None:
@@ -125,22 +246,15 @@ class RobotAgilebot(CellRobot):
 
     @require_connection
     def get_all_active_alarms(self) -> List:
-        """Получить все активные тревоги"""
+        """Получить все активные тревоги (уникальные имена в порядке контроллера)"""
         alarms, ret = self.arm.alarm.get_all_active_alarms()
         self._check_status(ret)
-        alarms_list = [alarm for alarm in alarms]
-        if len(alarms_list) > 0:
-            unique_names = list(set(alarm.Name for alarm in alarms_list))
-            return unique_names
-        else:
-            return [] 
+        return list(dict.fromkeys(alarm.Name for alarm in alarms)) if alarms else []
 
     @require_connection
     def get_all_running_programms_states(self) -> str: 
         """Возвращает один из 3 возможных статусов робота"""
-        programs_list, ret = self.arm.execution.all_running_programs()
-        self._check_status(ret)
-        program_states = [RobotProgrammStateDecoder.decode_programm_state(program.program_status) for program in programs_list]
+        program_states = list(self.program_states().values())
         if len(program_states) == 1:
             return program_states[0]
         elif len(program_states) == 0:
@@ -150,12 +264,11 @@ class RobotAgilebot(CellRobot):
 
     @require_connection
     def stop_all_running_programms(self) -> None:
-        "Завершает ВСЕ активные программы робота"
-        programs_list, ret = self.arm.execution.all_running_programs()
-        self._check_status(ret)
-        for program in programs_list:
-            print(program.program_name)
-            self.stop_program(program.program_name)
+        """
+        Завершает ВСЕ активные программы робота. Список всегда читается заново: программа,
+        запущенная не этим клиентом (пульт, другой сеанс), есть не в каждом снимке кэша.
+        """
+        self._for_programs(None, self.arm.execution.stop, None, "stop", max_age_s=0.0)
 
     @require_connection
     def get_string_register(self, register_id: int) -> str:
@@ -200,27 +313,61 @@ class RobotAgilebot(CellRobot):
             ret = self.arm.digital_signals.write(SignalType.DO, do_id, SignalValue.OFF)
             self._check_status(ret)
 
+    def invalidate_pose_cache(self, pr_id: int | None = None) -> None:
+        """Следующая запись PR (или всех PR) уйдёт в контроллер без сравнения."""
+        if pr_id is None:
+            self._confirmed_poses.clear()
+        else:
+            self._confirmed_poses.pop(pr_id, None)
+
+    def _pose_register(self, pr_id: int) -> PoseRegister:
+        """Предсозданный PoseRegister для номера PR: posture и тип позы задаются один раз."""
+        pose_register = self._pose_registers.get(pr_id)
+        if pose_register is None:
+            pose_register = PoseRegister()
+            posture = Posture()
+            posture.arm_back_front = 0
+            posture.arm_up_down = 0
+            posture.wrist_flip = 0
+            posture.arm_left_right = 0
+
+            pose_register.poseRegisterData.posture = posture
+            pose_register.id = pr_id
+            pose_register.poseRegisterData.pt = PoseType.CART
+            self._pose_registers[pr_id] = pose_register
+        return pose_register
+
+    def _pose_unchanged(self, pr_id: int, pose: tuple[float, ...]) -> bool:
+        confirmed = self._confirmed_poses.get(pr_id)
+        return confirmed is not None and all(
+            abs(new - old) <= self.pose_tolerance for new, old in zip(pose, confirmed)
+        )
+
     @require_connection
     def set_pose_register(self, pr_id: int, x_val:int|float, y_val:int|float, z_val:int|float, a_val:int|float, b_val:int|float, c_val:int|float):
-        pose_register = PoseRegister()
-        posture = Posture()
-        posture.arm_back_front = 0
-        posture.arm_up_down = 0
-        posture.wrist_flip = 0
-        posture.arm_left_right = 0
-
-
-        pose_register.poseRegisterData.posture = posture
-        pose_register.id = pr_id
-        pose_register.poseRegisterData.pt = PoseType.CART
-        pose_register.poseRegisterData.cartData.position.x = x_val
-        pose_register.poseRegisterData.cartData.position.y = y_val
-        pose_register.poseRegisterData.cartData.position.z = z_val
-        pose_register.poseRegisterData.cartData.position.a = a_val
-        pose_register.poseRegisterData.cartData.position.b = b_val
-        pose_register.poseRegisterData.cartData.position.c = c_val
+        pose = (x_val, y_val, z_val, a_val, b_val, c_val)
+        if self._pose_unchanged(pr_id, pose):
+            self.pose_stats.skipped += 1
+            return
+
+        pose_register = self._pose_register(pr_id)
+        position = pose_register.poseRegisterData.cartData.position
+        position.x, position.y, position.z, position.a, position.b, position.c = pose
+
+        self._confirmed_poses.pop(pr_id, None)      # при ошибке записи значение в контроллере неизвестно
         ret = self.arm.register.write_PR(pose_register)
         self._check_status(ret)
+        self._confirmed_poses[pr_id] = pose
+        self.pose_stats.writes += 1
+
+    @require_connection
+    def set_pose_registers(self, poses: dict[int, tuple[float, float, float, float, float, float]]) -> None:
+        """
+        Пачка PR (подход, захват, отвод ...) одним вызовом: неизменившиеся пропускаются,
+        через исполнитель I/O вся пачка — одна команда очереди.
+        """
+        for pr_id, pose in poses.items():
+            self.set_pose_register(pr_id, *pose)
 
     @require_connection
     def get_DI(self, di_id) -> bool:
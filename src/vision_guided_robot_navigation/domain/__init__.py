@@ -1,7 +1,8 @@
 # src/vision_guided_robot_navigation/domain/__init__.py
 from .sensors import SensorConfig, SensorType, RobotRole
-from .tripods import LoadingTripod, UnloadingTripod, Tripod
+from .tripods import LoadingTripod, UnloadingTripod, Tripod, TripodChange, TripodListener
 from .racks import Rack, RackManager, RackOccupancy, RACK_SAFE_DISTANCE
+from .geometry import LayoutGeometry, FixtureKind, Pose, transform_poses, transform_points
 
 __all__ = [
     "SensorConfig",
@@ -10,8 +11,15 @@ __all__ = [
     "LoadingTripod",
     "UnloadingTripod",
     "Tripod",
+    "TripodChange",
+    "TripodListener",
     "Rack",
     "RackManager",
     "RackOccupancy",
     "RACK_SAFE_DISTANCE",
+    "LayoutGeometry",
+    "FixtureKind",
+    "Pose",
+    "transform_poses",
+    "transform_points",
 ]
@@ -0,0 +1,237 @@
+# src/vision_guided_robot_navigation/domain/geometry.py
+"""
+Геометрия рабочей ячейки.
+
+Позы всех слотов штативов и рэков считаются один раз из layout.yaml и хранятся
+одной таблицей NumPy (N, 6): x, y, z, a, b, c в базовой СК робота.
+Углы в градусах, порядок как у контроллера Agilebot: R = Rz(c) @ Ry(b) @ Rx(a).
+"""
+from __future__ import annotations
+
+from enum import Enum
+
+import numpy as np
+
+from src.vision_guided_robot_navigation.config.layout.config import (
+    FixtureGridConfig,
+    LayoutGeometryConfig,
+)
+
+Pose = tuple[float, float, float, float, float, float]
+
+
+class FixtureKind(str, Enum):
+    UNLOADING_TRIPOD = "unloading_tripod"   # штативы, из которых берёт загрузчик
+    LOADING_TRIPOD = "loading_tripod"       # штативы, в которые ставит выгрузчик
+    RACK = "rack"                           # позиции рэков "1".."N+M"
+
+
+# ----------------------ПРЕОБРАЗОВАНИЯ----------------------
+def _wrap_deg(angles: np.ndarray) -> np.ndarray:
+    """Приводит углы к диапазону (-180, 180]."""
+    return 180.0 - np.mod(180.0 - angles, 360.0)
+
+def euler_to_matrix(angles: np.ndarray) -> np.ndarray:
+    """(N, 3) углов a, b, c в градусах -> (N, 3, 3) матриц поворота."""
+    a, b, c = np.deg2rad(np.atleast_2d(np.asarray(angles, dtype=np.float64))).T
+    ca, sa = np.cos(a), np.sin(a)
+    cb, sb = np.cos(b), np.sin(b)
+    cc, sc = np.cos(c), np.sin(c)
+
+    r = np.empty((a.shape[0], 3, 3))
+    r[:, 0, 0] = cc * cb
+    r[:, 0, 1] = cc * sb * sa - sc * ca
+    r[:, 0, 2] = cc * sb * ca + sc * sa
+    r[:, 1, 0] = sc * cb
+    r[:, 1, 1] = sc * sb * sa + cc * ca
+    r[:, 1, 2] = sc * sb * ca - cc * sa
+    r[:, 2, 0] = -sb
+    r[:, 2, 1] = cb * sa
+    r[:, 2, 2] = cb * ca
+    return r
+
+def matrix_to_euler(r: np.ndarray) -> np.ndarray:
+    """(N, 3, 3) матриц поворота -> (N, 3) углов a, b, c в градусах."""
+    cb = np.hypot(r[:, 0, 0], r[:, 1, 0])
+    singular = cb < 1e-9    # b = ±90°: a и c вырождаются, c принимаем за 0
+
+    b = np.arctan2(-r[:, 2, 0], cb)
+    a = np.where(
+        singular,
+        np.arctan2(-r[:, 1, 2], r[:, 1, 1]),
+        np.arctan2(r[:, 2, 1], r[:, 2, 2]),
+    )
+    c = np.where(singular, 0.0, np.arctan2(r[:, 1, 0], r[:, 0, 0]))
+    return np.rad2deg(np.stack([a, b, c], axis=1))
+
+def poses_to_matrices(poses: np.ndarray) -> np.ndarray:
+    """(N, 6) поз -> (N, 4, 4) однородных матриц."""
+    poses = np.atleast_2d(np.asarray(poses, dtype=np.float64))
+    m = np.zeros((poses.shape[0], 4, 4))
+    m[:, :3, :3] = euler_to_matrix(poses[:, 3:6])
+    m[:, :3, 3] = poses[:, 0:3]
+    m[:, 3, 3] = 1.0
+    return m
+
+def matrices_to_poses(m: np.ndarray) -> np.ndarray:
+    """(N, 4, 4) однородных матриц -> (N, 6) поз."""
+    poses = np.empty((m.shape[0], 6))
+    poses[:, 0:3] = m[:, :3, 3]
+    poses[:, 3:6] = matrix_to_euler(m[:, :3, :3])
+    return poses
+
+def transform_points(transform: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Переводит (N, 3) точек матрицей 4x4 одним умножением."""
+    points = np.atleast_2d(np.asarray(points, dtype=np.float64))
+    return points @ transform[:3, :3].T + transform[:3, 3]
+
+def transform_poses(transform: np.ndarray, poses: np.ndarray) -> np.ndarray:
+    """
+    Переводит весь список поз (N, 6) в другую СК матрицей 4x4.
+    Например, все детекции камеры -> базовая СК робота за один вызов.
+    """
+    return matrices_to_poses(transform @ poses_to_matrices(poses))
+
+
+# ----------------------ТАБЛИЦА СЛОТОВ----------------------
+def _build_fixture_table(grid: FixtureGridConfig, origin: tuple[float, float, float, float]) -> np.ndarray:
+    """Позы всех слотов одного экземпляра оснастки (slots, 6)."""
+    x0, y0, z0, rz = origin
+    px, py = grid.pitch
+    rows, cols = np.divmod(np.arange(grid.slots), grid.cols)
+
+    theta = np.deg2rad(rz)
+    rot = np.array([[np.cos(theta), -np.sin(theta)],
+                    [np.sin(theta),  np.cos(theta)]])
+    local = np.stack([cols * px, rows * py], axis=1)
+
+    table = np.empty((grid.slots, 6))
+    table[:, 0:2] = local @ rot.T + (x0, y0)
+    table[:, 2] = z0
+    table[:, 3:6] = grid.orientation
+    table[:, 5] = _wrap_deg(table[:, 5] + rz)
+    return table
+
+
+class LayoutGeometry:
+    """
+    Предрассчитанные позы слотов всех штативов и рэков ячейки.
+
+    - table: (N, 6) все слоты подряд, только для чтения
+    - slot_pose(kind, name, slot): O(1) поиск готового кортежа для set_pose_register
+    """
+
+    def __init__(self, cfg: LayoutGeometryConfig):
+        self.cfg = cfg
+        self.dump_center = np.array(cfg.dump_center)
+        self._ranges: dict[tuple[FixtureKind, str], tuple[int, int]] = {}
+
+        tables = []
+        start = 0
+        for kind, grid in self._grids():
+            for i, origin in enumerate(grid.origins):
+                tables.append(_build_fixture_table(grid, origin))
+                self._ranges[(kind, f"{i+1}")] = (start, start + grid.slots)
+                start += grid.slots
+
+        self.table = np.concatenate(tables)
+        self.table.setflags(write=False)
+
+        # Номер экземпляра оснастки для каждой строки таблицы (для валидации)
+        self._fixture_ids = np.empty(len(self.table), dtype=np.int32)
+        for fixture_id, (lo, hi) in enumerate(self._ranges.values()):
+            self._fixture_ids[lo:hi] = fixture_id
+
+        # Готовые кортежи — горячий путь итерации не трогает NumPy
+        self._lookup: dict[tuple[FixtureKind, str, int], Pose] = {}
+        for (kind, name), (lo, hi) in self._ranges.items():
+            for slot, row in enumerate(self.table[lo:hi].tolist()):
+                self._lookup[(kind, name, slot)] = tuple(row)
+
+    def _grids(self) -> tuple[tuple[FixtureKind, FixtureGridConfig], ...]:
+        return (
+            (FixtureKind.UNLOADING_TRIPOD, self.cfg.unloading_tripods),
+            (FixtureKind.LOADING_TRIPOD, self.cfg.loading_tripods),
+            (FixtureKind.RACK, self.cfg.racks),
+        )
+
+    def fixture_names(self, kind: FixtureKind) -> list[str]:
+        return [name for (k, name) in self._ranges if k == kind]
+
+    def fixture_table(self, kind: FixtureKind, name: str) -> np.ndarray:
+        """Позы всех слотов оснастки (slots, 6), view на общую таблицу."""
+        lo, hi = self._ranges[(kind, name)]
+        return self.table[lo:hi]
+
+    def slot_pose(self, kind: FixtureKind, name: str, slot: int) -> Pose:
+        """Поза слота (x, y, z, a, b, c) в базовой СК робота."""
+        try:
+            return self._lookup[(kind, name, slot)]
+        except KeyError:
+            raise ValueError(f"slot_pose: нет слота {slot} у {kind.value} '{name}'") from None
+
+    def slot_poses(self, kind: FixtureKind, name: str, slots: np.ndarray) -> np.ndarray:
+        """Пакетный вариант slot_pose: (K,) номеров -> (K, 6) поз."""
+        return self.fixture_table(kind, name)[np.asarray(slots)]
+
+    def validate(self, min_clearance: float = 5.0) -> list[str]:
+        """
+        Офлайн-проверка раскладки.
+        Возвращает список проблем: слоты разных оснасток ближе min_clearance (мм).
+        """
+        issues: list[str] = []
+        for kind, grid in self._grids():
+            px, py = grid.pitch
+            if (grid.cols > 1 and px <= 0) or (grid.rows > 1 and py <= 0):
+                issues.append(f"{kind.value}: неположительный шаг сетки {grid.pitch}")
+
+        xyz = self.table[:, 0:3]
+        dist = np.linalg.norm(xyz[:, None, :] - xyz[None, :, :], axis=2)
+        foreign = self._fixture_ids[:, None] != self._fixture_ids[None, :]
+        too_close = np.argwhere(foreign & (dist < min_clearance))
+
+        keys = list(self._ranges.keys())
+        reported: set[tuple[int, int]] = set()
+        for i, j in too_close:
+            pair = (int(self._fixture_ids[i]), int(self._fixture_ids[j]))
+            if pair[0] >= pair[1] or pair in reported:
+                continue
+            reported.add(pair)
+            (kind_a, name_a), (kind_b, name_b) = keys[pair[0]], keys[pair[1]]
+            issues.append(
+                f"{kind_a.value} '{name_a}' и {kind_b.value} '{name_b}' "
+                f"пересекаются: {dist[i, j]:.1f} мм < {min_clearance} мм"
+            )
+        return issues
+
+    def __str__(self) -> str:
+        counts = {kind: len(self.fixture_names(kind)) for kind in FixtureKind}
+        return (
+            f"Геометрия ячейки: {len(self.table)} слотов "
+            f"({', '.join(f'{kind.value}: {n}' for kind, n in counts.items())})"
+        )
+
+
+if __name__ == "__main__":
+    def main():
+        from time import perf_counter
+        from src.vision_guided_robot_navigation.config import load_system_layout_config
+
+        cfg = load_system_layout_config()
+        geometry = LayoutGeometry(cfg.geometry)
+        print(geometry)
+
+        issues = geometry.validate()
+        print("Раскладка корректна" if not issues else "\n".join(issues))
+
+        st = perf_counter()
+        for _ in range(10_000):
+            geometry.slot_pose(FixtureKind.LOADING_TRIPOD, "1", 17)
+        print(f"{(perf_counter()-st) / 10_000 * 1e6:.3f} us --- slot_pose")
+
+        detections = np.random.default_rng(0).uniform(-100, 100, size=(64, 6))
+        camera_to_base = poses_to_matrices(np.array([[300, 0, 500, 180, 0, 90]]))[0]
+        st = perf_counter()
+        transform_poses(camera_to_base, detections)
+        print(f"{(perf_counter()-st) * 1e6:.1f} us --- transform_poses x{len(detections)}")
+    main()
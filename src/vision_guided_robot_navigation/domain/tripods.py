@@ -1,9 +1,26 @@
 # src/vision_guided_robot_navigation/domain/tripods.py
-from typing import Optional
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass(frozen=True)
+class TripodChange:
+    """Событие изменения штатива: состояние уже после изменения."""
+    name: str
+    availability: bool
+    tubes: Optional[int]
+    reason: str             # "availability" / "tubes" / "place" / "grab"
+
+
+TripodListener = Callable[[TripodChange], None]
+
 
 class Tripod:
     """
-    Родительский класс стандартных штативов
+    Родительский класс стандартных штативов.
+
+    Изменения доступности и числа пробирок публикуются подписчикам (subscribe),
+    поэтому потокам не нужно опрашивать штатив в цикле.
     """
     MIN_TUBES = 0      # MIN кол-во пробирок в паллете
     MAX_TUBES = 50     # MAX кол-во пробирок в паллете
@@ -18,11 +35,23 @@ class Tripod:
         self._tubes = None
         # даём возможность иметь свой MAX_TUBES на экземпляр
         self.MAX_TUBES = Tripod.MAX_TUBES
+        self._listeners: list[TripodListener] = []
+
+    def subscribe(self, listener: TripodListener) -> Callable[[], None]:
+        """Подписка на изменения штатива. Возвращает функцию отписки."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _publish(self, reason: str) -> None:
+        change = TripodChange(self.name, bool(self.availability), self._tubes, reason)
+        for listener in list(self._listeners):
+            listener(change)
 
     def set_availability(self, state: bool):
         """Установить доступность паллета"""
         self._tubes = self.MAX_TUBES if state else self._tubes
         self.availability = state
+        self._publish("availability")
         return state
     
     def _create_palletizing_number(self, prob_number: int) -> int:
@@ -37,6 +66,7 @@ class Tripod:
         if not (self.MIN_TUBES <= set_count <= self.MAX_TUBES):
             raise ValueError(f"set_tubes: значение {set_count} вне диапазона 0..{self.MAX_TUBES}")
         self._tubes = set_count
+        self._publish("tubes")
         return self._tubes
     
     def get_empty_places(self) -> int:
@@ -67,6 +97,8 @@ class UnloadingTripod(Tripod):
 
         if self._tubes <= self.MIN_TUBES:
             self.set_availability(False)
+        else:
+            self._publish("grab")
 
         return self._create_palletizing_number(self._tubes)
 
@@ -88,6 +120,7 @@ class LoadingTripod(Tripod):
         """Установить доступность паллета"""
         self._tubes = self.MIN_TUBES if state else self._tubes
         self.availability = state
+        self._publish("availability")
         return state
     
     def _create_palletizing_number(self, prob_number: int) -> int:
@@ -103,6 +136,8 @@ class LoadingTripod(Tripod):
 
         if self._tubes >= self.MAX_TUBES:
             self.set_availability(False)
+        else:
+            self._publish("place")
 
         return self._create_palletizing_number(self._tubes)
     
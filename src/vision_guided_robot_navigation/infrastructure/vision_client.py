@@ -26,29 +26,37 @@ class TubeCoordinates:
             "c": float(self.c),
         }
 
+Roi = tuple[int, int, int, int]     # x0, y0, x1, y1 в пикселях кадра
+
+
+def format_roi(roi: Roi) -> str:
+    return ",".join(str(int(v)) for v in roi)
+
+
 class VisionClient:
-    def __init__(self, base_url: str, *, timeout_s: float = 2.0) -> None:
+    """
+    camera — ключ камеры в cameras.yaml vision-сервиса (ROI и тайлинг камеры), None — камера по умолчанию.
+    roi — подсказка, где искать пробирки; сервис сужает ей ROI камеры.
+    """
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        timeout_s: float = 2.0,
+        camera: str | None = None,
+        roi: Roi | None = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout_s = timeout_s
+        self.camera = camera
+        self.roi = roi
 
     def health(self) -> bool:
         r = requests.get(f"{self.base_url}/health", timeout=self.timeout_s)
         return r.status_code == 200
 
-    def predict_from_file(self, image_path: str) -> TubeCoordinates | None:
-        """
-        ЛИНЕЙНО: отправляем файл, ждём ответ.
-        Возвращаем None, если сервис не дал валидный результат.
-        """
-        with open(image_path, "rb") as f:
-            files = {"image": ("frame.jpg", f, "image/jpeg")}
-            r = requests.post(f"{self.base_url}/predict", files=files, timeout=self.timeout_s)
-
-        if r.status_code != 200:
-            return None
-
-        data: dict[str, Any] = r.json()
-
+    @staticmethod
+    def _parse_coordinates(data: dict[str, Any]) -> TubeCoordinates | None:
         # минимальная валидация ключей
         for k in ("x", "y", "z", "a", "b", "c"):
             if k not in data:
@@ -62,4 +70,52 @@ class VisionClient:
             b=float(data["b"]),
             c=float(data["c"]),
             confidence=float(data["confidence"]) if "confidence" in data else None,
-        )
\ No newline at end of file
+        )
+
+    def _form_fields(self, roi: Roi | None) -> dict[str, str]:
+        fields = {}
+        if self.camera is not None:
+            fields["camera"] = self.camera
+        roi = roi or self.roi
+        if roi is not None:
+            fields["roi"] = format_roi(roi)
+        return fields
+
+    def _post_file(self, image_path: str, roi: Roi | None = None) -> dict[str, Any] | None:
+        with open(image_path, "rb") as f:
+            files = {"image": ("frame.jpg", f, "image/jpeg")}
+            r = requests.post(
+                f"{self.base_url}/predict",
+                files=files,
+                data=self._form_fields(roi),
+                timeout=self.timeout_s,
+            )
+
+        if r.status_code != 200:
+            return None
+
+        return r.json()
+
+    def predict_from_file(self, image_path: str) -> TubeCoordinates | None:
+        """
+        ЛИНЕЙНО: отправляем файл, ждём ответ.
+        Возвращаем None, если сервис не дал валидный результат.
+        """
+        data = self._post_file(image_path)
+        if data is None:
+            return None
+        return self._parse_coordinates(data)
+
+    def predict_candidates_from_file(self, image_path: str, roi: Roi | None = None) -> list[TubeCoordinates]:
+        """
+        Все кандидаты из ответа сервиса ("candidates"), лучший — первым.
+        Старый формат ответа с одной позой даёт список из одного элемента.
+        roi — подсказка на этот запрос вместо заданной в конструкторе.
+        """
+        data = self._post_file(image_path, roi)
+        if data is None:
+            return []
+
+        raw_candidates = data.get("candidates", [data])
+        candidates = [self._parse_coordinates(c) for c in raw_candidates]
+        return [c for c in candidates if c is not None]
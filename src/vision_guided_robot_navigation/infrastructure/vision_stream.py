@@ -0,0 +1,226 @@
+# src/vision_guided_robot_navigation/infrastructure/vision_stream.py
+"""
+Потоковый клиент vision-сервиса (WebSocket /stream).
+
+Фоновый поток непрерывно отправляет кадры и складывает ответы в кэш
+"последней детекции" — поток робота читает его без запроса на каждый пик.
+Формат сообщений описан в vision_service.orchestration.app.streaming.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from websockets.exceptions import WebSocketException
+from websockets.sync.client import connect
+
+from src.vision_guided_robot_navigation.infrastructure.vision_client import TubeCoordinates, VisionClient
+
+FRAME_HEADER = struct.Struct(">Q")
+
+
+@dataclass(frozen=True)
+class Detection:
+    frame_id: int
+    candidates: list[TubeCoordinates]
+    sent_at: float              # time.monotonic() отправки кадра
+    received_at: float          # time.monotonic() получения результата
+
+    @property
+    def age_s(self) -> float:
+        """Возраст кадра, по которому получен результат."""
+        return time.monotonic() - self.sent_at
+
+    @property
+    def round_trip_ms(self) -> float:
+        return (self.received_at - self.sent_at) * 1e3
+
+
+def file_frame_source(path: str) -> Callable[[], bytes | None]:
+    """Источник кадров из файла (пока вместо камеры — тот же test_data/frame.jpg)."""
+    def read() -> bytes | None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+    return read
+
+
+class StreamingVisionClient(threading.Thread):
+    """
+    frame_source    — возвращает очередной JPEG или None, если кадра пока нет
+    period_s        — минимальный интервал между кадрами
+    max_in_flight   — сколько кадров может ждать ответа; дальше кадры не отправляются,
+                      чтобы не копить задержку (сервер всё равно выбросит старые)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        frame_source: Callable[[], bytes | None],
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        *,
+        period_s: float = 0.1,
+        max_in_flight: int = 2,
+        reconnect_s: float = 1.0,
+    ) -> None:
+        super().__init__(name="StreamingVisionClient", daemon=True)
+        self.url = url
+        self.frame_source = frame_source
+        self.stop_event = stop_event
+        self.logger = logger
+        self.period_s = period_s
+        self.max_in_flight = max_in_flight
+        self.reconnect_s = reconnect_s
+
+        self._lock = threading.Condition()
+        self._latest: Detection | None = None
+        self._sent_at: dict[int, float] = {}
+        self._next_frame_id = 0
+        self.frames_sent = 0
+        self.results_received = 0
+        self.results_malformed = 0      # не JSON / не тот формат — пропущены
+        self.frames_dropped = 0         # по данным сервера
+
+    # ---------------------- КЭШ ----------------------
+    def get_latest(self, max_age_s: float | None = None) -> Detection | None:
+        """Последняя детекция; None, если её нет или кадр старше max_age_s."""
+        with self._lock:
+            latest = self._latest
+        if latest is None or (max_age_s is not None and latest.age_s > max_age_s):
+            return None
+        return latest
+
+    def wait_for_newer(self, frame_id: int | None, timeout: float) -> Detection | None:
+        """Ждёт детекцию по кадру новее frame_id (например, снятому после завершения движения)."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while self._latest is None or (frame_id is not None and self._latest.frame_id <= frame_id):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self.stop_event.is_set():
+                    return None
+                self._lock.wait(remaining)
+            return self._latest
+
+    def invalidate(self) -> None:
+        """Сбрасывает кэш: сцена изменилась (пробирку забрали), старый результат неактуален."""
+        with self._lock:
+            self._latest = None
+
+    # ---------------------- ПОТОК ----------------------
+    def run(self) -> None:
+        self.logger.info(f"[VisionStream] Поток запущен, {self.url}")
+        while not self.stop_event.is_set():
+            try:
+                with connect(self.url, max_size=None, open_timeout=2.0) as ws:
+                    self.logger.info("[VisionStream] Соединение установлено")
+                    rx_done = threading.Event()     # приём остановлен — отправлять в это соединение незачем
+                    receiver = threading.Thread(
+                        target=self._receive_loop, args=(ws, rx_done), name="VisionStreamRx", daemon=True
+                    )
+                    receiver.start()
+                    self._send_loop(ws, rx_done)
+                    ws.close()
+                    receiver.join(timeout=1.0)
+            except (OSError, WebSocketException) as e:
+                self.logger.warning(f"[VisionStream] Соединение потеряно: {e}")
+            with self._lock:
+                self._sent_at.clear()
+            self.stop_event.wait(self.reconnect_s)
+        self.logger.info("[VisionStream] Поток остановлен")
+
+    def _send_loop(self, ws, rx_done: threading.Event) -> None:
+        while not self.stop_event.is_set() and not rx_done.is_set():
+            started = time.monotonic()
+            with self._lock:
+                can_send = len(self._sent_at) < self.max_in_flight
+            frame = self.frame_source() if can_send else None
+            if frame:
+                with self._lock:
+                    frame_id = self._next_frame_id
+                    self._next_frame_id += 1
+                    self._sent_at[frame_id] = time.monotonic()
+                ws.send(FRAME_HEADER.pack(frame_id) + frame)
+                self.frames_sent += 1
+            self.stop_event.wait(max(0.0, self.period_s - (time.monotonic() - started)))
+
+    def _receive_loop(self, ws, rx_done: threading.Event) -> None:
+        """
+        Битое сообщение пропускается; любая другая ошибка закрывает соединение:
+        отправка останавливается, run() переподключается, а не шлёт кадры в пустоту.
+        """
+        try:
+            for message in ws:
+                try:
+                    self._handle_result(json.loads(message))
+                except (ValueError, KeyError, TypeError) as e:
+                    self.results_malformed += 1
+                    self.logger.warning(f"[VisionStream] Некорректный ответ пропущен: {type(e).__name__}: {e}")
+        except WebSocketException:
+            pass
+        except Exception as e:
+            self.logger.error(f"[VisionStream] Приём результатов остановлен: {type(e).__name__}: {e}")
+        finally:
+            rx_done.set()
+            ws.close()
+
+    def _handle_result(self, data: dict) -> None:
+        """ValueError / KeyError / TypeError — сообщение не в формате streaming."""
+        if not isinstance(data, dict):
+            raise ValueError(f"ожидался JSON-объект, получено {type(data).__name__}")
+        frame_id = data.get("frame_id")
+        if "error" not in data and not isinstance(frame_id, int):
+            raise ValueError(f"frame_id={frame_id!r} в ответе с результатом")
+        now = time.monotonic()
+        with self._lock:
+            # кадры, отправленные до этого и без ответа, сервер вытеснил
+            for stale in [fid for fid in self._sent_at if frame_id is not None and fid < frame_id]:
+                del self._sent_at[stale]
+            sent_at = self._sent_at.pop(frame_id, now)
+
+        self.results_received += 1
+        self.frames_dropped = data.get("dropped", self.frames_dropped)
+        if "error" in data:
+            self.logger.warning(f"[VisionStream] Кадр {frame_id}: {data['error']}")
+            return
+
+        raw = data.get("candidates", [])
+        candidates = [c for c in (VisionClient._parse_coordinates(r) for r in raw) if c is not None]
+        detection = Detection(frame_id=frame_id, candidates=candidates, sent_at=sent_at, received_at=now)
+        with self._lock:
+            if self._latest is None or frame_id > self._latest.frame_id:
+                self._latest = detection
+            self._lock.notify_all()
+
+
+if __name__ == "__main__":
+    def main():
+        # PYTHONPATH=src python -m vision_service.orchestration.app.bootstrap — в соседнем терминале
+        logging.basicConfig(level=logging.INFO)
+        stop = threading.Event()
+        client = StreamingVisionClient(
+            "ws://127.0.0.1:8010/stream",
+            file_frame_source("test_data/frame.jpg"),
+            stop,
+            logging.getLogger("stream"),
+            period_s=0.02,
+        )
+        client.start()
+        time.sleep(5)
+        stop.set()
+        client.join()
+        latest = client.get_latest()
+        print(
+            f"отправлено {client.frames_sent}, получено {client.results_received}, "
+            f"вытеснено сервером {client.frames_dropped}, "
+            f"последний кадр {latest.frame_id if latest else None}, "
+            f"round-trip {latest.round_trip_ms if latest else 0:.1f} ms"
+        )
+    main()
@@ -1,8 +1,10 @@
 # src/vision_guided_robot_navigation/logging/__init__.py
 from .logger_factory import create_logger
 from .custom_hooks import install_global_exception_hooks
+from .phase_timer import PhaseTimer
 
 __all__ = [
     "create_logger",
     "install_global_exception_hooks",
+    "PhaseTimer",
 ]
\ No newline at end of file
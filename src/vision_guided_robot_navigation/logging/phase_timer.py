@@ -0,0 +1,43 @@
+# src/vision_guided_robot_navigation/logging/phase_timer.py
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class PhaseTimer:
+    """
+    Замер длительности фаз (старт системы, подготовка робота и т.п.).
+    Каждая фаза пишется в лог по завершении, summary() — общая сводка.
+    Фазы могут идти параллельно из разных потоков.
+    """
+
+    def __init__(self, logger: logging.Logger, title: str = "startup"):
+        self.logger = logger
+        self.title = title
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._phases: list[tuple[str, float, float]] = []   # (имя, старт от t0, длительность), с
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._phases.append((name, start - self._t0, duration))
+            self.logger.info(f"[{self.title}] {name}: {duration * 1000:.1f} мс")
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def summary(self) -> str:
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p[1])
+        lines = [f"[{self.title}] всего {self.elapsed() * 1000:.1f} мс:"]
+        for name, offset, duration in phases:
+            lines.append(f"  {offset * 1000:8.1f} .. {(offset + duration) * 1000:8.1f} мс  {name}")
+        return "\n".join(lines)
@@ -1,6 +1,11 @@
 # src/vision_guided_robot_navigation/orchestration/app/__init__.py
 from .bootstrap import run_workcell
+from .lifecycle import LifecycleManager, LifecycleError, Component, TimelineEntry
 
 __all__ = [
     "run_workcell",
+    "LifecycleManager",
+    "LifecycleError",
+    "Component",
+    "TimelineEntry",
 ]
\ No newline at end of file
@@ -1,37 +1,56 @@
 # src/vision_guided_robot_navigation/orchestration/app/bootstrap.py
 import threading
 import logging
-import time
-from typing import Dict
+from typing import Callable
 
-from src.vision_guided_robot_navigation.orchestration.app.shutdown import shutdown
+from src.vision_guided_robot_navigation.orchestration.app.lifecycle import LifecycleManager
+from src.vision_guided_robot_navigation.orchestration.app.shutdown import join_thread, shutdown
 
 from src.vision_guided_robot_navigation.logging import (
     create_logger, 
     install_global_exception_hooks,
+    PhaseTimer,
 )
 from src.vision_guided_robot_navigation.config import (
     load_system_layout_config,
     load_unloader_config,
+    load_protocol_config,
 )
 from src.vision_guided_robot_navigation.devices import (
     CellRobot,
     RobotAgilebot,
+    RobotIOExecutor,
+    QueuedCellRobot,
 )
 from src.vision_guided_robot_navigation.domain import (
     UnloadingTripod,
     LoadingTripod,
     Tripod,
     RackManager,
+    LayoutGeometry,
 )
+from src.vision_guided_robot_navigation.calibration import (
+    CalibrationStore,
+    CalibrationCache,
+)
+from src.vision_guided_robot_navigation.orchestration.runtime.planning import PickPlanner
 from src.vision_guided_robot_navigation.orchestration.runtime import ( 
+    AlarmMonitor,
+    ConnectionSupervisor,
+    GuardPolicy,
+    ProgramStateRefresher,
+    RegisterMapRegistry,
     TripodRefresher,
+    TripodRegistry,
+    TripodSelectionPolicy,
+    make_tripod_policy,
     UnloaderRobotThread,
-
+    Watchdog,
 )
 
 UNLOADER_CFG = load_unloader_config()
 UNLOADER_SCANNER = UNLOADER_CFG.scanner
+PROTOCOL_CFG = load_protocol_config()
 
 
 def build_loggers():
@@ -67,7 +86,15 @@ def build_layout(logger: logging.Logger):
                 f"\n{cfg.racks_in_unloading_zone} рэками в зоне Unloader."
     )
 
-    return unloading_tripods, loading_tripods, rack_manager
+    # Позы слотов считаем один раз при старте, а не на контроллере на каждую итерацию
+    geometry = None
+    if cfg.geometry is not None:
+        geometry = LayoutGeometry(cfg.geometry)
+        logger.info(geometry)
+        for issue in geometry.validate():
+            logger.warning(f"Проверка раскладки: {issue}")
+
+    return unloading_tripods, loading_tripods, rack_manager, geometry
 
 def build_tripod_refresher(
     tripods: list[Tripod],
@@ -75,19 +102,21 @@ def build_tripod_refresher(
     refresh_event: threading.Event,
     stop_event: threading.Event,
     logger: logging.Logger,
-) -> tuple[Dict[str, Tripod], TripodRefresher]:
+    policy: TripodSelectionPolicy | None = None,
+) -> tuple[TripodRegistry, TripodRefresher]:
     """
-    Строит словарь триподов и рефрешер для них.
+    Строит реестр триподов и рефрешер для них.
 
     tripods - список объектов Tripod (LoadingTripod или UnloadingTripod)
     """
-    tripod_map: Dict[str, Tripod] = {t.name: t for t in tripods}
+    tripod_map = TripodRegistry({t.name: t for t in tripods}, logger=logger)
     
     refresher = TripodRefresher(
         tripods=tripod_map,
         refresh_event=refresh_event,
         stop_event=stop_event,
         logger=logger,
+        policy=policy,
     )
     
     refresher.name = thread_name
@@ -96,75 +125,292 @@ def build_tripod_refresher(
     return tripod_map, refresher
 
 
-def run_workcell() -> None:
+def run_workcell(
+    wait_vision: Callable[[], None] | None = None,
+    timer: PhaseTimer | None = None,
+) -> None:
+    """
+    wait_vision — блокирующее ожидание готовности vision-сервиса. Отдельный компонент
+    запуска: подключение робота, раскладка и калибровка идут параллельно с прогревом модели.
+    timer — общий замер фаз старта (если None, создаётся свой на системном логгере).
+
+    Компоненты и их зависимости описаны ниже; LifecycleManager запускает независимые
+    параллельно и останавливает в обратном порядке (см. lifecycle.py).
+    """
     # 0. Создаем объекты для управления потоками и логирования
 
     unloader_tripod_refresh_event = threading.Event()
     stop_event = threading.Event()
+    io_stop_event = threading.Event()       # исполнитель I/O — свой: он нужен потокам до конца их остановки
 
     loggers = build_loggers()
     install_global_exception_hooks()
+    timer = timer or PhaseTimer(loggers["system"])
+    lifecycle = LifecycleManager(loggers["system"], timer=timer)
 
-    # 1. Поднимаем роботов и основные сенсоры
-    try:
-        unloader_robot = RobotAgilebot(name=UNLOADER_CFG.name, ip=UNLOADER_CFG.ip)
-        unloader_robot.connect()
-    except Exception:
-        loggers["system"].info("Не удалось подключиться к роботу")
+    # 1. Робот. Объект создаётся сразу: его остановка нужна, даже если подключение не удалось
+    unloader_robot = RobotAgilebot(
+        name=UNLOADER_CFG.name,
+        ip=UNLOADER_CFG.ip,
+        program_state_max_age_s=UNLOADER_CFG.programs.max_age_s,
+    )
 
-    # 2. Геометрия системы (штативы, рэки и т.д.)
-    unloading_tripods_list, loading_tripods_list, rack_manager = build_layout(
-        logger=loggers["system"]
+    def stop_robot() -> None:
+        try:
+            if unloader_robot.is_connected():
+                unloader_robot.stop_all_running_programms()
+            unloader_robot.disconnect()
+        except Exception as e:
+            loggers["system"].error(f"Ошибка при отключении: {e}")
+        loggers["system"].info(f"Запись PR за сеанс: {unloader_robot.pose_stats.as_dict()}")
+        loggers["system"].info(f"Состояния программ за сеанс: {unloader_robot.program_stats.as_dict()}")
+
+    def connect_robot() -> None:
+        try:
+            unloader_robot.connect()
+        except Exception as e:
+            # Не фатально: супервизор связи продолжит попытки в фоне
+            loggers["system"].warning(f"Не удалось подключиться к роботу: {e}")
+
+    lifecycle.add("robot", lambda: unloader_robot, stop=stop_robot, stop_timeout_s=10.0)
+    lifecycle.add("robot_connect", connect_robot, requires=("robot",), start_timeout_s=15.0, optional=True)
+
+    # 1.1 Единственный поток-владелец SDK: поток робота и мониторы датчиков ходят через его очередь
+    def start_io() -> tuple[RobotIOExecutor | None, CellRobot]:
+        if not UNLOADER_CFG.io.executor:
+            return None, unloader_robot
+        unloader_io = RobotIOExecutor(unloader_robot, stop_event=io_stop_event, logger=loggers["unloader"])
+        unloader_io.start()
+        return unloader_io, QueuedCellRobot(unloader_io, call_timeout_s=UNLOADER_CFG.io.call_timeout_s)
+
+    def stop_io() -> None:
+        # зависимые (связь, тревоги, программы, поток робота) уже остановлены: дорабатываем очередь
+        io_stop_event.set()
+        unloader_io, _ = lifecycle["io"]
+        if unloader_io is not None:
+            join_thread(unloader_io)
+
+    lifecycle.add("io", start_io, stop=stop_io, requires=("robot_connect",))
+
+    # 1.2 Heartbeat и переподключение с backoff; поток робота ждёт его после обрыва.
+    # Стартует вместе с потоком робота — после регистрации его re-prime колбэков
+    def create_connection() -> ConnectionSupervisor:
+        return ConnectionSupervisor(
+            lifecycle["io"][1],
+            stop_event=stop_event,
+            logger=loggers["system"],
+            heartbeat_nr=UNLOADER_CFG.connection.heartbeat_nr,
+            heartbeat_s=UNLOADER_CFG.connection.heartbeat_s,
+            backoff_initial_s=UNLOADER_CFG.connection.backoff_initial_s,
+            backoff_max_s=UNLOADER_CFG.connection.backoff_max_s,
+            jitter=UNLOADER_CFG.connection.jitter,
+        )
+
+    def stop_connection() -> None:
+        join_thread(lifecycle["connection"])
+        loggers["system"].info(f"Связь с роботом за сеанс: {lifecycle['connection'].as_dict()}")
+
+    lifecycle.add("connection", create_connection, stop=stop_connection, requires=("io",))
+
+    # 1.3 Тревоги контроллера: блокирующая прерывает итерацию сразу, а не по таймауту
+    def start_alarms() -> AlarmMonitor | None:
+        if not UNLOADER_CFG.alarms.enabled:
+            return None
+        unloader_alarms = AlarmMonitor(
+            lifecycle["io"][1],
+            stop_event=stop_event,
+            logger=loggers["unloader"],
+            poll_s=UNLOADER_CFG.alarms.poll_s,
+            blocking=UNLOADER_CFG.alarms.blocking,
+            ignore=UNLOADER_CFG.alarms.ignore,
+            connection=lifecycle["connection"],
+        )
+        unloader_alarms.start()
+        return unloader_alarms
+
+    lifecycle.add(
+        "alarms", start_alarms, stop=lambda: join_thread(lifecycle["alarms"]), requires=("io", "connection")
     )
 
-    for tripod in loading_tripods_list:
-        tripod.availability = True
-        tripod.set_tubes(0)
+    # 1.4 Состояния программ контроллера в фоне: stop / pause / resume без чтения списка перед каждой
+    def start_programs() -> ProgramStateRefresher:
+        unloader_programs = ProgramStateRefresher(
+            lifecycle["io"][1],
+            stop_event=stop_event,
+            logger=loggers["unloader"],
+            refresh_s=UNLOADER_CFG.programs.refresh_s,
+            connection=lifecycle["connection"],
+        )
+        unloader_programs.start()
+        return unloader_programs
+
+    lifecycle.add(
+        "programs", start_programs, stop=lambda: join_thread(lifecycle["programs"]), requires=("io", "connection")
+    )
+
+    # 2. Геометрия системы (штативы, рэки и т.д.)
+    def start_layout():
+        unloading_tripods_list, loading_tripods_list, rack_manager, geometry = build_layout(
+            logger=loggers["system"]
+        )
+        for tripod in loading_tripods_list:
+            tripod.availability = True
+            tripod.set_tubes(0)
+        return unloading_tripods_list, loading_tripods_list, rack_manager, geometry
+
+    lifecycle.add("layout", start_layout)
+
+    # 2.1 Готовность vision (модель прогревается, пока идут остальные компоненты)
+    lifecycle.add("vision_wait", wait_vision or (lambda: None), start_timeout_s=60.0)
 
     # 3. оздаем потоки управления состояниями триподов
-    unloader_tripods_by_name, unloader_tripod_thread = build_tripod_refresher(
-        tripods=loading_tripods_list,
-        thread_name="UnloaderTripodRefresher",
-        refresh_event=unloader_tripod_refresh_event,
-        stop_event=stop_event,
-        logger=loggers["unloader"],
+    def start_tripods() -> tuple[TripodRegistry, TripodRefresher]:
+        _, loading_tripods_list, _, geometry = lifecycle["layout"]
+        return build_tripod_refresher(
+            tripods=loading_tripods_list,
+            thread_name="UnloaderTripodRefresher",
+            refresh_event=unloader_tripod_refresh_event,
+            stop_event=stop_event,
+            logger=loggers["unloader"],
+            policy=make_tripod_policy(UNLOADER_CFG.tripod_policy, geometry),
+        )
+
+    lifecycle.add(
+        "tripods", start_tripods, stop=lambda: join_thread(lifecycle["tripods"][1]), requires=("layout",)
     )
 
-    # 4. Поток робота
-    unloader_thread = UnloaderRobotThread(
-        unloader_robot=unloader_robot,
-        unloader_cfg=UNLOADER_CFG,
-        unloader_tripods=unloader_tripods_by_name,
-        unloader_tripods_thread=unloader_tripod_thread,
-        logger= loggers["unloader"],
-        stop_event=stop_event,
+    # 4. Калибровка камера -> база (перечитывается только при изменении файла)
+    def load_calibration() -> CalibrationCache:
+        calibration_store = CalibrationStore()
+        if not calibration_store.exists():
+            loggers["system"].warning(f"Файл калибровки {calibration_store.path} не найден, позы vision передаются без преобразования")
+        return CalibrationCache(calibration_store, logger=loggers["system"])
+
+    lifecycle.add("calibration", load_calibration)
+
+    # 4.1 Потоковый vision: кадры идут непрерывно, поток робота читает кэш последней детекции
+    def start_vision_stream():
+        if not UNLOADER_CFG.vision.stream:
+            return None
+        from src.vision_guided_robot_navigation.infrastructure.vision_stream import (
+            StreamingVisionClient,
+            file_frame_source,
+        )
+        vision_stream = StreamingVisionClient(
+            url=UNLOADER_CFG.vision.stream_url,
+            frame_source=file_frame_source("test_data/frame.jpg"),   # TEST: кадр с диска вместо камеры
+            stop_event=stop_event,
+            logger=loggers["unloader"],
+            period_s=UNLOADER_CFG.vision.stream_period_s,
+        )
+        vision_stream.start()
+        return vision_stream
+
+    lifecycle.add(
+        "vision_stream",
+        start_vision_stream,
+        stop=lambda: join_thread(lifecycle["vision_stream"]),
+        requires=("vision_wait",),
     )
 
-    unloader_thread.start()
+    # 5. Поток робота
+    guard_policy = GuardPolicy.from_config(UNLOADER_CFG.guard, loggers["unloader"])
 
-    # 5. Собираем все потоки, которыми управляем
-    threads: list[threading.Thread] = [
-        unloader_tripod_thread,
-        unloader_thread,
-    ]
+    def make_unloader(previous: UnloaderRobotThread | None = None) -> UnloaderRobotThread:
+        """Поток робота из конфигурации; previous — упавший экземпляр, который заменяется."""
+        unloader_tripods_by_name, unloader_tripod_thread = lifecycle["tripods"]
+        geometry = lifecycle["layout"][3]
+        unloader_connection = lifecycle["connection"]
+        if previous is not None:
+            unloader_connection.remove_reprime(previous._prime_registers)
+        return UnloaderRobotThread(
+            unloader_robot=lifecycle["io"][1],
+            unloader_cfg=UNLOADER_CFG,
+            unloader_tripods=unloader_tripods_by_name,
+            unloader_tripods_thread=unloader_tripod_thread,
+            geometry=geometry,
+            calibration=lifecycle["calibration"],
+            planner=PickPlanner(geometry) if geometry is not None else None,
+            vision_stream=lifecycle["vision_stream"],
+            connection=unloader_connection,
+            register_maps=RegisterMapRegistry(PROTOCOL_CFG),
+            guard_policy=guard_policy,
+            alarm_monitor=lifecycle["alarms"],
+            logger= loggers["unloader"],
+            stop_event=stop_event,
+        )
 
-    # 6. Основной цикл / ожидание (пока просто живём)
+    def start_unloader() -> UnloaderRobotThread:
+        unloader_thread = make_unloader()
+        lifecycle["connection"].start()     # после регистрации re-prime колбэков потока робота
+        unloader_thread.start()
+        return unloader_thread
+
+    def stop_unloader() -> None:
+        # после перезапусков сторожем живой экземпляр — у него, а не в lifecycle
+        watchdog = lifecycle.get("watchdog")
+        join_thread(watchdog.thread("unloader") if watchdog is not None else lifecycle["unloader"])
+        loggers["system"].info(f"Ожидания итераций за сеанс: {guard_policy.as_dict()}")
+
+    lifecycle.add(
+        "unloader",
+        start_unloader,
+        stop=stop_unloader,
+        requires=("connection", "alarms", "programs", "tripods", "calibration", "vision_stream"),
+    )
+
+    # 6. Сторож: упавший поток робота пересоздаётся, зависание и холостой цикл — в лог
+    def start_watchdog() -> Watchdog:
+        watchdog_cfg = UNLOADER_CFG.watchdog
+        watchdog = Watchdog(
+            stop_event,
+            loggers["system"],
+            check_s=watchdog_cfg.check_s,
+            max_restarts=watchdog_cfg.max_restarts,
+            healthy_s=watchdog_cfg.healthy_s,
+            restart_backoff_s=watchdog_cfg.restart_backoff_s,
+            restart_backoff_max_s=watchdog_cfg.restart_backoff_max_s,
+        )
+        watchdog.watch(
+            "unloader",
+            lifecycle["unloader"],
+            factory=make_unloader,
+            stall_s=watchdog_cfg.stall_s,
+            max_rate_hz=watchdog_cfg.max_rate_hz,
+        )
+        # без потока штативов выгрузка встанет: его падение останавливает ячейку
+        watchdog.watch(
+            "tripods",
+            lifecycle["tripods"][1],
+            stall_s=watchdog_cfg.stall_s,
+            max_rate_hz=watchdog_cfg.max_rate_hz,
+        )
+        # поток связи завершается только на невосстановимой ошибке (версия протокола после
+        # переподключения) — перезапускать нечем, ячейка останавливается
+        watchdog.watch("connection", lifecycle["connection"])
+        watchdog.start()
+        return watchdog
+
+    lifecycle.add(
+        "watchdog",
+        start_watchdog,
+        stop=lambda: join_thread(lifecycle["watchdog"]),
+        requires=("unloader", "tripods", "connection"),
+    )
+
+    # 7. Запуск по графу; работаем до Ctrl+C или пока сторож не сообщит о невосстановимом потоке
     try:
+        lifecycle.start_all()
+        loggers["system"].info(timer.summary())
         loggers["system"].info("Рабочая ячейка запущена")
-        # Примитивный вариант: просто ждём, пока нас не убьют Ctrl+C
-        while True:
-            time.sleep(1)
+        watchdog = lifecycle["watchdog"]
+        while not watchdog.failed.wait(1.0):
+            pass
+        loggers["system"].critical(f"Рабочая ячейка остановлена сторожем: {watchdog.failure}")
     except KeyboardInterrupt:
         loggers["system"].info("Получен KeyboardInterrupt, инициируем остановку...")
     finally:
-        # 7. Аккуратный shutdown
-        shutdown(stop_event=stop_event, threads=threads, logger=loggers["system"])
-
-        # Гасим робота
-        try:
-            unloader_robot.stop_all_running_programms()
-            unloader_robot.disconnect()
-        except Exception as e:
-            loggers["system"].error(f"Ошибка при отключении: {e}")
+        # 8. Аккуратный shutdown: потоки и робот — параллельно, в обратном порядке зависимостей
+        shutdown(stop_event=stop_event, lifecycle=lifecycle, logger=loggers["system"])
 
         loggers["system"].info("run_workcell завершён")
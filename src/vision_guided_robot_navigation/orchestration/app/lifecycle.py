@@ -0,0 +1,366 @@
+# src/vision_guided_robot_navigation/orchestration/app/lifecycle.py
+"""
+Запуск и остановка компонентов ячейки по графу зависимостей.
+
+Компонент — start() (результат доступен остальным через manager[name]), stop(),
+список requires и таймауты. start_all() запускает параллельно всё, чьи зависимости
+готовы: подключение робота, раскладка, калибровка и ожидание vision идут одновременно,
+а поток робота стартует, когда готово всё, что ему нужно.
+- Ошибка / таймаут обязательного компонента — LifecycleError (зависимые не стартуют,
+  запущенные останавливаются в stop_all); optional — предупреждение, зависимые идут дальше.
+- start, не уложившийся в таймаут, дорабатывает в фоне: зависимые optional-компонента
+  ждут его завершения (иначе они работали бы одновременно с ним), а успевший запуститься
+  поздно компонент сразу останавливается своим stop.
+- stop_all(grace_s) — в обратном порядке, тоже параллельно: компонент останавливается,
+  когда остановлены все, кто от него зависит; каждый stop ограничен stop_timeout_s,
+  вся остановка — grace_s.
+- Каждый шаг попадает в timeline; report() — сводка с критическим путём запуска.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from src.vision_guided_robot_navigation.logging import PhaseTimer
+
+
+class LifecycleError(RuntimeError):
+    """Обязательный компонент не запустился."""
+
+
+@dataclass(frozen=True)
+class Component:
+    name: str
+    start: Callable[[], Any]
+    stop: Callable[[], None] | None = None
+    requires: tuple[str, ...] = ()
+    start_timeout_s: float = 30.0
+    stop_timeout_s: float = 5.0
+    optional: bool = False          # сбой не останавливает запуск зависимых
+
+
+@dataclass(frozen=True)
+class TimelineEntry:
+    name: str
+    phase: str              # start / stop
+    offset_s: float         # от создания менеджера
+    duration_s: float
+    status: str             # ok / failed / timeout / skipped / abandoned
+    error: str = ""
+
+    @property
+    def end_s(self) -> float:
+        return self.offset_s + self.duration_s
+
+
+class LifecycleManager:
+    def __init__(self, logger: logging.Logger, *, timer: PhaseTimer | None = None):
+        self.logger = logger
+        self.timer = timer          # фазы запуска попадают и в общую сводку старта
+        self.results: dict[str, Any] = {}
+        self.timeline: list[TimelineEntry] = []
+        self._components: dict[str, Component] = {}
+        self._started: set[str] = set()
+        self._t0 = time.perf_counter()
+
+    def add(
+        self,
+        name: str,
+        start: Callable[[], Any],
+        *,
+        stop: Callable[[], None] | None = None,
+        requires: tuple[str, ...] = (),
+        start_timeout_s: float = 30.0,
+        stop_timeout_s: float = 5.0,
+        optional: bool = False,
+    ) -> None:
+        if name in self._components:
+            raise ValueError(f"Компонент '{name}' уже добавлен")
+        self._components[name] = Component(name, start, stop, tuple(requires), start_timeout_s, stop_timeout_s, optional)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.results.get(name, default)
+
+    # ---------- граф ----------
+    def order(self) -> list[str]:
+        """Топологический порядок; неизвестная зависимость или цикл — ValueError."""
+        for component in self._components.values():
+            unknown = [dep for dep in component.requires if dep not in self._components]
+            if unknown:
+                raise ValueError(f"Компонент '{component.name}' зависит от неизвестных: {', '.join(unknown)}")
+        remaining = {name: set(c.requires) for name, c in self._components.items()}
+        ordered: list[str] = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Цикл зависимостей между компонентами: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+                ordered.append(name)
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return ordered
+
+    # ---------- запуск / остановка ----------
+    def start_all(self) -> None:
+        self.order()
+        deps = {name: set(c.requires) for name, c in self._components.items()}
+        status = self._run_graph("start", deps, lambda c: c.start, lambda c: c.start_timeout_s)
+        self._started = {name for name, st in status.items() if st == "ok"}
+        failed = sorted(name for name, st in status.items() if st != "ok" and not self._components[name].optional)
+        if failed:
+            raise LifecycleError(
+                "Не запущены: " + ", ".join(f"{name} ({status[name]})" for name in failed)
+            )
+
+    def stop_all(self, grace_s: float = 10.0) -> None:
+        """Остановка запущенных компонентов, зависимые — раньше своих зависимостей."""
+        dependents = {
+            name: {other for other in self._started if name in self._components[other].requires}
+            for name in self._started
+        }
+        self._run_graph(
+            "stop", dependents, lambda c: c.stop, lambda c: c.stop_timeout_s,
+            deadline=time.perf_counter() + grace_s,
+        )
+        self._started.clear()
+
+    def _call(self, phase: str, name: str, fn: Callable[[], Any]) -> Any:
+        if phase == "start" and self.timer is not None:
+            with self.timer.phase(name):
+                return fn()
+        return fn()
+
+    def _run_graph(
+        self,
+        phase: str,
+        deps: dict[str, set[str]],
+        action: Callable[[Component], Callable[[], Any] | None],
+        timeout_of: Callable[[Component], float],
+        deadline: float | None = None,
+    ) -> dict[str, str]:
+        pending = {name: set(d) for name, d in deps.items()}
+        status: dict[str, str] = {}
+        running: dict[Future, tuple[str, float, float]] = {}    # future -> (имя, старт, дедлайн)
+        late: dict[Future, str] = {}        # start после таймаута: зависимые ждут его завершения
+        pool = ThreadPoolExecutor(max_workers=max(1, len(pending)), thread_name_prefix=f"lifecycle-{phase}")
+
+        def release(name: str) -> None:
+            for waiting in pending.values():
+                waiting.discard(name)
+
+        def finish(name: str, started: float, st: str, error: str = "", *, hold: bool = False) -> None:
+            status[name] = st
+            entry = TimelineEntry(name, phase, started - self._t0, time.perf_counter() - started, st, error)
+            self.timeline.append(entry)
+            log = self.logger.debug if st == "ok" else self.logger.error     # успешные — в report()
+            log(f"[lifecycle] {phase} {name}: {entry.duration_s * 1000:.1f} мс {st}{f' ({error})' if error else ''}")
+            if not hold:
+                release(name)
+
+        try:
+            while pending or running:
+                for name in [n for n, waiting in pending.items() if not waiting]:
+                    del pending[name]
+                    component = self._components[name]
+                    now = time.perf_counter()
+                    blocked = [
+                        d for d in deps[name]
+                        if phase == "start" and status.get(d) != "ok" and not self._components[d].optional
+                    ]
+                    if blocked:
+                        finish(name, now, "skipped", f"не готовы {', '.join(blocked)}")
+                        continue
+                    fn = action(component)
+                    if fn is None:
+                        status[name] = "ok"
+                        release(name)
+                        continue
+                    future = pool.submit(self._call, phase, name, fn)
+                    running[future] = (name, now, now + timeout_of(component))
+                if not running and not late:
+                    continue
+
+                horizon = min((until for _, _, until in running.values()), default=None)
+                if deadline is not None:
+                    horizon = deadline if horizon is None else min(horizon, deadline)
+                timeout = None if horizon is None else max(0.0, horizon - time.perf_counter())
+                done, _ = wait([*running, *late], timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in late:
+                        name = late.pop(future)
+                        self.logger.warning(f"[lifecycle] {phase} {name}: завершился после таймаута")
+                        release(name)
+                        continue
+                    name, started, _ = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        if phase == "start":
+                            self.results[name] = future.result()
+                        finish(name, started, "ok")
+                    else:
+                        finish(name, started, "failed", f"{type(error).__name__}: {error}")
+
+                now = time.perf_counter()
+                for future, (name, started, until) in list(running.items()):
+                    if now >= until:
+                        # поток пула не прервать: он доработает в фоне, результат не используется
+                        running.pop(future)
+                        hold = phase == "start" and self._components[name].optional
+                        finish(name, started, "timeout", f"дольше {until - started:.1f} с", hold=hold)
+                        if phase == "start":
+                            future.add_done_callback(lambda f, name=name: self._stop_late(name, f))
+                            if hold:
+                                late[future] = name
+                if deadline is not None and now >= deadline and (running or pending):
+                    for name, started, _ in running.values():
+                        finish(name, started, "timeout", "истёк общий grace")
+                    for name in list(pending):
+                        finish(name, now, "abandoned", "истёк общий grace")
+                    running.clear()
+                    pending.clear()
+        finally:
+            pool.shutdown(wait=False)
+        return status
+
+    def _stop_late(self, name: str, future: Future) -> None:
+        """Компонент запустился после таймаута: в _started он не попал, останавливаем сразу."""
+        component = self._components[name]
+        if future.exception() is not None or component.stop is None:
+            return
+        self.results[name] = future.result()
+        try:
+            component.stop()
+            self.logger.warning(f"[lifecycle] {name}: запущен после таймаута и остановлен")
+        except Exception as e:
+            self.logger.error(f"[lifecycle] {name}: запущен после таймаута, stop не удался: {e}")
+
+    # ---------- отчёт ----------
+    def critical_path(self) -> list[str]:
+        """Цепочка зависимостей, определившая длительность запуска."""
+        ends = {e.name: e.end_s for e in self.timeline if e.phase == "start" and e.status == "ok"}
+        if not ends:
+            return []
+        path = [max(ends, key=ends.get)]
+        while True:
+            deps = [d for d in self._components[path[-1]].requires if d in ends]
+            if not deps:
+                return path[::-1]
+            path.append(max(deps, key=ends.get))
+
+    def report(self) -> str:
+        lines = []
+        for phase in ("start", "stop"):
+            entries = sorted((e for e in self.timeline if e.phase == phase), key=lambda e: e.offset_s)
+            if not entries:
+                continue
+            begin = entries[0].offset_s
+            total = max(e.end_s for e in entries) - begin
+            lines.append(f"[lifecycle] {phase}: {total * 1000:.1f} мс")
+            for e in entries:
+                lines.append(
+                    f"  {(e.offset_s - begin) * 1000:8.1f} .. {(e.end_s - begin) * 1000:8.1f} мс  "
+                    f"{e.name:<16} {e.status}{f' ({e.error})' if e.error else ''}"
+                )
+            if phase == "start":
+                lines.append(f"  критический путь: {' -> '.join(self.critical_path())}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    def main():
+        """
+        Компоненты со временем как на стенде. Запуск: последовательно против графа.
+        Остановка: прежний shutdown (join по очереди, потом робот) против графа, когда
+        поток потокового vision висит 3 с в recv и не видит stop_event.
+        """
+        import threading
+
+        logger = logging.getLogger("lifecycle")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+
+        COMPONENTS = {          # имя: (запуск, с; опрос stop_event, с; зависимости)
+            "robot": (0.8, None, ()),               # connect по сети; остановка — stop программ + disconnect
+            "io": (0.01, 0.2, ("robot",)),
+            "connection": (0.01, 1.0, ("io",)),     # heartbeat_s
+            "alarms": (0.05, 0.5, ("connection",)),
+            "programs": (0.05, 0.5, ("connection",)),
+            "layout": (0.3, None, ()),              # таблица поз слотов
+            "calibration": (0.1, None, ()),
+            "vision": (1.5, None, ()),              # ожидание прогрева модели
+            "vision_stream": (0.05, 3.0, ("vision",)),
+            "tripods": (0.05, 0.5, ("layout",)),
+            "unloader": (0.05, 0.1, ("alarms", "programs", "tripods", "calibration", "vision_stream")),
+        }
+        ROBOT_STOP_S = 0.3
+
+        def spawn(poll_s, stop_event):
+            def loop():
+                while not stop_event.is_set():
+                    time.sleep(poll_s)      # блокирующий вызов: stop_event виден только между ними
+            thread = threading.Thread(target=loop, daemon=True)
+            thread.start()
+            return thread
+
+        # --- прежняя схема
+        stop_event = threading.Event()
+        started = time.perf_counter()
+        threads = []
+        for name, (seconds, poll_s, _) in COMPONENTS.items():
+            time.sleep(seconds)
+            if poll_s is not None:
+                threads.append(spawn(poll_s, stop_event))
+        serial_start = time.perf_counter() - started
+        started = time.perf_counter()
+        stop_event.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        time.sleep(ROBOT_STOP_S)
+        serial_stop = serial_robot = time.perf_counter() - started
+
+        # --- граф
+        stop_event = threading.Event()
+        robot_stopped = []
+        manager = LifecycleManager(logger)
+        for name, (seconds, poll_s, requires) in COMPONENTS.items():
+            def start(seconds=seconds, poll_s=poll_s):
+                time.sleep(seconds)
+                return spawn(poll_s, stop_event) if poll_s is not None else None
+            stop = (lambda name=name: manager[name].join(5)) if poll_s is not None else None
+            if name == "robot":
+                stop = lambda: (time.sleep(ROBOT_STOP_S), robot_stopped.append(time.perf_counter()))
+            manager.add(name, start, stop=stop, requires=requires)
+
+        started = time.perf_counter()
+        manager.start_all()
+        start_s = time.perf_counter() - started
+        started = time.perf_counter()
+        stop_event.set()
+        manager.stop_all(grace_s=5.0)
+        stop_s = time.perf_counter() - started
+        print(manager.report())
+        print(
+            f"запуск {start_s:.2f} с (последовательно {serial_start:.2f} с), "
+            f"остановка {stop_s:.2f} с (прежний shutdown {serial_stop:.2f} с), "
+            f"робот остановлен через {robot_stopped[0] - started:.2f} с (было {serial_robot:.2f} с)"
+        )
+
+        # --- сбой обязательного компонента: зависимые не стартуют, запущенные останавливаются
+        manager = LifecycleManager(logger)
+        manager.add("robot", lambda: time.sleep(0.1), stop=lambda: None)
+        manager.add("vision", lambda: time.sleep(5.0), start_timeout_s=0.3)
+        manager.add("unloader", lambda: None, requires=("robot", "vision"))
+        try:
+            manager.start_all()
+        except LifecycleError as e:
+            print(f"LifecycleError: {e}")
+        manager.stop_all(grace_s=1.0)
+        print(manager.report())
+    main()
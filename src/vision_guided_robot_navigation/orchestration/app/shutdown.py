@@ -1,13 +1,24 @@
-# src/mindray_automation_2/orchestration/app/shutdown.py
+# src/vision_guided_robot_navigation/orchestration/app/shutdown.py
 import threading
 import logging
 
-def shutdown(stop_event: threading.Event, threads: list[threading.Thread], logger:logging.Logger):
+from src.vision_guided_robot_navigation.orchestration.app.lifecycle import LifecycleManager
+
+
+def join_thread(thread: threading.Thread | None, timeout_s: float = 5.0) -> None:
+    """join с таймаутом; не остановившийся поток — TimeoutError (попадает в timeline остановки)."""
+    if thread is None or not thread.is_alive():
+        return
+    thread.join(timeout=timeout_s)
+    if thread.is_alive():
+        raise TimeoutError(f"Поток {thread.name} не остановился за {timeout_s} с")
+
+
+def shutdown(stop_event: threading.Event, lifecycle: LifecycleManager, logger: logging.Logger, grace_s: float = 10.0):
     logger.info("Остановка системы...")
-    stop_event.set()
-    
-    for th in threads:
-        if th.is_alive():
-            th.join(timeout=5)
+    stop_event.set()        # все потоки видят остановку сразу, join-ы ниже идут параллельно
+
+    lifecycle.stop_all(grace_s=grace_s)
 
-    logger.info("Остановка завершена")
\ No newline at end of file
+    logger.info(lifecycle.report())
+    logger.info("Остановка завершена")
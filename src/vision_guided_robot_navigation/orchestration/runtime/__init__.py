@@ -1,24 +1,37 @@
 # src/vision_guided_robot_navigation/orchestration/runtime/__init__.py
 from .read_sensor import read_sensor
+from .backoff import Backoff
+from .signals import SignalConditioner, SignalEdge
+from .connection import ConnectionSupervisor, ConnectionStats, is_link_error
+from .alarms import AlarmMonitor, AlarmEvent, AlarmStats
+from .programs import ProgramStateRefresher
+from .watchdog import Heartbeat, Watchdog
 from .sensors import SensorAccess
 from .tripods import (
     TripodAvailabilityProvider,
     TripodMonitor,
     TripodRefresher,
+    TripodRegistry,
+    TripodSelectionPolicy,
+    make_tripod_policy,
 ) 
+from .planning import (
+    PickPlanner,
+    PickStep,
+    PlaceSlot,
+)
 from .robots import (
     BaseRobotThread, 
     IterationContext, 
     GuardResult,
+    GuardPolicy,
 
     UnloaderRobotThread,
 
     PROTOCOL_VERSION,
-
-    UNLOADER_NR_NUMBERS,
-    UNLOADER_NR_VALUES,
-    UNLOADER_SR_NUMBERS,
-    UNLOADER_ITERATION_NAMES,
+    ProtocolError,
+    RegisterMap,
+    RegisterMapRegistry,
 
     IterationAbort,
     IterationTimeout,
@@ -30,6 +43,38 @@ __all__ = [
     "TripodAvailabilityProvider",
     "TripodMonitor",
     "TripodRefresher",
+    "TripodRegistry",
+    "TripodSelectionPolicy",
+    "make_tripod_policy",
+
+    # Planning
+    "PickPlanner",
+    "PickStep",
+    "PlaceSlot",
+
+    # Retry
+    "Backoff",
+
+    # Connection
+    "ConnectionSupervisor",
+    "ConnectionStats",
+    "is_link_error",
+
+    # Alarms
+    "AlarmMonitor",
+    "AlarmEvent",
+    "AlarmStats",
+
+    # Programs
+    "ProgramStateRefresher",
+
+    # Watchdog
+    "Heartbeat",
+    "Watchdog",
+
+    # Signals
+    "SignalConditioner",
+    "SignalEdge",
 
     # Sensors
     "read_sensor",
@@ -42,14 +87,13 @@ __all__ = [
     # Iterations 
     "IterationContext",
     "GuardResult",
+    "GuardPolicy",
 
     # Protocol
     "PROTOCOL_VERSION",
-
-    "UNLOADER_NR_NUMBERS",
-    "UNLOADER_NR_VALUES",
-    "UNLOADER_SR_NUMBERS",
-    "UNLOADER_ITERATION_NAMES",
+    "ProtocolError",
+    "RegisterMap",
+    "RegisterMapRegistry",
 
     # Exceptions
     "IterationAbort",
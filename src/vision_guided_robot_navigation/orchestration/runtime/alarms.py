@@ -0,0 +1,175 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/alarms.py
+"""
+Фоновый монитор тревог контроллера.
+
+Без него о неисправности узнают только по таймауту ожидания итерации. AlarmMonitor
+раз в poll_s читает активные тревоги и сравнивает с прошлым набором:
+- набор не изменился (обычный случай) — одно сравнение frozenset, событий нет;
+- появились / исчезли имена — AlarmEvent "raised" / "cleared" слушателям и в лог.
+Тревоги, подходящие под шаблоны blocking и не подходящие под ignore (fnmatch),
+блокирующие: пока они есть, has_blocking == True, и BaseRobotThread.wait_until
+прерывает итерацию (IterationAbort) на ближайшем опросе условия.
+
+SDK не даёт подписки на тревоги, поэтому опрос; вызов идёт через ту же очередь
+исполнителя I/O, что и остальные (приоритет CONTROL). Без связи опрос не делается.
+"""
+from __future__ import annotations
+
+import fnmatch
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from src.vision_guided_robot_navigation.devices import CellRobot, DeviceError
+from src.vision_guided_robot_navigation.orchestration.runtime.connection import ConnectionSupervisor
+
+
+@dataclass(frozen=True)
+class AlarmEvent:
+    kind: str           # "raised" / "cleared"
+    name: str
+    blocking: bool
+    at: float           # time.monotonic() опроса, на котором замечено
+
+
+@dataclass
+class AlarmStats:
+    polls: int = 0
+    errors: int = 0
+    raised: int = 0
+    cleared: int = 0
+    max_poll_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "polls": self.polls,
+            "errors": self.errors,
+            "raised": self.raised,
+            "cleared": self.cleared,
+            "max_poll_ms": round(self.max_poll_ms, 2),
+        }
+
+
+class AlarmMonitor(threading.Thread):
+    def __init__(
+        self,
+        robot: CellRobot,
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        *,
+        poll_s: float = 0.5,
+        blocking: tuple[str, ...] = ("*",),
+        ignore: tuple[str, ...] = (),
+        connection: ConnectionSupervisor | None = None,
+    ):
+        super().__init__(daemon=True, name=f"{getattr(robot, 'name', 'robot')}-alarms")
+        self.robot = robot
+        self.stop_event = stop_event
+        self.logger = logger
+        self.poll_s = poll_s
+        self.blocking_patterns = tuple(blocking)
+        self.ignore_patterns = tuple(ignore)
+        self.connection = connection
+        self.stats = AlarmStats()
+
+        self._active: frozenset[str] = frozenset()
+        self._blocking: frozenset[str] = frozenset()
+        self._blocking_set = threading.Event()
+        self._clear = threading.Event()
+        self._clear.set()
+        self._listeners: list[Callable[[AlarmEvent], None]] = []
+        self._classified: dict[str, bool] = {}      # имя -> блокирующая (шаблоны сверяются один раз на имя)
+
+    # ---------- для потоков ----------
+    @property
+    def active(self) -> frozenset[str]:
+        return self._active
+
+    @property
+    def blocking_alarms(self) -> frozenset[str]:
+        return self._blocking
+
+    @property
+    def has_blocking(self) -> bool:
+        return self._blocking_set.is_set()
+
+    def wait_clear(self, timeout: float | None = None) -> bool:
+        """True — блокирующих тревог нет."""
+        return self._clear.wait(timeout)
+
+    def add_listener(self, callback: Callable[[AlarmEvent], None]) -> None:
+        """Колбэк на каждое событие; вызывается из потока монитора, должен быть быстрым."""
+        self._listeners.append(callback)
+
+    def is_blocking(self, name: str) -> bool:
+        blocking = self._classified.get(name)
+        if blocking is None:
+            blocking = (
+                any(fnmatch.fnmatchcase(name, p) for p in self.blocking_patterns)
+                and not any(fnmatch.fnmatchcase(name, p) for p in self.ignore_patterns)
+            )
+            self._classified[name] = blocking
+        return blocking
+
+    def as_dict(self) -> dict[str, object]:
+        return {"active": sorted(self._active), **self.stats.as_dict()}
+
+    # ---------- опрос ----------
+    def poll_once(self) -> list[AlarmEvent]:
+        """Один опрос: события по разнице с прошлым набором. Ошибки SDK пробрасываются."""
+        started = time.monotonic()
+        names = frozenset(self.robot.get_all_active_alarms())
+        self.stats.polls += 1
+        self.stats.max_poll_ms = max(self.stats.max_poll_ms, (time.monotonic() - started) * 1e3)
+        if names == self._active:
+            return []
+        return self._apply(names, started)
+
+    def _apply(self, names: frozenset[str], at: float) -> list[AlarmEvent]:
+        events = [AlarmEvent("raised", name, self.is_blocking(name), at) for name in sorted(names - self._active)]
+        events += [AlarmEvent("cleared", name, self.is_blocking(name), at) for name in sorted(self._active - names)]
+        self._active = names
+        self._blocking = frozenset(name for name in names if self.is_blocking(name))
+        if self._blocking:
+            self._clear.clear()
+            self._blocking_set.set()
+        else:
+            self._blocking_set.clear()
+            self._clear.set()
+
+        for event in events:
+            if event.kind == "raised":
+                self.stats.raised += 1
+                log = self.logger.error if event.blocking else self.logger.warning
+                log(f"[{self.name}] Тревога: {event.name}{' (блокирующая)' if event.blocking else ''}")
+            else:
+                self.stats.cleared += 1
+                self.logger.info(f"[{self.name}] Тревога снята: {event.name}")
+            for callback in self._listeners:
+                try:
+                    callback(event)
+                except Exception as e:
+                    self.logger.error(f"[{self.name}] Ошибка слушателя тревог: {e}")
+        return events
+
+    def run(self) -> None:
+        self.logger.info(f"Поток [{self.name}] запущен")
+        try:
+            while not self.stop_event.is_set():
+                if self.connection is not None and not self.connection.is_up:
+                    # после переподключения набор читается заново, старые имена не сбрасываются вслепую
+                    self.stop_event.wait(self.poll_s)
+                    continue
+                try:
+                    self.poll_once()
+                except DeviceError as e:
+                    self.stats.errors += 1
+                    if self.connection is not None:
+                        self.connection.report_error(e)
+                    else:
+                        self.logger.warning(f"[{self.name}] Не удалось прочитать тревоги: {e}")
+                self.stop_event.wait(self.poll_s)
+        finally:
+            self.logger.info(f"Поток [{self.name}] остановлен, {self.as_dict()}")
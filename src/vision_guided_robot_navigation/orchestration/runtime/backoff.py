@@ -0,0 +1,33 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/backoff.py
+from __future__ import annotations
+
+import random
+
+
+class Backoff:
+    """
+    Экспоненциальная задержка повторов: initial_s, initial_s * factor, ... до max_s.
+    jitter — доля случайного разброса (+-), чтобы несколько клиентов не повторяли синхронно.
+    reset() — после успешной попытки.
+    """
+
+    def __init__(self, initial_s: float, max_s: float, factor: float = 2.0, jitter: float = 0.0):
+        if initial_s <= 0 or max_s < initial_s or factor < 1.0 or not 0.0 <= jitter < 1.0:
+            raise ValueError(
+                f"Backoff: некорректные параметры initial_s={initial_s}, max_s={max_s}, factor={factor}, jitter={jitter}"
+            )
+        self.initial_s = initial_s
+        self.max_s = max_s
+        self.factor = factor
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self) -> float:
+        delay = min(self.max_s, self.initial_s * self.factor ** self.attempts)
+        self.attempts += 1
+        if self.jitter:
+            delay *= random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        return delay
+
+    def reset(self) -> None:
+        self.attempts = 0
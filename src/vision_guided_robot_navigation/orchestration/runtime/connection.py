@@ -0,0 +1,190 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/connection.py
+"""
+Надзор за связью с контроллером робота.
+
+ConnectionSupervisor держит флаг "связь есть" и сам восстанавливает её:
+- heartbeat — дешёвое чтение регистра раз в heartbeat_s;
+- report_error() — потоки сообщают об ошибках SDK; обрыв снимает флаг сразу,
+  прочие DeviceError проверяются внеочередным heartbeat. Обрыв — только
+  devices.ConnectionError: в неё слой устройств переводит сетевые ошибки SDK
+  и таймауты очереди I/O. OSError из другого кода (vision, файлы) связью с
+  роботом не считается;
+- переподключение disconnect() + connect() с экспоненциальной задержкой и jitter;
+- после переподключения вызываются колбэки re-prime (регистры, которые
+  контроллер теряет при обрыве), затем просыпаются ждущие wait_connected().
+  DeviceError колбэка — повтор с задержкой; любая другая ошибка (например,
+  ProtocolError: контроллер объявил неподдерживаемую версию) повтором не
+  лечится — поток завершается с failure, сторож останавливает ячейку.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from src.vision_guided_robot_navigation.devices import CellRobot, ConnectionError, DeviceError
+from src.vision_guided_robot_navigation.orchestration.runtime.backoff import Backoff
+
+def is_link_error(exc: BaseException) -> bool:
+    """Ошибка, означающая потерю связи, а не отказ конкретной команды."""
+    return isinstance(exc, ConnectionError) or isinstance(exc.__cause__, ConnectionError)
+
+
+@dataclass
+class ConnectionStats:
+    disconnects: int = 0
+    reconnect_attempts: int = 0
+    downtime_s: float = 0.0           # суммарно, без текущего простоя
+    last_downtime_s: float = 0.0
+    longest_downtime_s: float = 0.0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "disconnects": self.disconnects,
+            "reconnect_attempts": self.reconnect_attempts,
+            "downtime_s": round(self.downtime_s, 2),
+            "last_downtime_s": round(self.last_downtime_s, 2),
+            "longest_downtime_s": round(self.longest_downtime_s, 2),
+        }
+
+
+class ConnectionSupervisor(threading.Thread):
+    def __init__(
+        self,
+        robot: CellRobot,
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        *,
+        heartbeat_nr: int,
+        heartbeat_s: float = 1.0,
+        backoff_initial_s: float = 0.5,
+        backoff_max_s: float = 10.0,
+        jitter: float = 0.3,
+    ):
+        super().__init__(daemon=True, name=f"{getattr(robot, 'name', 'robot')}-connection")
+        self.robot = robot
+        self.stop_event = stop_event
+        self.logger = logger
+        self.heartbeat_nr = heartbeat_nr
+        self.heartbeat_s = heartbeat_s
+        self.backoff = Backoff(backoff_initial_s, backoff_max_s, jitter=jitter)
+        self.stats = ConnectionStats()
+
+        self._up = threading.Event()
+        self._check = threading.Event()           # внеочередная проверка / обрыв
+        self._lock = threading.Lock()
+        self._down_since: float | None = None
+        self._reprime: list[Callable[[], None]] = []
+        self.failure: BaseException | None = None     # невосстановимая ошибка, поток завершён
+
+        if robot.is_connected():
+            self._up.set()
+        else:
+            self._down_since = time.monotonic()
+
+    # ---------- для потоков ----------
+    @property
+    def is_up(self) -> bool:
+        return self._up.is_set()
+
+    def add_reprime(self, callback: Callable[[], None]) -> None:
+        """Колбэк после каждого (пере)подключения, до пробуждения ждущих."""
+        self._reprime.append(callback)
+
+    def remove_reprime(self, callback: Callable[[], None]) -> None:
+        """Снять колбэк (поток, который его добавил, пересоздан); список заменяется целиком."""
+        self._reprime = [cb for cb in self._reprime if cb != callback]
+
+    def wait_connected(self, timeout: float | None = None) -> bool:
+        return self._up.wait(timeout)
+
+    def report_error(self, exc: BaseException) -> None:
+        if is_link_error(exc):
+            self._mark_down(f"{type(exc).__name__}: {exc}")
+        self._check.set()
+
+    def downtime_s(self) -> float:
+        """Суммарный простой, включая текущий."""
+        with self._lock:
+            current = time.monotonic() - self._down_since if self._down_since is not None else 0.0
+            return self.stats.downtime_s + current
+
+    def as_dict(self) -> dict[str, object]:
+        return {"up": self.is_up, **self.stats.as_dict(), "downtime_s": round(self.downtime_s(), 2)}
+
+    # ---------- внутреннее ----------
+    def _mark_down(self, reason: str) -> None:
+        with self._lock:
+            if not self._up.is_set():
+                return
+            self._up.clear()
+            self._down_since = time.monotonic()
+            self.stats.disconnects += 1
+        self.logger.warning(f"[{self.name}] Связь с роботом потеряна: {reason}")
+
+    def _mark_up(self) -> None:
+        with self._lock:
+            if self._down_since is not None:
+                downtime = time.monotonic() - self._down_since
+                self.stats.downtime_s += downtime
+                self.stats.last_downtime_s = downtime
+                self.stats.longest_downtime_s = max(self.stats.longest_downtime_s, downtime)
+                self._down_since = None
+            self._up.set()
+        self.logger.info(f"[{self.name}] Связь с роботом есть, {self.stats.as_dict()}")
+
+    def _heartbeat(self) -> None:
+        try:
+            self.robot.get_number_register(self.heartbeat_nr)
+        except DeviceError as e:
+            # регистр heartbeat всегда читается — любая ошибка здесь означает проблемы со связью
+            self._mark_down(f"heartbeat: {type(e).__name__}: {e}")
+
+    def _reconnect(self) -> None:
+        self.backoff.reset()
+        while not self.stop_event.is_set():
+            self.stats.reconnect_attempts += 1
+            try:
+                try:
+                    self.robot.disconnect()     # закрываем полуживое соединение SDK
+                except Exception:
+                    pass
+                self.robot.connect()
+            except Exception as e:
+                self._retry_later(e)
+                continue
+            try:
+                for callback in self._reprime:
+                    callback()
+            except DeviceError as e:
+                self._retry_later(e)
+                continue
+            self._mark_up()
+            return
+
+    def _retry_later(self, exc: BaseException) -> None:
+        delay = self.backoff.next_delay()
+        self.logger.warning(f"[{self.name}] Переподключение не удалось ({exc}), повтор через {delay:.1f} с")
+        self.stop_event.wait(delay)
+
+    def run(self) -> None:
+        self.logger.info(f"Поток [{self.name}] запущен")
+        try:
+            while not self.stop_event.is_set():
+                if self._up.is_set():
+                    self._check.wait(self.heartbeat_s)
+                    self._check.clear()
+                    if self.stop_event.is_set():
+                        break
+                    if self._up.is_set():
+                        self._heartbeat()
+                if not self._up.is_set():
+                    self._reconnect()
+        except Exception as e:
+            # поток завершается; Watchdog увидит это и остановит ячейку
+            self.failure = e
+            self.logger.critical(f"[{self.name}] Связь не восстановить: {type(e).__name__}: {e}")
+        finally:
+            self.logger.info(f"Поток [{self.name}] остановлен, {self.as_dict()}")
@@ -0,0 +1,8 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/planning/__init__.py
+from .pick_planner import PickPlanner, PickStep, PlaceSlot
+
+__all__ = [
+    "PickPlanner",
+    "PickStep",
+    "PlaceSlot",
+]
\ No newline at end of file
@@ -0,0 +1,148 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/planning/pick_planner.py
+"""
+Планировщик порядка pick/place для робота-выгрузчика.
+
+Берёт всех кандидатов из ответа vision (уже в базовой СК робота) и все открытые
+слоты штативов и выбирает последовательность с минимальной оценкой времени цикла.
+Стоимость — евклидово расстояние перемещения TCP / скорость, оптимизатор —
+жадный с горизонтом просмотра 1..2 шага на векторизованных матрицах стоимости.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping
+
+import numpy as np
+
+from src.vision_guided_robot_navigation.domain import (
+    FixtureKind,
+    LayoutGeometry,
+    Pose,
+    Tripod,
+)
+from src.vision_guided_robot_navigation.infrastructure.vision_client import TubeCoordinates
+
+
+@dataclass(frozen=True)
+class PlaceSlot:
+    tripod_name: str
+    slot: int
+    pose: Pose
+
+@dataclass(frozen=True)
+class PickStep:
+    candidate: TubeCoordinates
+    place: PlaceSlot
+    travel_mm: float        # путь TCP: текущая точка -> пробирка -> слот
+    cycle_s: float          # оценка времени шага
+
+
+class PickPlanner:
+    """
+    speed_mm_s       — средняя скорость TCP для оценки времени перемещения
+    handling_s       — постоянная часть цикла (захват + установка), на порядок не влияет
+    horizon          — 1: чистый жадный выбор, 2: учитывается лучший следующий шаг
+    """
+
+    def __init__(
+        self,
+        geometry: LayoutGeometry,
+        *,
+        speed_mm_s: float = 500.0,
+        handling_s: float = 1.5,
+        horizon: int = 1,
+    ):
+        if horizon not in (1, 2):
+            raise ValueError(f"PickPlanner: horizon должен быть 1 или 2, получено {horizon}")
+        self.geometry = geometry
+        self.speed_mm_s = speed_mm_s
+        self.handling_s = handling_s
+        self.horizon = horizon
+
+    def open_slots(self, tripods: Mapping[str, Tripod]) -> dict[str, list[PlaceSlot]]:
+        """Свободные слоты каждого доступного штатива в порядке заполнения."""
+        slots: dict[str, list[PlaceSlot]] = {}
+        for name, tripod in tripods.items():
+            tubes = tripod.get_tubes()
+            if not tripod.availability or tubes is None or tubes >= tripod.MAX_TUBES:
+                continue
+            slots[name] = [
+                PlaceSlot(name, slot, self.geometry.slot_pose(FixtureKind.LOADING_TRIPOD, name, slot))
+                for slot in range(tubes, tripod.MAX_TUBES)
+            ]
+        return slots
+
+    def plan(
+        self,
+        candidates: list[TubeCoordinates],
+        open_slots: Mapping[str, list[PlaceSlot]],
+        *,
+        start: Pose | None = None,
+        max_steps: int | None = None,
+    ) -> list[PickStep]:
+        """
+        Последовательность шагов pick -> place.
+        start — поза, где робот сейчас (обычно последний слот установки); None = не учитывать подход.
+        """
+        tripod_names = [name for name, slots in open_slots.items() if slots]
+        if not candidates or not tripod_names:
+            return []
+
+        cand_xyz = np.array([(c.x, c.y, c.z) for c in candidates])
+        next_slot = {name: 0 for name in tripod_names}    # индекс в open_slots[name]
+        remaining = np.ones(len(candidates), dtype=bool)
+        position = None if start is None else np.asarray(start[:3], dtype=np.float64)
+
+        steps: list[PickStep] = []
+        limit = min(len(candidates), max_steps or len(candidates))
+        while len(steps) < limit:
+            open_names = [n for n in tripod_names if next_slot[n] < len(open_slots[n])]
+            if not open_names:
+                break
+            slot_xyz = np.array([open_slots[n][next_slot[n]].pose[:3] for n in open_names])
+
+            # A[i, j]: текущая точка -> кандидат i -> слот j
+            pick_to_slot = np.linalg.norm(cand_xyz[:, None, :] - slot_xyz[None, :, :], axis=2)
+            approach = np.zeros(len(candidates)) if position is None else np.linalg.norm(cand_xyz - position, axis=1)
+            step_cost = approach[:, None] + pick_to_slot
+            step_cost[~remaining, :] = np.inf
+
+            total = step_cost
+            if self.horizon == 2 and remaining.sum() > 1:
+                total = step_cost + self._lookahead(pick_to_slot, remaining)
+
+            i, j = np.unravel_index(np.argmin(total), total.shape)
+            name = open_names[j]
+            place = open_slots[name][next_slot[name]]
+            travel = float(step_cost[i, j])
+
+            steps.append(PickStep(
+                candidate=candidates[i],
+                place=place,
+                travel_mm=travel,
+                cycle_s=travel / self.speed_mm_s + self.handling_s,
+            ))
+            remaining[i] = False
+            next_slot[name] += 1
+            position = slot_xyz[j]
+
+        return steps
+
+    @staticmethod
+    def _lookahead(pick_to_slot: np.ndarray, remaining: np.ndarray) -> np.ndarray:
+        """
+        L[i, j]: стоимость лучшего следующего шага после (кандидат i -> слот j)
+        среди оставшихся кандидатов i' != i. Сдвиг слота на шаг сетки не учитывается.
+        """
+        best_place = pick_to_slot.min(axis=1)                 # (C,) лучший слот после кандидата i'
+        # После установки в слот j робот едет к i': расстояние слот j -> кандидат i' == pick_to_slot[i', j]
+        next_cost = pick_to_slot.T + best_place[None, :]      # (S, C)
+        next_cost[:, ~remaining] = np.inf
+
+        # min по i' != i: два наименьших значения в каждой строке
+        order = np.argsort(next_cost, axis=1)[:, :2]
+        first = np.take_along_axis(next_cost, order[:, :1], axis=1)[:, 0]
+        second = np.take_along_axis(next_cost, order[:, 1:2], axis=1)[:, 0]
+        candidates_idx = np.arange(pick_to_slot.shape[0])
+        lookahead = np.where(candidates_idx[:, None] == order[None, :, 0], second[None, :], first[None, :])
+        return np.where(np.isinf(lookahead), 0.0, lookahead)
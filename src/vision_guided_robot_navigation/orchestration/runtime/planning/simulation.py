@@ -0,0 +1,117 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/planning/simulation.py
+"""
+Симулятор цикла выгрузки для оценки выигрыша планировщика.
+
+Свал — набор пробирок, каждую итерацию vision видит случайную часть оставшихся;
+робот выполняет только первый шаг плана, как UnloaderRobotThread. Базовая
+стратегия — текущее поведение: первый кандидат в первый доступный штатив.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.vision_guided_robot_navigation.domain import FixtureKind, LayoutGeometry, LoadingTripod, Pose
+from src.vision_guided_robot_navigation.infrastructure.vision_client import TubeCoordinates
+from src.vision_guided_robot_navigation.orchestration.runtime.planning.pick_planner import PickPlanner
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    name: str
+    picks: int
+    travel_mm: float
+    cycle_s: float
+
+    @property
+    def mean_cycle_s(self) -> float:
+        return self.cycle_s / self.picks if self.picks else 0.0
+
+
+def _random_dump(geometry: LayoutGeometry, rng: np.random.Generator, count: int) -> list[TubeCoordinates]:
+    half = np.array(geometry.cfg.dump_size) / 2
+    xy = geometry.dump_center[:2] + rng.uniform(-half, half, size=(count, 2))
+    return [
+        TubeCoordinates(x, y, float(geometry.dump_center[2]), 180.0, 0.0, float(rng.uniform(-180, 180)), 0.9)
+        for x, y in xy.tolist()
+    ]
+
+def _fresh_tripods(geometry: LayoutGeometry) -> dict[str, LoadingTripod]:
+    tripods = {}
+    for name in geometry.fixture_names(FixtureKind.LOADING_TRIPOD):
+        tripod = LoadingTripod(name)
+        tripod.set_availability(True)
+        tripods[name] = tripod
+    return tripods
+
+def simulate(
+    geometry: LayoutGeometry,
+    planner: PickPlanner | None,
+    *,
+    picks: int = 500,
+    tubes_in_dump: int = 40,
+    candidates_per_frame: int = 8,
+    seed: int = 0,
+    name: str = "",
+) -> SimulationResult:
+    """planner=None — базовая стратегия (первый кандидат, первый доступный штатив)."""
+    rng = np.random.default_rng(seed)
+    reference = planner or PickPlanner(geometry, horizon=1)
+    tripods = _fresh_tripods(geometry)
+    dump: list[TubeCoordinates] = []
+    position: Pose | None = None
+    travel = cycle = 0.0
+
+    for _ in range(picks):
+        if not any(t.availability for t in tripods.values()):
+            tripods = _fresh_tripods(geometry)     # оператор заменил штативы
+        if not dump:
+            dump = _random_dump(geometry, rng, tubes_in_dump)   # оператор досыпал свал
+
+        visible = rng.permutation(len(dump))[:candidates_per_frame]
+        candidates = [dump[i] for i in sorted(visible)]
+        open_slots = reference.open_slots(tripods)
+
+        if planner is None:
+            first_tripod = next(iter(open_slots))
+            open_slots = {first_tripod: open_slots[first_tripod]}
+            candidates = candidates[:1]
+
+        step = reference.plan(candidates, open_slots, start=position, max_steps=1)[0]
+        tripods[step.place.tripod_name].place_tube()
+        dump.remove(step.candidate)
+        position = step.place.pose
+        travel += step.travel_mm
+        cycle += step.cycle_s
+
+    return SimulationResult(name=name, picks=picks, travel_mm=travel, cycle_s=cycle)
+
+
+if __name__ == "__main__":
+    def main():
+        from time import perf_counter
+        from src.vision_guided_robot_navigation.config import load_system_layout_config
+
+        geometry = LayoutGeometry(load_system_layout_config().geometry)
+
+        for tubes_in_dump in (40, 200):
+            print(f"--- свал на {tubes_in_dump} пробирок, 1000 пиков")
+            baseline = simulate(geometry, None, tubes_in_dump=tubes_in_dump, picks=1000, name="первый кандидат / первый штатив")
+            results = [
+                baseline,
+                simulate(geometry, PickPlanner(geometry, horizon=1), tubes_in_dump=tubes_in_dump, picks=1000, name="жадный"),
+                simulate(geometry, PickPlanner(geometry, horizon=2), tubes_in_dump=tubes_in_dump, picks=1000, name="жадный + горизонт 2"),
+            ]
+            for r in results:
+                gain = (1 - r.mean_cycle_s / baseline.mean_cycle_s) * 100
+                print(f"{r.name:<35} цикл {r.mean_cycle_s:.3f} с, путь {r.travel_mm / r.picks:7.1f} мм/пик, выигрыш {gain:5.1f} %")
+
+        planner = PickPlanner(geometry, horizon=2)
+        tripods = _fresh_tripods(geometry)
+        candidates = _random_dump(geometry, np.random.default_rng(1), 8)
+        st = perf_counter()
+        for _ in range(200):
+            planner.plan(candidates, planner.open_slots(tripods), max_steps=1)
+        print(f"{(perf_counter()-st) / 200 * 1e3:.3f} ms --- plan (8 кандидатов, {len(tripods)} штатива)")
+    main()
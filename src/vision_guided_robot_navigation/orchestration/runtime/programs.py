@@ -0,0 +1,159 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/programs.py
+"""
+Фоновое обновление кэша состояний программ контроллера.
+
+RobotAgilebot отвечает на запросы состояния и групповые stop / pause / resume из
+снимка не старше program_state_max_age_s. ProgramStateRefresher раз в refresh_s
+перечитывает снимок (refresh_program_states, через очередь исполнителя I/O), так что
+потоку робота список программ почти никогда не приходится ждать, и пишет в лог
+смену состояний (программа запущена / на паузе / завершилась сама).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+
+from src.vision_guided_robot_navigation.devices import CellRobot, DeviceError
+from src.vision_guided_robot_navigation.orchestration.runtime.connection import ConnectionSupervisor
+
+
+class ProgramStateRefresher(threading.Thread):
+    def __init__(
+        self,
+        robot: CellRobot,
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        *,
+        refresh_s: float = 0.5,
+        connection: ConnectionSupervisor | None = None,
+    ):
+        super().__init__(daemon=True, name=f"{getattr(robot, 'name', 'robot')}-programs")
+        self.robot = robot
+        self.stop_event = stop_event
+        self.logger = logger
+        self.refresh_s = refresh_s
+        self.connection = connection
+        self.errors = 0
+        self._states: dict[str, str] = {}
+
+    @property
+    def states(self) -> dict[str, str]:
+        """Последний снимок, прочитанный этим потоком."""
+        return dict(self._states)
+
+    def refresh(self) -> dict[str, str]:
+        states = self.robot.refresh_program_states()
+        if states != self._states:
+            for name in sorted(states.keys() | self._states.keys()):
+                old, new = self._states.get(name, "-"), states.get(name, "-")
+                if old != new:
+                    self.logger.info(f"[{self.name}] Программа {name}: {old} -> {new}")
+            self._states = states
+        return states
+
+    def run(self) -> None:
+        self.logger.info(f"Поток [{self.name}] запущен")
+        try:
+            while not self.stop_event.is_set():
+                if self.connection is None or self.connection.is_up:
+                    try:
+                        self.refresh()
+                    except DeviceError as e:
+                        self.errors += 1
+                        if self.connection is not None:
+                            self.connection.report_error(e)
+                        else:
+                            self.logger.warning(f"[{self.name}] Не удалось прочитать состояния программ: {e}")
+                self.stop_event.wait(self.refresh_s)
+        finally:
+            self.logger.info(f"Поток [{self.name}] остановлен, ошибок чтения {self.errors}")
+
+
+if __name__ == "__main__":
+    def main():
+        """Число вызовов SDK на типовые операции: без кэша (как было) и с фоновым обновлением."""
+        import time
+        from collections import Counter
+        from types import SimpleNamespace
+
+        from src.vision_guided_robot_navigation.devices import RobotAgilebot
+        from Agilebot.IR.A.status_code import StatusCodeEnum
+
+        SDK_S = 0.015           # типичный вызов execution.* по сети
+
+        class CountingExecution:
+            def __init__(self):
+                self.calls = Counter()
+                self.programs = {"vision_guided_navigation": 1, "gripper_io": 1}
+            def _call(self, what):
+                self.calls[what] += 1
+                time.sleep(SDK_S)
+            def all_running_programs(self):
+                self._call("all_running_programs")
+                return [SimpleNamespace(program_name=n, program_status=s) for n, s in self.programs.items()], StatusCodeEnum.OK
+            def start(self, name):
+                self._call("start")
+                self.programs[name] = 1
+                return StatusCodeEnum.OK
+            def stop(self, name):
+                self._call("stop")
+                self.programs.pop(name, None)
+                return StatusCodeEnum.OK
+            def pause(self, name):
+                self._call("pause")
+                self.programs[name] = 2
+                return StatusCodeEnum.OK
+            def resume(self, name):
+                self._call("resume")
+                self.programs[name] = 1
+                return StatusCodeEnum.OK
+
+        def legacy(robot, execution):
+            """Прежняя логика: список программ перед каждой операцией, stop/pause/resume — всем подряд."""
+            def each(action):
+                programs, _ = execution.all_running_programs()
+                for program in programs:
+                    action(program.program_name)
+            return {
+                "state": lambda: execution.all_running_programs(),
+                "pause": lambda: each(execution.pause),
+                "pause_again": lambda: each(execution.pause),
+                "resume": lambda: each(execution.resume),
+                "prepare": lambda: (each(execution.stop), execution.start("vision_guided_navigation")),
+            }
+
+        def cached(robot, execution):
+            return {
+                "state": robot.get_all_running_programms_states,
+                "pause": robot.pause_program,
+                "pause_again": robot.pause_program,
+                "resume": robot.resume_program,
+                "prepare": lambda: (robot.stop_all_running_programms(), robot.start_program("vision_guided_navigation")),
+            }
+
+        logger = logging.getLogger("programs")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        for title, ops in (("без кэша", legacy), ("кэш + фоновое обновление", cached)):
+            robot = RobotAgilebot("sim", "127.0.0.1")
+            robot.connect()
+            execution = CountingExecution()
+            robot.arm.execution = execution
+            stop = threading.Event()
+            refresher = None
+            if ops is cached:
+                refresher = ProgramStateRefresher(robot, stop, logger, refresh_s=0.5)
+                refresher.refresh()         # снимок уже есть к моменту операций
+                execution.calls.clear()
+            line = []
+            for name, op in ops(robot, execution).items():
+                before = sum(execution.calls.values())
+                started = time.perf_counter()
+                op()
+                line.append(
+                    f"{name} {sum(execution.calls.values()) - before} выз./{(time.perf_counter() - started) * 1e3:.0f} мс"
+                )
+            print(f"{title}: " + ", ".join(line))
+            if refresher is not None:
+                print(f"    {robot.program_stats.as_dict()}")
+    main()
@@ -6,7 +6,8 @@
 Содержит:
 - базовый класс потоков роботов
 - реализации потоков загрузчика и выгрузчика
-- контракт протокола регистров (NR/SR)
+- контракт протокола регистров (NR/SR/PR) и конвейерное рукопожатие
+- политику таймаутов, эскалации и автомат защиты итераций
 - исключения итераций
 """
 
@@ -19,12 +20,17 @@ from .base_robot_thread import (
 from .protocol import (
     PROTOCOL_VERSION,
 
-    UNLOADER_NR_NUMBERS,
-    UNLOADER_NR_VALUES,
-    UNLOADER_SR_NUMBERS,
-    UNLOADER_ITERATION_NAMES,
+    ProtocolError,
+    RegisterMap,
+    RegisterMapRegistry,
+    default_register_maps,
+    UnloaderCommand,
+    RegisterWrites,
+    get_unloader_codec,
 )
 
+from .pipeline import UnloadPipeline, InFlightCommand
+from .guard_policy import GuardPolicy, PhaseDeadlines, CircuitBreaker, GuardMetrics
 from .unloader_thread import UnloaderRobotThread
 
 from .errors import (
@@ -38,17 +44,28 @@ __all__ = [
     "BaseRobotThread",
     "UnloaderRobotThread",
 
+    # Pipeline
+    "UnloadPipeline",
+    "InFlightCommand",
+
     # Iterations 
     "IterationContext",
     "GuardResult",
+    "GuardPolicy",
+    "PhaseDeadlines",
+    "CircuitBreaker",
+    "GuardMetrics",
 
     # Protocol
     "PROTOCOL_VERSION",
 
-    "UNLOADER_NR_NUMBERS",
-    "UNLOADER_NR_VALUES",
-    "UNLOADER_SR_NUMBERS",
-    "UNLOADER_ITERATION_NAMES",
+    "ProtocolError",
+    "RegisterMap",
+    "RegisterMapRegistry",
+    "default_register_maps",
+    "UnloaderCommand",
+    "RegisterWrites",
+    "get_unloader_codec",
 
     # Exceptions
     "IterationAbort",
@@ -7,6 +7,8 @@ import logging
 from dataclasses import dataclass
 from enum import Enum
 from typing import Callable, TYPE_CHECKING, TypeVar
+from src.vision_guided_robot_navigation.logging import PhaseTimer
+from src.vision_guided_robot_navigation.orchestration.runtime.watchdog import Heartbeat
 from src.vision_guided_robot_navigation.orchestration.runtime.robots.errors.iteration_exceptions import(
     IterationStopped,
     IterationTimeout,
@@ -14,6 +16,8 @@ from src.vision_guided_robot_navigation.orchestration.runtime.robots.errors.iter
 )
 if TYPE_CHECKING:
     from src.vision_guided_robot_navigation.devices import CellRobot
+    from src.vision_guided_robot_navigation.orchestration.runtime.robots.guard_policy import GuardPolicy
+    from src.vision_guided_robot_navigation.orchestration.runtime.alarms import AlarmMonitor
 T = TypeVar("T")
 
 @dataclass(frozen=True)
@@ -33,10 +37,23 @@ class BaseRobotThread(threading.Thread):
     Базовый поток для робот-логики.
     """
 
-    def __init__(self, *args, stop_event: threading.Event, logger: logging.Logger, **kwargs):
+    def __init__(
+        self,
+        *args,
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        guard_policy: "GuardPolicy | None" = None,
+        alarm_monitor: "AlarmMonitor | None" = None,
+        **kwargs,
+    ):
         super().__init__(*args, **kwargs)
         self.stop_event = stop_event
         self.logger = logger
+        self.guard_policy = guard_policy
+        self.alarm_monitor = alarm_monitor
+        self.prepare_s: float | None = None     # длительность последней подготовки робота
+        self.heartbeat = Heartbeat()            # витки и текущая фаза для Watchdog
+        self.failure: BaseException | None = None   # исключение, которым завершился run()
 
     def prepare_robot(self, robot: "CellRobot", program_name:str) -> None:
         """
@@ -44,10 +61,18 @@ class BaseRobotThread(threading.Thread):
         - Останавливает исполнение всех программ
         - Сбрасывает все ошибки
         - Запускает программу с именем program_name
+        Каждый шаг замеряется; у RobotAgilebot остановка идёт по кэшу состояний
+        программ (без лишнего чтения списка и команд уже остановленным).
         """
-        robot.stop_all_running_programms()
-        robot.reset_errors()
-        robot.start_program(program_name)
+        timer = PhaseTimer(self.logger, title="prepare_robot")
+        with timer.phase("stop_all_running_programms"):
+            robot.stop_all_running_programms()
+        with timer.phase("reset_errors"):
+            robot.reset_errors()
+        with timer.phase(f"start_program {program_name}"):
+            robot.start_program(program_name)
+        self.prepare_s = timer.elapsed()
+        self.logger.info(f"[prepare_robot] Робот подготовлен за {self.prepare_s * 1000:.1f} мс")
 
     def wait_until(
         self,
@@ -61,11 +86,15 @@ class BaseRobotThread(threading.Thread):
         Ждём выполнения condition().
         - timeout → IterationTimeout
         - stop_event → IterationStopped
+        - блокирующая тревога робота (alarm_monitor) → IterationAbort
+        Каждый опрос — виток heartbeat: долгое ожидание не считается зависанием.
         """
         start = time.monotonic()
         while True:
+            self.heartbeat.beat()
             if self.stop_event.is_set():
                 raise IterationStopped(reason or "Остановка по stop_event")
+            self.check_alarms(reason)
             if condition():
                 return
             if timeout is not None and (time.monotonic() - start) >= timeout:
@@ -73,6 +102,46 @@ class BaseRobotThread(threading.Thread):
 
             time.sleep(poll)
 
+    def check_alarms(self, reason: str = "") -> None:
+        """IterationAbort, если монитор видит блокирующие тревоги (без обращения к роботу)."""
+        monitor = self.alarm_monitor
+        if monitor is not None and monitor.has_blocking:
+            raise IterationAbort(
+                f"{reason or 'Ожидание'}: тревоги робота: {', '.join(sorted(monitor.blocking_alarms))}"
+            )
+
+    def wait_phase(
+        self,
+        phase: str,
+        condition: Callable[[], bool],
+        *,
+        robot: "CellRobot | None" = None,
+        poll: float = 0.1,
+        reason: str = "",
+        timeout: float = 600.0,
+    ) -> None:
+        """
+        wait_until для фазы итерации. С guard_policy окно ожидания — дедлайн фазы по
+        истории, по его истечении — шаг эскалации (retry / alarms / reset); успешная
+        длительность пополняет историю. Без политики — прежний фиксированный timeout.
+        """
+        self.heartbeat.enter(phase)
+        policy = self.guard_policy
+        if policy is None:
+            return self.wait_until(condition, timeout=timeout, poll=poll, reason=reason)
+
+        start = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                self.wait_until(condition, timeout=policy.deadline(phase), poll=poll, reason=reason)
+            except IterationTimeout:
+                policy.on_timeout(phase, attempt, robot, waited_s=time.monotonic() - start)
+                attempt += 1
+                continue
+            policy.record(phase, time.monotonic() - start)
+            return
+
     # def reset_robot_iteration_state(self, robot: "CellRobot", iteration_starter_nr: int, iteration_starter_reset: int):
     #     """
     #     Метод для стандартного сброса типа итерации робота
@@ -0,0 +1,285 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/robots/guard_policy.py
+"""
+Политика таймаутов и повторов для ожиданий внутри итераций.
+
+- Дедлайн фазы (pick / place / finish ...) — перцентиль прошлых длительностей фазы
+  * margin, в пределах [min_deadline_s, max_deadline_s]; пока истории мало —
+  cold_deadline_s. Застрявший схват обнаруживается за секунды, а не за 10 минут.
+- Эскалация по истечении дедлайна, шаг за шагом (escalation):
+    retry  — ждать ещё одно окно дедлайна;
+    alarms — спросить активные тревоги робота: есть -> IterationAbort с их списком,
+             нет -> ждать ещё одно окно;
+    reset  — IterationTimeout (гард сбрасывает стартовый регистр, итерация пропускается).
+- Автомат защиты (circuit breaker) на итерацию: после failures подряд неудачных
+  итераций новые не запускаются cooldown (растущий по Backoff), затем одна пробная.
+- Каждое действие считается в GuardMetrics и пишется в лог.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.vision_guided_robot_navigation.orchestration.runtime.backoff import Backoff
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.errors import (
+    IterationAbort,
+    IterationTimeout,
+)
+
+if TYPE_CHECKING:
+    from src.vision_guided_robot_navigation.config.unloader.config import UnloaderGuardConfig
+
+ESCALATION_STEPS = ("retry", "alarms", "reset")
+
+
+@dataclass
+class GuardMetrics:
+    phases: dict[str, int] = field(default_factory=lambda: defaultdict(int))       # успешных ожиданий
+    timeouts: dict[str, int] = field(default_factory=lambda: defaultdict(int))     # истёкших окон
+    actions: dict[str, int] = field(default_factory=lambda: defaultdict(int))      # retry / alarms / reset / abort_alarm
+    breaker_opens: int = 0
+    breaker_rejects: int = 0
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "phases": dict(self.phases),
+            "timeouts": dict(self.timeouts),
+            "actions": dict(self.actions),
+            "breaker_opens": self.breaker_opens,
+            "breaker_rejects": self.breaker_rejects,
+        }
+
+
+class PhaseDeadlines:
+    """Скользящая история длительностей фаз -> дедлайн по перцентилю."""
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 0.99,
+        margin: float = 1.5,
+        min_samples: int = 20,
+        history: int = 200,
+        min_deadline_s: float = 5.0,
+        max_deadline_s: float = 600.0,
+        cold_deadline_s: float = 120.0,
+    ):
+        if not 0.0 < percentile <= 1.0 or margin < 1.0 or min_samples < 1 or history < min_samples:
+            raise ValueError(
+                f"PhaseDeadlines: некорректные параметры percentile={percentile}, margin={margin}, "
+                f"min_samples={min_samples}, history={history}"
+            )
+        self.percentile = percentile
+        self.margin = margin
+        self.min_samples = min_samples
+        self.min_deadline_s = min_deadline_s
+        self.max_deadline_s = max_deadline_s
+        self.cold_deadline_s = cold_deadline_s
+        self._history: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=history))
+        self._deadline: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase: str, duration_s: float) -> None:
+        with self._lock:
+            samples = self._history[phase]
+            samples.append(duration_s)
+            if len(samples) >= self.min_samples:
+                ordered = sorted(samples)
+                value = ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+                self._deadline[phase] = min(self.max_deadline_s, max(self.min_deadline_s, value * self.margin))
+
+    def deadline(self, phase: str) -> float:
+        return self._deadline.get(phase, self.cold_deadline_s)
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {phase: round(self.deadline(phase), 2) for phase in self._history}
+
+
+class CircuitBreaker:
+    """closed -> (failures подряд) -> open на cooldown -> одна пробная итерация -> closed / open."""
+
+    def __init__(self, name: str, *, failures: int = 3, cooldown_s: float = 30.0, cooldown_max_s: float = 300.0):
+        self.name = name
+        self.failures = failures
+        self.cooldown = Backoff(cooldown_s, cooldown_max_s)
+        self.consecutive = 0
+        self.open_until: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_until is not None and time.monotonic() < self.open_until
+
+    def remaining_s(self) -> float:
+        return max(0.0, self.open_until - time.monotonic()) if self.open_until is not None else 0.0
+
+    def allow(self) -> bool:
+        """False — цепь разомкнута; после cooldown пропускается пробная итерация."""
+        return not self.is_open
+
+    def record_success(self) -> None:
+        self.consecutive = 0
+        self.open_until = None
+        self.cooldown.reset()
+
+    def record_failure(self) -> bool:
+        """True — цепь только что разомкнулась."""
+        self.consecutive += 1
+        half_open = self.open_until is not None      # провалилась пробная итерация
+        if half_open or self.consecutive >= self.failures:
+            self.open_until = time.monotonic() + self.cooldown.next_delay()
+            return True
+        return False
+
+
+class GuardPolicy:
+    def __init__(
+        self,
+        logger: logging.Logger,
+        *,
+        deadlines: PhaseDeadlines | None = None,
+        escalation: tuple[str, ...] = ESCALATION_STEPS,
+        breaker_failures: int = 3,
+        breaker_cooldown_s: float = 30.0,
+        breaker_cooldown_max_s: float = 300.0,
+    ):
+        unknown = [step for step in escalation if step not in ESCALATION_STEPS]
+        if unknown:
+            raise ValueError(f"GuardPolicy: неизвестные шаги эскалации {unknown}, доступны {ESCALATION_STEPS}")
+        self.logger = logger
+        self.deadlines = deadlines or PhaseDeadlines()
+        self.escalation = tuple(escalation)
+        self.metrics = GuardMetrics()
+        self._breaker_args = dict(failures=breaker_failures, cooldown_s=breaker_cooldown_s, cooldown_max_s=breaker_cooldown_max_s)
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @classmethod
+    def from_config(cls, cfg: "UnloaderGuardConfig", logger: logging.Logger) -> "GuardPolicy":
+        return cls(
+            logger,
+            deadlines=PhaseDeadlines(
+                percentile=cfg.percentile,
+                margin=cfg.margin,
+                min_samples=cfg.min_samples,
+                history=cfg.history,
+                min_deadline_s=cfg.min_deadline_s,
+                max_deadline_s=cfg.max_deadline_s,
+                cold_deadline_s=cfg.cold_deadline_s,
+            ),
+            escalation=cfg.escalation,
+            breaker_failures=cfg.breaker_failures,
+            breaker_cooldown_s=cfg.breaker_cooldown_s,
+            breaker_cooldown_max_s=cfg.breaker_cooldown_max_s,
+        )
+
+    # ---------- фазы ----------
+    def deadline(self, phase: str) -> float:
+        return self.deadlines.deadline(phase)
+
+    def record(self, phase: str, duration_s: float) -> None:
+        self.metrics.phases[phase] += 1
+        self.deadlines.record(phase, duration_s)
+
+    def on_timeout(self, phase: str, attempt: int, robot: object | None, waited_s: float) -> None:
+        """
+        Шаг эскалации attempt (0, 1, ...) после истечения окна фазы.
+        Возврат — ждать ещё одно окно; иначе IterationAbort / IterationTimeout.
+        """
+        self.metrics.timeouts[phase] += 1
+        step = self.escalation[attempt] if attempt < len(self.escalation) else "reset"
+        self.metrics.actions[step] += 1
+
+        if step == "retry":
+            self.logger.warning(f"[Guard] {phase}: нет ответа {waited_s:.1f} с, ждём ещё {self.deadline(phase):.1f} с")
+            return
+
+        if step == "alarms":
+            get_alarms = getattr(robot, "get_all_active_alarms", None)
+            alarms = get_alarms() if get_alarms is not None else []
+            if alarms:
+                self.metrics.actions["abort_alarm"] += 1
+                raise IterationAbort(f"{phase}: тревоги робота после {waited_s:.1f} с ожидания: {', '.join(map(str, alarms))}")
+            self.logger.warning(f"[Guard] {phase}: нет ответа {waited_s:.1f} с, тревог нет, ждём ещё {self.deadline(phase):.1f} с")
+            return
+
+        raise IterationTimeout(f"{phase}: нет ответа {waited_s:.1f} с (дедлайн {self.deadline(phase):.1f} с), сброс итерации")
+
+    # ---------- автомат защиты ----------
+    def breaker(self, name: str) -> CircuitBreaker:
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(name, **self._breaker_args)
+        return self._breakers[name]
+
+    def allow(self, name: str) -> bool:
+        if self.breaker(name).allow():
+            return True
+        self.metrics.breaker_rejects += 1
+        return False
+
+    def record_result(self, name: str, ok: bool) -> None:
+        breaker = self.breaker(name)
+        if ok:
+            breaker.record_success()
+            return
+        if breaker.record_failure():
+            self.metrics.breaker_opens += 1
+            self.logger.error(
+                f"[Guard] {name}: {breaker.consecutive} неудачных итераций подряд, "
+                f"новые не запускаются {breaker.remaining_s():.0f} с"
+            )
+
+    def as_dict(self) -> dict[str, object]:
+        return {"deadlines_s": self.deadlines.as_dict(), **self.metrics.as_dict()}
+
+
+if __name__ == "__main__":
+    def main():
+        """Застрявший схват: сколько ячейка ждёт до сброса при фиксированных 600 с и с политикой."""
+        import random
+
+        rng = random.Random(0)
+        logger = logging.getLogger("guard")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        policy = GuardPolicy(logger)
+
+        # история нормальной работы: pick ~ 1.2 +- 0.3 с с редкими хвостами
+        for _ in range(200):
+            policy.record("pick", rng.lognormvariate(math.log(1.2), 0.25))
+        deadline = policy.deadline("pick")
+
+        # застревание: дедлайн истекает на каждом шаге эскалации до reset
+        waited, attempt = 0.0, 0
+        while True:
+            waited += deadline
+            try:
+                policy.on_timeout("pick", attempt, robot=None, waited_s=waited)
+            except IterationTimeout:
+                break
+            attempt += 1
+        print(f"дедлайн pick {deadline:.2f} с (p99 x 1.5, не меньше min_deadline_s), сброс застрявшей итерации через {waited:.1f} с вместо 600 с")
+
+        # робот с тревогой: abort на шаге alarms, с текстом тревоги
+        class AlarmRobot:
+            def get_all_active_alarms(self):
+                return ["GRIPPER_VACUUM_LOST"]
+        try:
+            policy.on_timeout("pick", 1, robot=AlarmRobot(), waited_s=2 * deadline)
+        except IterationAbort as e:
+            print(f"abort: {e}")
+
+        # автомат защиты: 3 неудачи подряд -> пауза, неудачная пробная -> пауза дольше
+        for _ in range(3):
+            policy.record_result("UNLOAD_ITERATION", ok=False)
+        breaker = policy.breaker("UNLOAD_ITERATION")
+        first = breaker.remaining_s()
+        breaker.open_until = time.monotonic()           # cooldown прошёл
+        assert policy.allow("UNLOAD_ITERATION")
+        policy.record_result("UNLOAD_ITERATION", ok=False)
+        print(f"автомат: пауза {first:.0f} с, после неудачной пробной {breaker.remaining_s():.0f} с")
+        print(policy.as_dict())
+    main()
@@ -0,0 +1,159 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/robots/pipeline.py
+"""
+Конвейерное рукопожатие выгрузчика (robot_regs_v3).
+
+Последовательный режим ждёт три фазы (grip_good, grip_bad, iteration_starter == end),
+и только потом оркестратор ищет следующую пробирку и пишет регистры — всё это время
+робот стоит. В конвейере:
+
+1. Оркестратор пишет команду seq в банк seq % 2 (NR штатив/слот, PR позы),
+   последним — bank_seq = seq.
+2. Контроллер, ожидающий seq, ждёт bank_seq == seq своего банка (bank_seq == seq - 2 —
+   команды ещё нет, любое другое значение — рассинхрон: seq_error = seq и ожидание сброса).
+3. Пробирка взята — seq_picked = seq: свал изменился, оркестратор ищет следующую
+   пробирку, пока робот несёт текущую, и пишет её в другой банк.
+4. Пробирка поставлена — seq_done = seq; следующая команда уже лежит в банке,
+   контроллер сразу идёт за ней.
+
+В полёте не больше двух команд, следующая публикуется только после seq_picked
+предыдущей (иначе vision может снова выдать уже взятую пробирку).
+Выход из режима — только по iteration_starter = reset от оркестратора; контроллер
+доводит текущее движение и отвечает iteration_starter = end (новый сеанс ждёт этого ответа,
+иначе его start может прийти в ещё не вышедший из цикла контроллер). Пробирки,
+поставленные во время выхода, забираются из прошлого сеанса settle() до reset() нового.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.protocol import (
+    ProtocolError,
+    RegisterMap,
+    UnloaderCommand,
+)
+
+if TYPE_CHECKING:
+    from src.vision_guided_robot_navigation.devices import CellRobot
+    from src.vision_guided_robot_navigation.domain import Pose
+    from src.vision_guided_robot_navigation.orchestration.runtime.robots.protocol import UnloaderCodecV3
+
+
+@dataclass
+class InFlightCommand:
+    seq: int
+    tripod_name: str
+    slot: int
+    place_pose: "Pose | None"
+    posted_at: float = field(default_factory=time.monotonic)
+    picked_at: float | None = None
+
+
+class UnloadPipeline:
+    """Сторона оркестратора: нумерация, банки, сверка прогресса контроллера."""
+
+    DEPTH = 2
+
+    def __init__(
+        self,
+        robot: "CellRobot",
+        codec: "UnloaderCodecV3",
+        registers: RegisterMap,
+        logger: logging.Logger,
+    ):
+        self.robot = robot
+        self.codec = codec
+        self.logger = logger
+        self._seq_picked, self._seq_done, self._seq_error = registers.require(
+            "nr", "seq_picked", "seq_done", "seq_error"
+        )
+        self.inflight: deque[InFlightCommand] = deque()
+        self.next_seq = 1
+        self.picked = 0
+        self.done = 0
+
+    def reset(self) -> None:
+        """До старта программы в режиме конвейера: банки и счётчики контроллера в исходное."""
+        self.codec.reset_writes().apply(self.robot)
+        for register_id in (self._seq_picked, self._seq_done, self._seq_error):
+            self.robot.set_number_register(register_id, 0)
+        self.inflight.clear()
+        self.next_seq = 1
+        self.picked = 0
+        self.done = 0
+
+    def reserved(self, tripod_name: str) -> int:
+        """Слоты штатива, уже отданные командам в полёте."""
+        return sum(1 for command in self.inflight if command.tripod_name == tripod_name)
+
+    def can_post(self) -> bool:
+        return len(self.inflight) < self.DEPTH and all(c.picked_at is not None for c in self.inflight)
+
+    @property
+    def last_picked_at(self) -> float | None:
+        picked = [c.picked_at for c in self.inflight if c.picked_at is not None]
+        return max(picked) if picked else None
+
+    def post(self, command: UnloaderCommand, tripod_name: str, place_pose: "Pose | None") -> int:
+        if not self.can_post():
+            raise ProtocolError(f"{self.codec.version}: оба банка заняты, seq {self.next_seq} не опубликован")
+        seq = self.next_seq
+        self.codec.encode(command, seq).apply(self.robot)
+        self.inflight.append(InFlightCommand(seq, tripod_name, command.slot, place_pose))
+        self.next_seq += 1
+        return seq
+
+    def poll(self) -> tuple[list[InFlightCommand], list[InFlightCommand], int]:
+        """
+        Прогресс контроллера -> (взятые, поставленные с прошлого опроса, seq_error).
+        seq_error != 0 — контроллер нашёл рассинхрон банка; поставленные до него пробирки
+        всё равно возвращаются, чтобы их учли. Несогласованные счётчики — ProtocolError.
+        """
+        error = int(self.robot.get_number_register(self._seq_error))
+        picked = int(self.robot.get_number_register(self._seq_picked))
+        done = int(self.robot.get_number_register(self._seq_done))
+        posted = self.next_seq - 1
+        if not (self.done <= done <= picked <= posted and self.picked <= picked):
+            raise ProtocolError(
+                f"Рассинхрон seq: контроллер picked={picked} done={done}, "
+                f"ожидалось done {self.done}..picked, picked {self.picked}..{posted}"
+            )
+
+        now = time.monotonic()
+        picked_now = []
+        for command in self.inflight:
+            if self.picked < command.seq <= picked:
+                command.picked_at = now
+                picked_now.append(command)
+        done_now = []
+        while self.inflight and self.inflight[0].seq <= done:
+            done_now.append(self.inflight.popleft())
+        self.picked, self.done = picked, done
+        return picked_now, done_now, error
+
+    def settle(self) -> tuple[list[InFlightCommand], list[InFlightCommand]]:
+        """
+        Итог прерванного сеанса после выхода контроллера из цикла -> (поставленные, потерянные).
+        Читается только seq_done: прочие счётчики после сбоя могут быть несогласованы,
+        а значение вне posted не доверяется (команды в полёте считаются потерянными).
+        """
+        done = int(self.robot.get_number_register(self._seq_done))
+        posted = self.next_seq - 1
+        if not self.done <= done <= posted:
+            self.logger.warning(
+                f"[pipeline] seq_done={done} после выхода вне {self.done}..{posted}, поставленные не учитываются"
+            )
+            done = self.done
+        placed = []
+        while self.inflight and self.inflight[0].seq <= done:
+            placed.append(self.inflight.popleft())
+        lost = list(self.inflight)
+        self.inflight.clear()
+        self.done = done
+        return placed, lost
+
+    def oldest_age_s(self) -> float:
+        return time.monotonic() - self.inflight[0].posted_at if self.inflight else 0.0
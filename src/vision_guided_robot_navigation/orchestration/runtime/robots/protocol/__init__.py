@@ -1,22 +1,38 @@
 # src/vision_guided_robot_navigation/orchestration/runtime/robots/protocol/__init__.py
 
-from .register_maps import (
-    PROTOCOL_VERSION,
-
-    UNLOADER_NR_NUMBERS,
-    UNLOADER_NR_VALUES,
-    UNLOADER_SR_NUMBERS,
-    UNLOADER_PR_NUMBERS,
-    UNLOADER_ITERATION_NAMES,
+from .register_maps import PROTOCOL_VERSION
+from .registry import (
+    ProtocolError,
+    RegisterMap,
+    RegisterMapRegistry,
+    default_register_maps,
+)
+from .codec import (
+    UnloaderCommand,
+    RegisterWrites,
+    UnloaderCodecV1,
+    UnloaderCodecV2,
+    UnloaderCodecV3,
+    UNLOADER_CODECS,
+    get_unloader_codec,
 )
 
 __all__ = [
     # Protocol
     "PROTOCOL_VERSION",
 
-    "UNLOADER_NR_NUMBERS",
-    "UNLOADER_NR_VALUES",
-    "UNLOADER_SR_NUMBERS",
-    "UNLOADER_PR_NUMBERS",
-    "UNLOADER_ITERATION_NAMES",
+    # Registry
+    "ProtocolError",
+    "RegisterMap",
+    "RegisterMapRegistry",
+    "default_register_maps",
+
+    # Codec
+    "UnloaderCommand",
+    "RegisterWrites",
+    "UnloaderCodecV1",
+    "UnloaderCodecV2",
+    "UnloaderCodecV3",
+    "UNLOADER_CODECS",
+    "get_unloader_codec",
 ]
\ No newline at end of file
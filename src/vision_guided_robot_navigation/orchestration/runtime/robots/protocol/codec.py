@@ -0,0 +1,252 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/robots/protocol/codec.py
+"""
+Кодек команды итерации выгрузки -> набор записей в регистры робота.
+
+robot_regs_v1 — текущая программа контроллера: SR unloader_data в виде
+    "TT SS XXX.XXX YYY.YYY ZZZ.ZZZ AAA.AAA BBB.BBB CCC.CCC" (поля фиксированной ширины)
+    + PR позы пробирки и слота. Значение, не влезающее в ширину поля
+    (например, -420.0 мм), раньше молча сдвигало разметку — теперь ProtocolError.
+robot_regs_v2 — без разбора текста на контроллере: номер штатива и слота в NR
+    (целые), позы только в PR (вещественные, с полной точностью), SR не используется.
+robot_regs_v3 — конвейерный режим поверх v2: два банка NR/PR, команда seq пишется
+    в банк seq % 2, номер seq — в bank_seq банка последним (commit). Контроллер
+    берёт следующую команду из другого банка, не дожидаясь оркестратора
+    (см. UnloadPipeline в robots/pipeline.py).
+
+Кодек привязывается к RegisterMap: номера регистров берутся из карты один раз в
+конструкторе, так что версия из register_maps.yaml с тем же codec, но другими
+номерами, работает без правки кода.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from .registry import ProtocolError, RegisterMap, default_register_maps
+
+if TYPE_CHECKING:
+    from src.vision_guided_robot_navigation.devices import CellRobot
+
+Pose = tuple[float, float, float, float, float, float]
+
+
+@dataclass(frozen=True)
+class UnloaderCommand:
+    tripod: int                     # номер штатива установки ("1" -> 1)
+    slot: int                       # номер слота в штативе
+    tube_pose: Pose                 # пробирка в свале, база робота
+    place_pose: Pose | None = None  # слот штатива из LayoutGeometry (None — считает контроллер)
+
+
+@dataclass
+class RegisterWrites:
+    """
+    Записи в регистры одной команды; apply() — в порядке NR -> PR -> SR -> commit.
+    commit — NR, которые контроллер читает как признак "данные записаны полностью".
+    """
+    nr: dict[int, int | float] = field(default_factory=dict)
+    pr: dict[int, Pose] = field(default_factory=dict)
+    sr: dict[int, str] = field(default_factory=dict)
+    commit: dict[int, int | float] = field(default_factory=dict)
+
+    def apply(self, robot: "CellRobot") -> None:
+        for register_id, value in self.nr.items():
+            robot.set_number_register(register_id, value)
+        if self.pr:
+            robot.set_pose_registers(self.pr)
+        for register_id, value in self.sr.items():
+            robot.set_string_register(register_id, value)
+        for register_id, value in self.commit.items():
+            robot.set_number_register(register_id, value)
+
+
+def _validate_command(version: str, command: UnloaderCommand, max_index: int) -> None:
+    """Номера штатива и слота — целые 0..max_index, поза пробирки — 6 осей."""
+    for name, value in (("tripod", command.tripod), ("slot", command.slot)):
+        if not isinstance(value, int) or not 0 <= value <= max_index:
+            raise ProtocolError(f"{version}: {name}={value!r} вне 0..{max_index}")
+    if len(command.tube_pose) != 6:
+        raise ProtocolError(f"{version}: поза пробирки должна иметь 6 осей, получено {len(command.tube_pose)}")
+
+
+class UnloaderCodecV1:
+    version = "robot_regs_v1"
+    pipelined = False
+
+    INT_WIDTH = 2
+    MAX_INDEX = 99          # "%02d": -1 тоже занимает 2 знака, поэтому диапазон проверяется отдельно
+    FLOAT_WIDTH = 7
+    _FORMAT = " ".join(["%02d"] * 2 + ["%07.3f"] * 6)
+    _SIZE = 2 * (INT_WIDTH + 1) + 6 * (FLOAT_WIDTH + 1) - 1
+
+    def __init__(self, registers: RegisterMap):
+        self.registers = registers
+        self._tube_dump, self._tripod_place = registers.require("pr", "tube_dump", "tripod_place")
+        (self._unloader_data,) = registers.require("sr", "unloader_data")
+
+    def encode(self, command: UnloaderCommand) -> RegisterWrites:
+        _validate_command(self.version, command, self.MAX_INDEX)
+        data = self._FORMAT % (command.tripod, command.slot, *command.tube_pose)
+        if len(data) != self._SIZE:
+            # Медленный путь только для ошибки: какое поле вышло за ширину
+            fields = data.split(" ")
+            names = ("tripod", "slot", "x", "y", "z", "a", "b", "c")
+            bad = [
+                f"{name}={value}" for name, value, width in zip(names, fields, [self.INT_WIDTH] * 2 + [self.FLOAT_WIDTH] * 6)
+                if len(value) != width
+            ]
+            raise ProtocolError(f"{self.version}: значение не помещается в поле SR: {', '.join(bad)}")
+
+        writes = RegisterWrites(
+            pr={self._tube_dump: command.tube_pose},
+            sr={self._unloader_data: data},
+        )
+        if command.place_pose is not None:
+            writes.pr[self._tripod_place] = command.place_pose
+        return writes
+
+    def decode(self, writes: RegisterWrites) -> UnloaderCommand:
+        data = writes.sr[self._unloader_data]
+        fields = data.split(" ")
+        if len(data) != self._SIZE or len(fields) != 8:
+            raise ProtocolError(f"{self.version}: некорректная строка SR '{data}'")
+        return UnloaderCommand(
+            tripod=int(fields[0]),
+            slot=int(fields[1]),
+            tube_pose=tuple(float(v) for v in fields[2:]),
+            place_pose=writes.pr.get(self._tripod_place),
+        )
+
+
+class UnloaderCodecV2:
+    version = "robot_regs_v2"
+    pipelined = False
+
+    MAX_INDEX = 999         # NR — вещественный регистр; номера проверяются как целые
+
+    def __init__(self, registers: RegisterMap):
+        self.registers = registers
+        self._tripod, self._slot = registers.require("nr", "tripod", "slot")
+        self._tube_dump, self._tripod_place = registers.require("pr", "tube_dump", "tripod_place")
+
+    def _validate(self, command: UnloaderCommand) -> None:
+        _validate_command(self.version, command, self.MAX_INDEX)
+
+    def encode(self, command: UnloaderCommand) -> RegisterWrites:
+        self._validate(command)
+        writes = RegisterWrites(
+            nr={
+                self._tripod: command.tripod,
+                self._slot: command.slot,
+            },
+            pr={self._tube_dump: command.tube_pose},
+        )
+        if command.place_pose is not None:
+            writes.pr[self._tripod_place] = command.place_pose
+        return writes
+
+    def decode(self, writes: RegisterWrites) -> UnloaderCommand:
+        return UnloaderCommand(
+            tripod=int(writes.nr[self._tripod]),
+            slot=int(writes.nr[self._slot]),
+            tube_pose=writes.pr[self._tube_dump],
+            place_pose=writes.pr.get(self._tripod_place),
+        )
+
+
+class UnloaderCodecV3(UnloaderCodecV2):
+    version = "robot_regs_v3"
+    pipelined = True
+    BANKS = 2
+
+    def __init__(self, registers: RegisterMap):
+        self.registers = registers
+        # банк b: (NR tripod, NR slot, NR bank_seq), (PR tube_dump, PR tripod_place)
+        self._banks = tuple(
+            (
+                registers.require("nr", f"tripod_{b}", f"slot_{b}", f"bank_seq_{b}"),
+                registers.require("pr", f"tube_dump_{b}", f"tripod_place_{b}"),
+            )
+            for b in range(self.BANKS)
+        )
+
+    def encode(self, command: UnloaderCommand, seq: int = 1) -> RegisterWrites:
+        if seq < 1:
+            raise ProtocolError(f"{self.version}: seq={seq}, нумерация команд начинается с 1")
+        self._validate(command)
+        (tripod, slot, bank_seq), (tube_dump, tripod_place) = self._banks[seq % self.BANKS]
+        writes = RegisterWrites(
+            nr={tripod: command.tripod, slot: command.slot},
+            pr={tube_dump: command.tube_pose},
+            commit={bank_seq: seq},
+        )
+        if command.place_pose is not None:
+            writes.pr[tripod_place] = command.place_pose
+        return writes
+
+    def reset_writes(self) -> RegisterWrites:
+        """
+        Начальные bank_seq: контроллер, ожидающий команду N, ждёт, пока bank_seq == N - 2,
+        и сообщает рассинхрон при любом другом значении. Первая команда банка b — seq b или BANKS + b.
+        """
+        return RegisterWrites(commit={
+            bank_seq: (b or self.BANKS) - self.BANKS for b, ((_, _, bank_seq), _) in enumerate(self._banks)
+        })
+
+    def decode(self, writes: RegisterWrites) -> UnloaderCommand:
+        for (tripod, slot, bank_seq), (tube_dump, tripod_place) in self._banks:
+            if bank_seq in writes.commit:
+                return UnloaderCommand(
+                    tripod=int(writes.nr[tripod]),
+                    slot=int(writes.nr[slot]),
+                    tube_pose=writes.pr[tube_dump],
+                    place_pose=writes.pr.get(tripod_place),
+                )
+        raise ProtocolError(f"{self.version}: в записях нет bank_seq ни одного банка")
+
+
+UNLOADER_CODECS = {codec.version: codec for codec in (UnloaderCodecV1, UnloaderCodecV2, UnloaderCodecV3)}
+
+def get_unloader_codec(registers: RegisterMap | str) -> UnloaderCodecV1 | UnloaderCodecV2 | UnloaderCodecV3:
+    """Кодек для карты регистров (или версии из поставляемого register_maps.yaml)."""
+    if isinstance(registers, str):
+        registers = default_register_maps().get("unloader", registers)
+    try:
+        codec = UNLOADER_CODECS[registers.codec]
+    except KeyError:
+        raise ProtocolError(
+            f"{registers}: неизвестный кодек '{registers.codec}', доступны: {', '.join(UNLOADER_CODECS)}"
+        ) from None
+    return codec(registers)
+
+
+if __name__ == "__main__":
+    def main():
+        """Стоимость кодирования на горячем пути (round-trip и ошибки — tests/test_protocol_codec.py)."""
+        from time import perf_counter
+
+        v1, v2 = (get_unloader_codec(f"robot_regs_v{n}") for n in (1, 2))
+
+        command = UnloaderCommand(1, 17, (12.5, -34.25, 60.0, 180.0, 0.0, 45.5), (450.0, 40.0, 110.0, 180.0, 0.0, 90.0))
+        tube = dict(zip("xyzabc", command.tube_pose))
+        runs = 100_000
+
+        st = perf_counter()
+        for _ in range(runs):
+            data_str = (
+                f"{tube['x']:08.3f} {tube['y']:08.3f} {tube['z']:08.3f} "
+                f"{tube['a']:08.3f} {tube['b']:08.3f} {tube['c']:08.3f}"
+            )
+            data_str = (
+                f"{command.tripod:02d} {command.slot:02d} "
+                f"{tube['x']:07.3f} {tube['y']:07.3f} {tube['z']:07.3f} "
+                f"{tube['a']:07.3f} {tube['b']:07.3f} {tube['c']:07.3f}"
+            )
+        print(f"{(perf_counter() - st) / runs * 1e6:.2f} us --- прежние f-строки (две, без проверки)")
+
+        for codec in (v1, v2):
+            st = perf_counter()
+            for _ in range(runs):
+                codec.encode(command)
+            print(f"{(perf_counter() - st) / runs * 1e6:.2f} us --- {codec.version}.encode (с проверкой)")
+    main()
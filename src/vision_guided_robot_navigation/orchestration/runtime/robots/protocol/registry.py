@@ -0,0 +1,210 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/robots/protocol/registry.py
+"""
+Реестр карт регистров: роли роботов x версии протокола.
+
+Карты описываются в config/protocol/register_maps.yaml и при загрузке компилируются
+в RegisterMap — обычные словари имя -> номер/значение, проверенные один раз:
+обязательные для роли имена есть, номера в пределах типа регистра не повторяются.
+Кодеки берут номера из карты один раз в конструкторе и дальше работают с целыми;
+ошибка в карте видна при старте, а не посреди итерации.
+
+negotiate() читает версию, которую сообщает программа контроллера (SR version_sr),
+и выбирает карту: объявленная контроллером версия важнее настроенной; неизвестная
+версия — ProtocolError до первой команды роботу.
+
+Номера регистров в коде не дублируются: единственный источник — yaml.
+"""
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING, Mapping
+
+from src.vision_guided_robot_navigation.config.protocol import (
+    load_protocol_config,
+    ProtocolConfig,
+    RegisterMapSpec,
+)
+
+if TYPE_CHECKING:
+    from src.vision_guided_robot_navigation.devices import CellRobot
+
+
+class ProtocolError(ValueError):
+    """Команду нельзя представить в регистрах выбранной версии протокола / версия не поддерживается."""
+
+
+# Имена, без которых поток роли не работает; нужды кодеков проверяют сами кодеки
+REQUIRED_REGISTERS: dict[str, dict[str, tuple[str, ...]]] = {
+    "unloader": {
+        "nr": ("iteration_starter", "grip_status"),
+        "nr_values": ("start", "reset", "end", "grip_good", "grip_bad"),
+        "sr": ("iteration_type",),
+        "sr_values": ("unloading",),
+        "pr": ("zero_pose",),
+    },
+}
+
+_NUMBERED = ("nr", "sr", "pr")
+
+
+class RegisterMap:
+    """Скомпилированная карта регистров одной версии протокола одной роли."""
+
+    __slots__ = ("role", "version", "codec", "nr", "nr_values", "sr", "sr_values", "pr", "_names")
+
+    def __init__(self, spec: RegisterMapSpec):
+        self.role = spec.role
+        self.version = spec.version
+        self.codec = spec.codec
+        self.nr: dict[str, int] = dict(spec.nr)
+        self.nr_values: dict[str, int] = dict(spec.nr_values)
+        self.sr: dict[str, int] = dict(spec.sr)
+        self.sr_values: dict[str, str] = dict(spec.sr_values)
+        self.pr: dict[str, int] = dict(spec.pr)
+
+        # обратные таблицы номер -> имя (логи, декодирование); заодно ловят дубли
+        self._names: dict[str, dict[int, str]] = {}
+        for kind in _NUMBERED:
+            names: dict[int, str] = {}
+            for name, number in getattr(self, kind).items():
+                if number in names:
+                    raise ProtocolError(
+                        f"{self}: {kind.upper()}[{number}] назначен и '{names[number]}', и '{name}'"
+                    )
+                names[number] = name
+            self._names[kind] = names
+
+        for kind, names in REQUIRED_REGISTERS.get(self.role, {}).items():
+            self.require(kind, *names)
+
+    def require(self, kind: str, *names: str) -> tuple:
+        """Номера/значения по именам; отсутствующие — одна ProtocolError со всем списком."""
+        table = getattr(self, kind)
+        missing = [name for name in names if name not in table]
+        if missing:
+            raise ProtocolError(f"{self}: в секции {kind} нет {', '.join(missing)}")
+        return tuple(table[name] for name in names)
+
+    def register_name(self, kind: str, number: int) -> str:
+        return self._names[kind].get(number, f"{kind.upper()}[{number}]")
+
+    def __str__(self) -> str:
+        return f"{self.role}/{self.version}"
+
+    def __repr__(self) -> str:
+        return f"RegisterMap({self}, codec={self.codec})"
+
+
+class RegisterMapRegistry:
+    def __init__(self, config: ProtocolConfig):
+        self._version_sr: dict[str, int] = {}
+        self._default: dict[str, str] = {}
+        self._maps: dict[str, dict[str, RegisterMap]] = {}
+        for role, role_cfg in config.roles.items():
+            maps = {version: RegisterMap(spec) for version, spec in role_cfg.versions.items()}
+            for register_map in maps.values():
+                if role_cfg.version_sr in register_map._names["sr"]:
+                    raise ProtocolError(
+                        f"{register_map}: SR[{role_cfg.version_sr}] занят "
+                        f"'{register_map.register_name('sr', role_cfg.version_sr)}', а он отведён под версию протокола"
+                    )
+            self._maps[role] = maps
+            self._version_sr[role] = role_cfg.version_sr
+            self._default[role] = role_cfg.default_version
+
+    def roles(self) -> list[str]:
+        return list(self._maps)
+
+    def versions(self, role: str) -> list[str]:
+        return list(self._role(role))
+
+    def version_sr(self, role: str) -> int:
+        self._role(role)
+        return self._version_sr[role]
+
+    def get(self, role: str, version: str | None = None) -> RegisterMap:
+        maps = self._role(role)
+        version = version or self._default[role]
+        try:
+            return maps[version]
+        except KeyError:
+            raise ProtocolError(
+                f"{role}: неизвестная версия протокола '{version}', доступны: {', '.join(maps)}"
+            ) from None
+
+    def negotiate(
+        self,
+        robot: "CellRobot",
+        role: str,
+        preferred: str | None = None,
+        logger: logging.Logger | None = None,
+    ) -> RegisterMap:
+        """
+        Карта по версии, которую сообщает контроллер.
+        Пустой SR — старая программа: preferred или default_version роли.
+        Ошибки связи при чтении SR пробрасываются вызывающему.
+        """
+        maps = self._role(role)
+        advertised = str(robot.get_string_register(self._version_sr[role]) or "").strip()
+
+        if not advertised:
+            register_map = self.get(role, preferred)
+            if logger is not None:
+                logger.warning(
+                    f"[{role}] Контроллер не сообщает версию протокола (SR[{self._version_sr[role]}] пуст), "
+                    f"используется {register_map.version}"
+                )
+            return register_map
+
+        if advertised not in maps:
+            raise ProtocolError(
+                f"{role}: контроллер работает по протоколу '{advertised}', "
+                f"поддерживаются: {', '.join(maps)}"
+            )
+        if logger is not None:
+            if preferred and preferred != advertised:
+                logger.warning(f"[{role}] В конфиге протокол {preferred}, контроллер сообщает {advertised} — используется {advertised}")
+            else:
+                logger.info(f"[{role}] Протокол регистров: {advertised}")
+        return maps[advertised]
+
+    def _role(self, role: str) -> Mapping[str, RegisterMap]:
+        try:
+            return self._maps[role]
+        except KeyError:
+            raise ProtocolError(f"Нет карт регистров для роли '{role}', описаны: {', '.join(self._maps)}") from None
+
+
+@lru_cache(maxsize=1)
+def default_register_maps() -> RegisterMapRegistry:
+    """Реестр из поставляемого register_maps.yaml (один на процесс)."""
+    return RegisterMapRegistry(load_protocol_config())
+
+
+if __name__ == "__main__":
+    def main():
+        registry = default_register_maps()
+        for role in registry.roles():
+            print(f"{role}: версии {registry.versions(role)}, версия в SR[{registry.version_sr(role)}]")
+
+        v1 = registry.get("unloader", "robot_regs_v1")
+        v2 = registry.get("unloader", "robot_regs_v2")
+
+        # --- согласование версии
+        class Controller:
+            def __init__(self, advertised):
+                self.advertised = advertised
+            def get_string_register(self, sr_id):
+                return self.advertised
+
+        logger = logging.getLogger("protocol")
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+        assert registry.negotiate(Controller(""), "unloader", "robot_regs_v1", logger) is v1
+        assert registry.negotiate(Controller("robot_regs_v2"), "unloader", "robot_regs_v1", logger) is v2
+        try:
+            registry.negotiate(Controller("robot_regs_v9"), "unloader", logger=logger)
+            raise AssertionError("принята неизвестная версия")
+        except ProtocolError as e:
+            print(f"отклонено: {e}")
+    main()
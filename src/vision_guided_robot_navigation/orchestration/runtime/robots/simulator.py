@@ -0,0 +1,316 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/robots/simulator.py
+"""
+Имитация контроллера выгрузчика для проверки протокола регистров без робота.
+
+SimulatedUnloaderController — CellRobot с регистрами в памяти и "программой
+контроллера" в отдельном потоке: последовательная итерация (robot_regs_v1/v2)
+или цикл конвейера (robot_regs_v3) с временем движений pick_s / place_s.
+Каждый внешний вызов SDK стоит io_latency_s. Версию протокола программа
+сообщает в SR version_sr, как настоящая. corrupt_seq портит одну запись bank_seq —
+проверка обнаружения рассинхрона и перезапуска сеанса конвейера. trip_alarm()
+выставляет тревогу и останавливает программу, reset_errors() её снимает.
+
+__main__ гоняет UnloaderRobotThread против имитации в обоих режимах и печатает
+время цикла и простой робота в ожидании оркестратора, а для тревоги посреди
+движения — через сколько итерация прервана и работа продолжена после сброса.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import defaultdict
+
+from src.vision_guided_robot_navigation.devices import CellRobot
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.protocol import (
+    RegisterMapRegistry,
+    default_register_maps,
+)
+
+
+class SimulatedUnloaderController(CellRobot):
+    def __init__(
+        self,
+        version: str,
+        *,
+        registry: RegisterMapRegistry | None = None,
+        pick_s: float = 0.8,
+        place_s: float = 1.0,
+        io_latency_s: float = 0.004,
+        scan_s: float = 0.004,
+        corrupt_seq: int | None = None,
+        name: str = "sim",
+    ):
+        registry = registry or default_register_maps()
+        self.name = name
+        self.regs = registry.get("unloader", version)
+        self.pick_s = pick_s
+        self.place_s = place_s
+        self.io_latency_s = io_latency_s
+        self.scan_s = scan_s
+        self.corrupt_seq = corrupt_seq       # один раз исказить запись bank_seq с этим номером
+        self._bank_seq_nrs = {self.regs.nr[name] for name in self.regs.nr if name.startswith("bank_seq_")}
+
+        self.nr: defaultdict[int, float] = defaultdict(float)
+        self.sr: defaultdict[int, str] = defaultdict(str)
+        self.pr: dict[int, tuple[float, ...]] = {}
+        self.sr[registry.version_sr("unloader")] = version
+
+        self.placed_at: list[float] = []      # моменты установки пробирок
+        self.idle_s = 0.0                     # программа запущена, движений нет, ждёт оркестратор
+        self.bank_errors = 0
+        self.alarms: list[str] = []
+        self._connected = False
+        self._program: threading.Thread | None = None
+        self._program_stop = threading.Event()
+
+    # ---------- SDK ----------
+    def _io(self) -> None:
+        time.sleep(self.io_latency_s)
+
+    def connect(self) -> None:
+        self._connected = True
+
+    def disconnect(self) -> None:
+        self._connected = False
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def start_program(self, program_name: str) -> None:
+        self._io()
+        self.stop_all_running_programms()
+        self._program_stop.clear()
+        self._program = threading.Thread(target=self._run_program, daemon=True, name=f"{self.name}-program")
+        self._program.start()
+
+    def stop_program(self, program_name: str) -> None:
+        self.stop_all_running_programms()
+
+    def stop_all_running_programms(self) -> None:
+        self._program_stop.set()
+        if self._program is not None:
+            self._program.join()
+            self._program = None
+
+    def reset_errors(self) -> None:
+        self._io()
+        self.alarms.clear()
+
+    def get_all_active_alarms(self) -> list[str]:
+        self._io()
+        return list(self.alarms)
+
+    def trip_alarm(self, name: str) -> None:
+        """Тревога контроллера: программа останавливается посреди движения."""
+        self.alarms.append(name)
+        self.stop_all_running_programms()
+
+    def get_DI(self, di_id: int) -> bool:
+        self._io()
+        return False
+
+    def get_DO(self, do_id: int) -> bool:
+        self._io()
+        return False
+
+    def set_DO(self, do_id: int, value: bool) -> None:
+        self._io()
+
+    def get_string_register(self, register_id: int) -> str:
+        self._io()
+        return self.sr[register_id]
+
+    def set_string_register(self, register_id: int, value: str) -> None:
+        self._io()
+        self.sr[register_id] = value
+
+    def get_number_register(self, register_id: int) -> int | float:
+        self._io()
+        return self.nr[register_id]
+
+    def set_number_register(self, register_id: int, value: int | float) -> None:
+        self._io()
+        if register_id in self._bank_seq_nrs and value == self.corrupt_seq:
+            self.corrupt_seq = None
+            value += 2          # запись "уехала": в банке номер чужой команды
+        self.nr[register_id] = value
+
+    def set_pose_register(self, pr_id, x_val, y_val, z_val, a_val, b_val, c_val) -> None:
+        self._io()
+        self.pr[pr_id] = (x_val, y_val, z_val, a_val, b_val, c_val)
+
+    # ---------- программа контроллера ----------
+    def _wait(self, seconds: float) -> bool:
+        return not self._program_stop.wait(seconds)
+
+    def _idle(self) -> bool:
+        self.idle_s += self.scan_s
+        return self._wait(self.scan_s)
+
+    def _move(self) -> bool:
+        """Пик + установка; False — программу остановили."""
+        if not self._wait(self.pick_s):
+            return False
+        self._picked()
+        if not self._wait(self.place_s):
+            return False
+        self.placed_at.append(time.monotonic())
+        return True
+
+    def _picked(self) -> None:
+        pass
+
+    def _run_program(self) -> None:
+        nr, values, sr = self.regs.nr, self.regs.nr_values, self.regs.sr
+        starter = nr["iteration_starter"]
+        while not self._program_stop.is_set():
+            if self.nr[starter] != values["start"]:
+                self._wait(self.scan_s)
+                continue
+            if self.sr[sr["iteration_type"]] == self.regs.sr_values.get("pipelined"):
+                self._run_pipeline()
+            else:
+                self._run_iteration()
+
+    def _run_iteration(self) -> None:
+        nr, values = self.regs.nr, self.regs.nr_values
+        self._picked = lambda: self.nr.__setitem__(nr["grip_status"], values["grip_good"])
+        if not self._move():
+            return
+        self.nr[nr["grip_status"]] = values["grip_bad"]
+        self.nr[nr["iteration_starter"]] = values["end"]
+        # следующая команда — новый start от оркестратора
+        while self.nr[nr["iteration_starter"]] == values["end"]:
+            if not self._idle():
+                return
+
+    def _run_pipeline(self) -> None:
+        nr, values = self.regs.nr, self.regs.nr_values
+        starter = nr["iteration_starter"]
+        expected = 1
+        while self.nr[starter] == values["start"]:
+            bank_seq = self.nr[nr[f"bank_seq_{expected % 2}"]]
+            if bank_seq == expected - 2:
+                if not self._idle():
+                    return
+                continue
+            if bank_seq != expected:
+                # рассинхрон: сообщаем и ждём сброса от оркестратора, сами из цикла не выходим
+                self.bank_errors += 1
+                self.nr[nr["seq_error"]] = expected
+                while self.nr[starter] == values["start"]:
+                    if not self._idle():
+                        return
+                break
+            seq = expected
+            self._picked = lambda: self.nr.__setitem__(nr["seq_picked"], seq)
+            if not self._move():
+                return
+            self.nr[nr["seq_done"]] = seq
+            expected += 1
+        self.nr[starter] = values["end"]
+
+
+if __name__ == "__main__":
+    def main():
+        import dataclasses
+        import logging
+
+        from src.vision_guided_robot_navigation.config import load_unloader_config
+        from src.vision_guided_robot_navigation.domain import LoadingTripod
+        from src.vision_guided_robot_navigation.infrastructure.vision_client import TubeCoordinates
+        from src.vision_guided_robot_navigation.orchestration.runtime.alarms import AlarmMonitor
+        from src.vision_guided_robot_navigation.orchestration.runtime.robots.guard_policy import GuardPolicy
+        from src.vision_guided_robot_navigation.orchestration.runtime.robots.unloader_thread import UnloaderRobotThread
+
+        PICKS = 8
+        VISION_S = 0.25         # запрос vision по HTTP: кадр + инференс
+
+        class OneTripod:
+            def __init__(self, tripod):
+                self.tripod = tripod
+            def wait_for_available_tripod(self, timeout):
+                return self.tripod.name if self.tripod.availability else None
+
+        class SimVisionThread(UnloaderRobotThread):
+            def _detect_candidates(self, not_before=None):
+                time.sleep(VISION_S)
+                return [TubeCoordinates(300.0, 0.0, 60.0, 180.0, 0.0, 0.0)]
+
+        class AbortClock(logging.Handler):
+            """Момент первого прерывания итерации по тревоге."""
+            def __init__(self):
+                super().__init__(logging.WARNING)
+                self.at = None
+            def emit(self, record):
+                if self.at is None and "тревоги робота" in record.getMessage():
+                    self.at = time.monotonic()
+
+        logger = logging.getLogger("sim")
+        logger.propagate = False
+        scenarios = (
+            ("robot_regs_v2", None, False),
+            ("robot_regs_v3", None, False),
+            ("robot_regs_v3", 3, False),
+            ("robot_regs_v2", None, True),
+            ("robot_regs_v3", None, True),
+        )
+        for version, corrupt_seq, alarm in scenarios:
+            clock = AbortClock()
+            logger.handlers = [clock]
+            robot = SimulatedUnloaderController(version, corrupt_seq=corrupt_seq)
+            robot.connect()
+            tripod = LoadingTripod("1")
+            tripod.set_availability(True)
+            stop = threading.Event()
+            policy = GuardPolicy(logger)
+            monitor = AlarmMonitor(robot, stop, logger)
+            monitor.start()
+            thread = SimVisionThread(
+                robot,
+                dataclasses.replace(load_unloader_config(), protocol_version=version),
+                {"1": tripod},
+                OneTripod(tripod),
+                logger,
+                stop,
+                guard_policy=policy,
+                alarm_monitor=monitor,
+            )
+            thread.start()
+            tripped_at = None
+            while len(robot.placed_at) < PICKS and thread.is_alive():
+                if alarm and tripped_at is None and len(robot.placed_at) == 3:
+                    time.sleep(0.3)                 # посреди пика
+                    robot.trip_alarm("SRVO-050 Collision detected")
+                    tripped_at = time.monotonic()
+                    # оператор сбрасывает тревогу через 2 с
+                    threading.Timer(2.0, robot.reset_errors).start()
+                time.sleep(0.05)
+            idle_s = robot.idle_s
+            stop.set()
+            thread.join()
+            monitor.join()
+            robot.stop_all_running_programms()
+
+            if alarm:
+                resumed = robot.placed_at[3] - tripped_at
+                print(
+                    f"{version} (тревога посреди пика): итерация прервана через "
+                    f"{(clock.at - tripped_at) * 1e3:.0f} мс (опрос тревог {monitor.poll_s} с), "
+                    f"следующая пробирка через {resumed:.2f} с после тревоги (сброс оператором через 2 с), "
+                    f"пробирок в штативе {tripod.get_tubes()}"
+                )
+                continue
+
+            cycles = [b - a for a, b in zip(robot.placed_at, robot.placed_at[1:])]
+            cycle_s = sum(cycles) / len(cycles)
+            motion_s = robot.pick_s + robot.place_s
+            print(
+                f"{version} ({'конвейер' if thread.codec.pipelined else 'последовательно'}"
+                f"{', порча bank_seq 3' if corrupt_seq else ''}): "
+                f"цикл {cycle_s:.3f} с (движения {motion_s:.2f} с), "
+                f"простой робота {(cycle_s - motion_s) * 1e3:.0f} мс/цикл, idle-скан {idle_s:.2f} с, "
+                f"пробирок в штативе {tripod.get_tubes()}, рассинхронов {robot.bank_errors}"
+            )
+            print(f"    гард: {policy.as_dict()}")
+    main()
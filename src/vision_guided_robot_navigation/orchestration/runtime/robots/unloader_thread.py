@@ -2,27 +2,51 @@
 import time
 import logging
 import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Callable
+
+import requests
 
 from src.vision_guided_robot_navigation.orchestration.runtime.robots.base_robot_thread import (
     BaseRobotThread, 
     IterationContext, 
     GuardResult
 )
-from src.vision_guided_robot_navigation.devices import CellRobot
+from src.vision_guided_robot_navigation.devices import CellRobot, DeviceError
 from src.vision_guided_robot_navigation.config.unloader.config import UnloaderConfig
 from src.vision_guided_robot_navigation.orchestration.runtime.tripods import TripodAvailabilityProvider
-from src.vision_guided_robot_navigation.infrastructure.vision_client import VisionClient
+from src.vision_guided_robot_navigation.infrastructure.vision_client import VisionClient, TubeCoordinates
+from src.vision_guided_robot_navigation.calibration import CalibrationCache
+from src.vision_guided_robot_navigation.orchestration.runtime.planning import PickPlanner
+from src.vision_guided_robot_navigation.orchestration.runtime.backoff import Backoff
+from src.vision_guided_robot_navigation.orchestration.runtime.connection import ConnectionSupervisor
+from src.vision_guided_robot_navigation.orchestration.runtime.alarms import AlarmMonitor
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.errors import (
+    IterationAbort,
+    IterationStopped,
+    IterationTimeout,
+)
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.pipeline import InFlightCommand, UnloadPipeline
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.guard_policy import GuardPolicy
 from src.vision_guided_robot_navigation.orchestration.runtime.robots.protocol import (
-    UNLOADER_NR_NUMBERS,
-    UNLOADER_NR_VALUES,
-    UNLOADER_SR_NUMBERS,
-    UNLOADER_PR_NUMBERS,
-    UNLOADER_ITERATION_NAMES,
+    ProtocolError,
+    RegisterMap,
+    RegisterMapRegistry,
+    UnloaderCommand,
+    default_register_maps,
+    get_unloader_codec,
 )
 from src.vision_guided_robot_navigation.domain import (
     LoadingTripod, 
+    LayoutGeometry,
+    FixtureKind,
+    Pose,
 )
 
+if TYPE_CHECKING:
+    # websockets нужен только в потоковом режиме vision
+    from src.vision_guided_robot_navigation.infrastructure.vision_stream import StreamingVisionClient
+
 
 class UnloaderRobotThread(BaseRobotThread):
     """
@@ -32,25 +56,93 @@ class UnloaderRobotThread(BaseRobotThread):
     Пока stop_event не выставлен, поток крутит свой цикл.
     """
 
+    PIPELINE_POLL_S = 0.02      # опрос seq_picked / seq_done в конвейерном режиме
+
     def __init__(
         self,
         unloader_robot: CellRobot,
         unloader_cfg: UnloaderConfig,
-        unloader_tripods: dict[str, LoadingTripod],   # в эти штативы пробирки ставятся
+        unloader_tripods: Mapping[str, LoadingTripod],   # в эти штативы пробирки ставятся
         unloader_tripods_thread: TripodAvailabilityProvider,
         logger: logging.Logger,
         stop_event: threading.Event,
+        geometry: LayoutGeometry | None = None,
+        calibration: CalibrationCache | None = None,
+        planner: PickPlanner | None = None,
+        vision_stream: "StreamingVisionClient | None" = None,
+        connection: ConnectionSupervisor | None = None,
+        register_maps: RegisterMapRegistry | None = None,
+        guard_policy: GuardPolicy | None = None,
+        alarm_monitor: AlarmMonitor | None = None,
     ) -> None:
-        super().__init__(name="UnloaderRobotThread", daemon=True, stop_event=stop_event, logger=logger)
+        super().__init__(
+            name="UnloaderRobotThread",
+            daemon=True,
+            stop_event=stop_event,
+            logger=logger,
+            guard_policy=guard_policy,
+            alarm_monitor=alarm_monitor,
+        )
         self.unloader_robot = unloader_robot
         self.unloader_tripods = unloader_tripods
         self.unloader_tripods_thread = unloader_tripods_thread
         self.cfg = unloader_cfg
-        self.vision = VisionClient(base_url="http://127.0.0.1:8010", timeout_s=2.0)
+        self.geometry = geometry
+        self.calibration = calibration
+        self.planner = planner
+        self._last_place_pose: Pose | None = None     # где робот закончил прошлую итерацию
+        self.vision = VisionClient(
+            base_url=self.cfg.vision.base_url,
+            timeout_s=self.cfg.vision.timeout_s,
+            camera=self.cfg.vision.camera,
+            roi=self.cfg.vision.roi,
+        )
+        self.vision_stream = vision_stream
+        self._consumed_frame_id: int | None = None    # кадр, по которому уже взята пробирка
+        self.connection = connection
+        self._idle = False                            # нет доступных штативов (логируем только смену)
+        self._pipeline_active = False                 # программа контроллера в цикле конвейера / выходит из него
+        self._pipeline: UnloadPipeline | None = None  # последний сеанс: его итог забирается до сброса счётчиков
+
+        # Карта регистров: до связи с контроллером — настроенная версия, после — объявленная им
+        self.register_maps = register_maps or default_register_maps()
+        self._bind_protocol(self.register_maps.get("unloader", self.cfg.protocol_version))
+
+        # Версия протокола и регистры, которые контроллер должен получить после каждого (пере)подключения.
+        # Неизвестная контроллеру версия (ProtocolError) останавливает запуск здесь, до первой команды;
+        # после переподключения — завершает поток связи, и сторож останавливает ячейку.
+        if self.connection is not None:
+            self.connection.add_reprime(self._prime_registers)
+        if self.unloader_robot.is_connected():
+            try:
+                self._prime_registers()
+            except DeviceError as e:
+                if self.connection is None:
+                    raise
+                self.connection.report_error(e)
 
+    def _bind_protocol(self, registers: RegisterMap) -> None:
+        """Карта регистров + кодек + контекст сброса итерации; номера берутся из карты здесь, один раз."""
+        self.codec = get_unloader_codec(registers)
+        self.regs = registers
+        self.ctx = IterationContext(
+            robot=self.unloader_robot,
+            starter_nr=registers.nr["iteration_starter"],
+            starter_reset=registers.nr_values["reset"],
+        )
 
+    def _negotiate_protocol(self) -> None:
+        """Сверка версии протокола с программой контроллера (после каждого подключения)."""
+        registers = self.register_maps.negotiate(
+            self.unloader_robot, "unloader", preferred=self.cfg.protocol_version, logger=self.logger
+        )
+        if registers is not self.regs:
+            self._bind_protocol(registers)
+
+    def _prime_registers(self) -> None:
+        self._negotiate_protocol()
         self.unloader_robot.set_pose_register(
-            pr_id=9,
+            pr_id=self.regs.pr["zero_pose"],
             x_val=0,
             y_val=0,
             z_val=0,
@@ -59,6 +151,66 @@ class UnloaderRobotThread(BaseRobotThread):
             c_val=0,
         )
 
+    def _wait_for_connection(self) -> bool:
+        """
+        Ждёт восстановления связи и заново готовит робота (программа на контроллере
+        после обрыва остановлена). False — поток останавливается.
+        """
+        self.logger.warning("[Unloader] Нет связи с роботом, ожидание переподключения")
+        while not self.stop_event.is_set():
+            self.heartbeat.beat("wait_connection")
+            if not self.connection.wait_connected(timeout=1.0):
+                continue
+            try:
+                self.prepare_robot(robot=self.unloader_robot, program_name=self.cfg.robot_program_name)
+                self._pipeline_active = False       # программа перезапущена с начала
+            except DeviceError as e:
+                self.connection.report_error(e)
+                continue
+            self.logger.info("[Unloader] Связь восстановлена, работа продолжена")
+            return True
+        return False
+
+    def _wait_alarms_clear(self) -> bool:
+        """
+        Ждёт снятия блокирующих тревог (их сбрасывает оператор) и заново готовит робота:
+        программа контроллера после тревоги остановлена. False — поток останавливается.
+        """
+        self.logger.warning(
+            f"[Unloader] Блокирующие тревоги {', '.join(sorted(self.alarm_monitor.blocking_alarms))}, "
+            f"ожидание сброса"
+        )
+        while not self.stop_event.is_set():
+            self.heartbeat.beat("wait_alarms")
+            if not self.alarm_monitor.wait_clear(timeout=1.0):
+                continue
+            try:
+                self.prepare_robot(robot=self.unloader_robot, program_name=self.cfg.robot_program_name)
+                self._pipeline_active = False       # программа перезапущена с начала
+            except DeviceError as e:
+                if self.connection is None:
+                    raise
+                self.connection.report_error(e)
+                return self._wait_for_connection()
+            self.logger.info("[Unloader] Тревоги сняты, работа продолжена")
+            return True
+        return False
+
+    def _build_command(
+        self, tripod_name: str, tube_coordinates: dict[str, float], slot: int
+    ) -> tuple[UnloaderCommand, Pose | None]:
+        """Команда роботу; поза слота штатива берётся из предрассчитанной таблицы геометрии."""
+        place_pose = None
+        if self.geometry is not None:
+            place_pose = self.geometry.slot_pose(FixtureKind.LOADING_TRIPOD, tripod_name, slot)
+        command = UnloaderCommand(
+            tripod=int(tripod_name),
+            slot=slot,
+            tube_pose=tuple(tube_coordinates[axis] for axis in ("x", "y", "z", "a", "b", "c")),
+            place_pose=place_pose,
+        )
+        return command, place_pose
+
     def _iteration_unload(self, *, unloader_available_tripod: str | None, tube_coordinates: dict[str, float]) -> None:
         """
         Выполняет логику итерации выгрузки пробирок из
@@ -79,87 +231,63 @@ class UnloaderRobotThread(BaseRobotThread):
         }
         """
 
-        # 3.1. Назначаем роботу тип итерации
-        self.logger.info("\n ====UNLOAD ITERATION====\n")
-        self.unloader_robot.set_string_register(UNLOADER_SR_NUMBERS.iteration_type, UNLOADER_ITERATION_NAMES.unloading)
-
-        # 3.2 Записываем роботу координаты пробирки в свале
-        self.unloader_robot.set_pose_register(
-            pr_id=UNLOADER_PR_NUMBERS.tube_dump,
-            x_val=tube_coordinates["x"],
-            y_val=tube_coordinates["y"],
-            z_val=tube_coordinates["z"],
-            a_val=tube_coordinates["a"],
-            b_val=tube_coordinates["b"],
-            c_val=tube_coordinates["c"],
-        )
-
-        data_str = (
-            f"{tube_coordinates['x']:08.3f} "
-            f"{tube_coordinates['y']:08.3f} "
-            f"{tube_coordinates['z']:08.3f} "
-            f"{tube_coordinates['a']:08.3f} "
-            f"{tube_coordinates['b']:08.3f} "
-            f"{tube_coordinates['c']:08.3f}"
-        )
+        nr, values, iteration = self.regs.nr, self.regs.nr_values, self.regs.sr_values["unloading"]
 
-        # 3.3. Определяем оставшиеся точки назначения робота
-        print(unloader_available_tripod)
+        # 3.1. Определяем точки назначения робота
+        self.logger.info("\n ====UNLOAD ITERATION====\n")
         tripod_number = int(unloader_available_tripod)
         tripod_place_number = self.unloader_tripods[unloader_available_tripod].get_tubes()
-        data_str = (                                                                            # Формируем пакет данных в виде строки роботу
-            f"{tripod_number:02d} "
-            f"{tripod_place_number:02d} "
-            f"{tube_coordinates['x']:07.3f} "
-            f"{tube_coordinates['y']:07.3f} "
-            f"{tube_coordinates['z']:07.3f} "
-            f"{tube_coordinates['a']:07.3f} "
-            f"{tube_coordinates['b']:07.3f} "
-            f"{tube_coordinates['c']:07.3f}"
-        )
-        self.unloader_robot.set_string_register(UNLOADER_SR_NUMBERS.unloader_data, data_str)     # Отправляем роботу строку с данными
+        command, place_pose = self._build_command(unloader_available_tripod, tube_coordinates, tripod_place_number)
+
+        # 3.2 Кодируем команду до первой записи: не помещающиеся в протокол значения не доходят до робота
+        # (кандидаты уже отобраны _next_target — здесь это страховка)
+        try:
+            writes = self.codec.encode(command)
+        except ProtocolError as e:
+            raise IterationAbort(f"Команда не кодируется в {self.codec.version}: {e}") from e
+
+        # 3.3. Назначаем роботу тип итерации и отправляем данные (PR одной пачкой, неизменившиеся пропускаются)
+        self.unloader_robot.set_string_register(self.regs.sr["iteration_type"], iteration)
+        writes.apply(self.unloader_robot)
 
         try:
             # 3.4. Стартуем итерацию после отправки всех данных роботу
-            self.unloader_robot.set_number_register(UNLOADER_NR_NUMBERS.iteration_starter, UNLOADER_NR_VALUES.start)
-            self.logger.info(f"Отдана команда на исполнение итерации {UNLOADER_ITERATION_NAMES.unloading}!") 
+            self.unloader_robot.set_number_register(nr["iteration_starter"], values["start"])
+            self.logger.info(f"Отдана команда на исполнение итерации {iteration}!") 
 
             # 3.5. Ждем пока робот физически уберет пробирку из рэка
-            # while not self.unloader_robot.get_number_register(UNLOADER_NR_NUMBERS.grip_status) == UNLOADER_NR_VALUES.grip_good:
+            # while not self.unloader_robot.get_number_register(nr["grip_status"]) == values["grip_good"]:
             #     self.logger.info(f"Ожидание извлечения пробирки из свала...") 
             #     time.sleep(0.5)
 
 
             self.logger.info(f"Ожидание извлечения пробирки из свала...") 
-            self.wait_until(
-                lambda: self.unloader_robot.get_number_register(
-                    UNLOADER_NR_NUMBERS.grip_status
-                ) == UNLOADER_NR_VALUES.grip_good,
-                timeout=600.0,
+            self.wait_phase(
+                "pick",
+                lambda: self.unloader_robot.get_number_register(nr["grip_status"]) == values["grip_good"],
+                robot=self.unloader_robot,
                 reason="Ожидание grip_status == grip_good"
             )
 
             # 3.6. Ждем пока робот физически поставит пробирку в трипод
             self.logger.info(f"Ожидание установки пробирки в штатив...")
-            self.wait_until(
-                lambda: self.unloader_robot.get_number_register(
-                    UNLOADER_NR_NUMBERS.grip_status
-                )
-                == UNLOADER_NR_VALUES.grip_bad,
-                timeout=600.0,
+            self.wait_phase(
+                "place",
+                lambda: self.unloader_robot.get_number_register(nr["grip_status"]) == values["grip_bad"],
+                robot=self.unloader_robot,
                 reason="Ожидание grip_status == grip_bad"
             )
             self.logger.info(f"Пробирка успешно установлена в штатив {tripod_number} в позицию {tripod_place_number}")
             self.unloader_tripods[unloader_available_tripod].place_tube() # Устанавливаем пробирку в трипод
+            if self.geometry is not None:
+                self._last_place_pose = place_pose
 
             # 3.7. Ждем инофрмации о завершении итерации роботом
             self.logger.info(f"Ожидание команды на завершение итерации...")
-            self.wait_until(
-                lambda: self.unloader_robot.get_number_register(
-                    UNLOADER_NR_NUMBERS.iteration_starter
-                )
-                == UNLOADER_NR_VALUES.end,
-                timeout=600.0,
+            self.wait_phase(
+                "finish",
+                lambda: self.unloader_robot.get_number_register(nr["iteration_starter"]) == values["end"],
+                robot=self.unloader_robot,
                 reason="Ожидание iteration_starter == end"
             )
             self.logger.info(f"Команда на завершение итерации получена!")
@@ -171,52 +299,278 @@ class UnloaderRobotThread(BaseRobotThread):
 
 
 
+    def _detect_candidates(self, not_before: float | None = None) -> list[TubeCoordinates]:
+        """
+        Кандидаты из vision. В потоковом режиме — из кэша последней детекции по кадру,
+        снятому после прошлого пика (и не раньше not_before — момента, когда пробирку
+        забрали из свала); иначе — запрос на каждый пик.
+        Сбой vision — это пустой свал (ждём с паузой empty_backoff), а не ошибка связи с роботом.
+        """
+        if self.vision_stream is None:
+            # TEST: берём тестовый кадр с диска (положи файл в repo/test_data/frame.jpg)
+            try:
+                return self.vision.predict_candidates_from_file("test_data/frame.jpg")
+            except (requests.RequestException, OSError, ValueError) as e:
+                self.logger.warning(f"[Unloader] Vision недоступен: {type(e).__name__}: {e}")
+                return []
+
+        deadline = time.monotonic() + self.cfg.vision.max_result_age_s
+        while True:
+            remaining = deadline - time.monotonic()
+            detection = self.vision_stream.wait_for_newer(self._consumed_frame_id, timeout=max(0.0, remaining))
+            if detection is None or detection.age_s > self.cfg.vision.max_result_age_s:
+                self.logger.warning("Нет свежей детекции от потокового vision")
+                return []
+            self._consumed_frame_id = detection.frame_id
+            if not_before is None or detection.sent_at >= not_before:
+                return detection.candidates
+
+    def _next_target(
+        self,
+        empty_backoff: Backoff,
+        reserved: Callable[[str], int] | None = None,
+        not_before: float | None = None,
+    ) -> tuple[str, dict[str, float], int] | None:
+        """
+        Следующая пара (штатив, пробирка, слот) или None, если сейчас брать нечего.
+        reserved(tripod) — слоты штатива, уже отданные командам в полёте (конвейер).
+        """
+        reserved = reserved or (lambda name: 0)
+
+        # 1. Ждём свободный штатив: без места для пробирки vision и контроллер не нужны
+        tripod_name = self.unloader_tripods_thread.wait_for_available_tripod(timeout=0.5)
+        if tripod_name is None:
+            if not self._idle:
+                self.logger.info("[Unloader] Нет доступных штативов, ожидание")
+                self._idle = True
+            return None
+        if self._idle:
+            self.logger.info(f"[Unloader] Штатив {tripod_name} доступен, работа продолжена")
+            self._idle = False
+
+        tripod = self.unloader_tripods[tripod_name]
+        if tripod.get_tubes() + reserved(tripod_name) >= tripod.MAX_TUBES:
+            # оставшиеся слоты уже заняты командами в полёте — ждём их завершения
+            self.stop_event.wait(0.05)
+            return None
+
+        candidates = self._detect_candidates(not_before)
+        if self.calibration is not None and candidates:
+            candidates = self.calibration.apply_to_coordinates(candidates)   # СК камеры -> база робота
+        slot = tripod.get_tubes() + reserved(tripod_name)
+        # Не кодируемый в протокол кандидат отбрасывается здесь, вне итерации: иначе он
+        # остаётся лучшим в следующем кадре и ячейка встаёт на одной пробирке
+        candidates = [c for c in candidates if self._encodable(tripod_name, c.as_dict(), slot)]
+        if not candidates:
+            self.stop_event.wait(empty_backoff.next_delay())
+            return None
+        empty_backoff.reset()
+        tube_coordinates = candidates[0].as_dict()
+
+        # 2. Планировщик выбирает пару кандидат/штатив с минимальной оценкой времени цикла
+        if self.planner is not None:
+            open_slots = {
+                name: slots[reserved(name):]
+                for name, slots in self.planner.open_slots(self.unloader_tripods).items()
+            }
+            plan = self.planner.plan(candidates, open_slots, start=self._last_place_pose, max_steps=1)
+            if plan and self._encodable(plan[0].place.tripod_name, plan[0].candidate.as_dict(), plan[0].place.slot):
+                tripod_name = plan[0].place.tripod_name
+                tube_coordinates = plan[0].candidate.as_dict()
+                slot = plan[0].place.slot
+        return tripod_name, tube_coordinates, slot
+
+    def _encodable(self, tripod_name: str, tube_coordinates: dict[str, float], slot: int) -> bool:
+        """Команда помещается в протокол контроллера; номер seq (v3) на это не влияет."""
+        command, _ = self._build_command(tripod_name, tube_coordinates, slot)
+        try:
+            self.codec.encode(command)
+        except ProtocolError as e:
+            self.logger.warning(f"[Unloader] Кандидат пропущен: команда не кодируется в {self.codec.version}: {e}")
+            return False
+        return True
+
+    def _guarded(self, name: str, fn: Callable[[], object]) -> GuardResult:
+        """
+        _execute_with_guard + автомат защиты политики + обрыв связи (ждём супервизор,
+        итерация начинается заново) + блокирующие тревоги (ждём их сброса).
+        """
+        if self.alarm_monitor is not None and self.alarm_monitor.has_blocking:
+            # пока тревога не снята, итерация прервётся на первом же ожидании
+            return GuardResult.SKIP if self._wait_alarms_clear() else GuardResult.STOP
+        policy = self.guard_policy
+        if policy is not None and not policy.allow(name):
+            self.heartbeat.beat("breaker_open")
+            self.stop_event.wait(min(1.0, policy.breaker(name).remaining_s()))
+            return GuardResult.SKIP
+        try:
+            status, _ = self._execute_with_guard(name=name, ctx=self.ctx, fn=fn)
+            if policy is not None and status != GuardResult.STOP and not self.stop_event.is_set():
+                policy.record_result(name, ok=status == GuardResult.OK)
+            return status
+        except DeviceError as e:
+            if self.connection is None:
+                raise
+            self.logger.error(f"{name}: ошибка связи с роботом: {e}")
+            self.connection.report_error(e)
+            return GuardResult.SKIP if self._wait_for_connection() else GuardResult.STOP
+
+    def _place_done(self, command: InFlightCommand) -> None:
+        self.unloader_tripods[command.tripod_name].place_tube()
+        if self.geometry is not None:
+            self._last_place_pose = command.place_pose
+        self.logger.info(
+            f"Пробирка seq {command.seq} установлена в штатив {command.tripod_name} в позицию {command.slot}"
+        )
+
+    def _settle_pipeline(self, pipeline: UnloadPipeline) -> None:
+        """
+        Прерванный сеанс: пробирки, поставленные контроллером во время выхода из цикла,
+        учитываются в штативах до reset() нового сеанса, иначе их слот выдадут повторно.
+        """
+        placed, lost = pipeline.settle()
+        for command in placed:
+            self._place_done(command)
+        for command in lost:
+            self.logger.warning(
+                f"Команда seq {command.seq} (штатив {command.tripod_name}, позиция {command.slot}) "
+                f"не завершена до выхода из конвейера"
+            )
+
+    def _run_pipeline(self, empty_backoff: Backoff) -> None:
+        """
+        Сеанс конвейерного режима (robot_regs_v3): команды идут в два банка, контроллер
+        берёт следующую, не дожидаясь оркестратора. Возврат — только по stop_event
+        или исключению (рассинхрон -> IterationAbort, завис -> IterationTimeout).
+        """
+        iteration = self.regs.sr_values["pipelined"]
+        starter, values = self.regs.nr["iteration_starter"], self.regs.nr_values
+        if self._pipeline_active:
+            # прошлый сеанс прерван: контроллер доводит текущее движение и выходит из цикла с end
+            self.wait_phase(
+                "pipeline_exit",
+                lambda: self.unloader_robot.get_number_register(starter) == values["end"],
+                robot=self.unloader_robot,
+                poll=self.PIPELINE_POLL_S,
+                reason="Ожидание выхода контроллера из конвейера (iteration_starter == end)",
+            )
+        if self._pipeline is not None:
+            self._settle_pipeline(self._pipeline)
+        pipeline = self._pipeline = UnloadPipeline(self.unloader_robot, self.codec, self.regs, self.logger)
+        pipeline.reset()
+        self._pipeline_active = True
+        self.unloader_robot.set_string_register(self.regs.sr["iteration_type"], iteration)
+        self.unloader_robot.set_number_register(starter, values["start"])
+        self.logger.info(f"Отдана команда на исполнение итерации {iteration}!")
+
+        # Фаза "pipeline_step" — от события к событию (pick / done), пока в полёте есть команды
+        progress_at = window_at = time.monotonic()
+        attempt = 0
+        placed_any = False
+
+        while not self.stop_event.is_set():
+            self.heartbeat.beat("pipeline")
+            self.check_alarms(iteration)
+            try:
+                picked, done, error_seq = pipeline.poll()
+            except ProtocolError as e:
+                raise IterationAbort(str(e)) from e
+            now = time.monotonic()
+            if picked or done:
+                if self.guard_policy is not None:
+                    self.guard_policy.record("pipeline_step", now - progress_at)
+                progress_at = window_at = now
+                attempt = 0
+            for command in done:
+                self._place_done(command)
+            if done and not placed_any:
+                # сеанс всегда кончается SKIP/STOP: автомат защиты считает неудачами
+                # только сеансы, не поставившие ни одной пробирки
+                placed_any = True
+                if self.guard_policy is not None:
+                    self.guard_policy.record_result(iteration, ok=True)
+            if error_seq:
+                # поставленные до рассинхрона пробирки уже учтены выше
+                raise IterationAbort(f"Контроллер сообщил рассинхрон банка на seq {error_seq}")
+            if self.guard_policy is None:
+                if pipeline.oldest_age_s() > 600.0:
+                    raise IterationTimeout(f"Команда seq {pipeline.inflight[0].seq} не завершена за 600 с")
+            elif pipeline.inflight and now - window_at > self.guard_policy.deadline("pipeline_step"):
+                self.guard_policy.on_timeout("pipeline_step", attempt, self.unloader_robot, waited_s=now - progress_at)
+                attempt += 1
+                window_at = now
+
+            if not pipeline.can_post():
+                self.stop_event.wait(self.PIPELINE_POLL_S)
+                continue
+            target = self._next_target(empty_backoff, reserved=pipeline.reserved, not_before=pipeline.last_picked_at)
+            if target is None:
+                continue
+            tripod_name, tube_coordinates, slot = target
+            command, place_pose = self._build_command(tripod_name, tube_coordinates, slot)
+            if not pipeline.inflight:
+                progress_at = window_at = time.monotonic()      # робот ждал команду — это не его фаза
+                attempt = 0
+            try:
+                seq = pipeline.post(command, tripod_name, place_pose)
+            except ProtocolError as e:
+                # страховка: кандидаты уже отобраны _next_target, конвейер продолжает работу
+                self.logger.warning(f"{iteration}: команда не кодируется в {self.codec.version}: {e}")
+                continue
+            self.logger.info(f"{iteration}: seq {seq} -> штатив {tripod_name}, позиция {slot}")
+        raise IterationStopped("Остановка конвейера по stop_event")
+
     def run(self) -> None:
         self.logger.info("[Unloader] Поток запущен")
 
-        # 0.1 Подготовка контекста
-        ctx = IterationContext(
-            robot=self.unloader_robot,
-            starter_nr=UNLOADER_NR_NUMBERS.iteration_starter,
-            starter_reset=UNLOADER_NR_VALUES.reset,
-        )
+        # 0.1 Контекст сброса итерации (self.ctx) собирается в _bind_protocol по карте регистров
 
-        # 0.2 Подготовка робота
-        self.prepare_robot(
-            robot=self.unloader_robot, 
-            program_name=self.cfg.robot_program_name
-        )
+        # 0.2 Пустой свал: повторный запрос vision с растущей паузой, а не каждые 100 мс
+        empty_backoff = Backoff(self.cfg.vision.empty_backoff_s, self.cfg.vision.empty_backoff_max_s)
 
         try:
+            # 0.3 Подготовка робота
+            self.heartbeat.enter("prepare")
+            if self.connection is not None and not self.connection.is_up:
+                if not self._wait_for_connection():
+                    return
+            else:
+                self.prepare_robot(
+                    robot=self.unloader_robot, 
+                    program_name=self.cfg.robot_program_name
+                )
+
             while not self.stop_event.is_set():
-                # 1. Определяем основные параемтры для определения типа итерации                                                 
-                unloader_available_tripod = self.unloader_tripods_thread.get_available_tripod_name()    # Нахождение доступного трипода
-                # TEST: берём тестовый кадр с диска (положи файл в repo/test_data/frame.jpg)
-                result = self.vision.predict_from_file("test_data/frame.jpg")
-                tube_coordinates = result.as_dict() if result else None
+                # Конвейер (robot_regs_v3): один долгий сеанс, после сбоя — новый сеанс с seq 1
+                if self.codec.pipelined:
+                    status = self._guarded(
+                        self.regs.sr_values["pipelined"], lambda: self._run_pipeline(empty_backoff)
+                    )
+                    if status == GuardResult.STOP:
+                        return
+                    continue
 
-                if tube_coordinates:
-                    current_iteration_type = UNLOADER_ITERATION_NAMES.unloading
-                else:
-                    current_iteration_type = UNLOADER_ITERATION_NAMES.none
+                self.heartbeat.beat("select")
+                target = self._next_target(empty_backoff)
+                if target is None:
+                    continue
+                unloader_available_tripod, tube_coordinates, _ = target
 
                 # 3. Логика итерации опустошения свала пробирок
-                if current_iteration_type == UNLOADER_ITERATION_NAMES.unloading:
-                    status, _ = self._execute_with_guard(
-                        name=UNLOADER_ITERATION_NAMES.unloading,
-                        ctx=ctx,
-                        fn=lambda: self._iteration_unload(
-                            unloader_available_tripod=unloader_available_tripod,
-                            tube_coordinates=tube_coordinates
-                        )
+                status = self._guarded(
+                    self.regs.sr_values["unloading"],
+                    lambda: self._iteration_unload(
+                        unloader_available_tripod=unloader_available_tripod,
+                        tube_coordinates=tube_coordinates
                     )
-                    if status == GuardResult.STOP: 
-                        return
-                    if status == GuardResult.SKIP: 
-                        continue
-
-                #Время между иетрациями основного цикла
-                time.sleep(0.1)
+                )
+                if status == GuardResult.STOP: 
+                    return
 
         except Exception as e:
-            self.logger.fatal(f"Ошибка: {e}")
+            # поток завершается; Watchdog увидит это и пересоздаст его (или остановит ячейку)
+            self.failure = e
+            self.logger.critical(
+                f"[Unloader] Поток остановлен ошибкой в фазе '{self.heartbeat.phase}': {type(e).__name__}: {e}",
+                exc_info=True,
+            )
@@ -0,0 +1,161 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/signals.py
+"""
+Обработка дискретных входов пачкой.
+
+SignalConditioner принимает снимок всех входов (датчики штативов, присутствие рэков)
+одним булевым массивом и за один проход NumPy применяет:
+- debounce: новое состояние принимается, если сырой сигнал держится rise_s / fall_s
+  с момента своего последнего фронта;
+- min_hold_s: после принятого переключения выход не меняется хотя бы это время;
+- выделение фронтов: наружу отдаются только события SignalEdge.
+
+Стоимость тика не зависит от числа входов в Python-коде — ветвления только по
+входам, на которых фронт действительно произошёл.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SignalEdge:
+    name: str
+    rising: bool            # True: 0 -> 1, False: 1 -> 0
+    at: float               # время тика, на котором фронт принят
+
+
+class SignalConditioner:
+    """
+    names       — имена входов, порядок = порядок элементов снимка
+    rise_s      — сколько сырой 1 должен держаться до принятия (скаляр или на каждый вход)
+    fall_s      — то же для 0; 0 = сброс мгновенно
+    min_hold_s  — минимальное время между принятыми переключениями одного входа
+    initial     — состояние выходов до первого тика
+    arm_on_start— True: расхождение сырого сигнала с initial на первом тике уже
+                  запускает отсчёт; False: отсчёт идёт только от фронта, увиденного
+                  после старта (например, штатив, стоявший при запуске, надо переставить)
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        *,
+        rise_s: float | Sequence[float] = 0.0,
+        fall_s: float | Sequence[float] = 0.0,
+        min_hold_s: float | Sequence[float] = 0.0,
+        initial: bool = False,
+        arm_on_start: bool = True,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.names = list(names)
+        n = len(self.names)
+        self.rise_s = np.broadcast_to(np.asarray(rise_s, dtype=np.float64), (n,)).copy()
+        self.fall_s = np.broadcast_to(np.asarray(fall_s, dtype=np.float64), (n,)).copy()
+        self.min_hold_s = np.broadcast_to(np.asarray(min_hold_s, dtype=np.float64), (n,)).copy()
+        self.arm_on_start = arm_on_start
+        self._clock = clock
+
+        self.state = np.full(n, initial, dtype=bool)        # принятое (отфильтрованное) состояние
+        self._last_raw: np.ndarray | None = None
+        self._raw_since = np.full(n, np.nan)                # время последнего фронта сырого сигнала
+        self._state_since = np.full(n, -np.inf)             # время последнего принятого переключения
+        self._pending = False                               # есть входы, ждущие debounce / min_hold
+        self.ticks = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def update(self, raw: Sequence[bool] | np.ndarray, now: float | None = None) -> list[SignalEdge]:
+        """Один тик: снимок всех входов -> принятые фронты."""
+        now = self._clock() if now is None else now
+        raw = np.asarray(raw, dtype=bool)
+        if raw.shape != self.state.shape:
+            raise ValueError(f"SignalConditioner: снимок {raw.shape}, ожидалось {self.state.shape}")
+
+        self.ticks += 1
+        if self._last_raw is None:
+            if self.arm_on_start:
+                self._raw_since[:] = now
+        else:
+            # типичный тик: ничего не изменилось и ничего не ждёт debounce
+            if not self._pending and np.array_equal(raw, self._last_raw):
+                return []
+            self._raw_since[raw != self._last_raw] = now
+        self._last_raw = raw
+
+        hold = np.where(raw, self.rise_s, self.fall_s)
+        armed = (raw != self.state) & ~np.isnan(self._raw_since)     # расходятся и отсчёт идёт
+        flip = (
+            armed
+            & (now - self._raw_since >= hold)
+            & (now - self._state_since >= self.min_hold_s)
+        )
+        self._pending = bool(armed.any())
+        if not flip.any():
+            return []
+
+        self.state[flip] = raw[flip]
+        self._state_since[flip] = now
+        self._pending = bool((armed & ~flip).any())
+        return [SignalEdge(self.names[i], bool(raw[i]), now) for i in np.flatnonzero(flip)]
+
+    def as_dict(self) -> dict[str, bool]:
+        return dict(zip(self.names, self.state.tolist()))
+
+
+if __name__ == "__main__":
+    def main():
+        """Сравнение с прежней обработкой по входу (словари + ветвление на каждый вход)."""
+        from time import perf_counter
+
+        def legacy_tick(raw, now, last_state, stable_since, state, debounce_s):
+            for i, value in enumerate(raw):
+                prev = last_state[i]
+                if prev is None:
+                    last_state[i] = value
+                    continue
+                if not value:
+                    state[i] = False
+                    stable_since[i] = None
+                    last_state[i] = value
+                    continue
+                if prev is False:
+                    stable_since[i] = now
+                elif stable_since[i] is not None and now - stable_since[i] >= debounce_s and not state[i]:
+                    state[i] = True
+                last_state[i] = value
+
+        rng = np.random.default_rng(0)
+        ticks = 2000
+        for scenario in ("дребезг", "стабильно"):
+            print(f"--- {scenario}")
+            for n in (4, 64, 1024):
+                if scenario == "дребезг":
+                    snapshots = rng.random((ticks, n)) < 0.98            # редкие провалы сигнала
+                    snapshots[:, : n // 2] = rng.random((ticks, n // 2)) < 0.5
+                else:
+                    snapshots = np.repeat(rng.random((1, n)) < 0.5, ticks, axis=0)
+                raw_lists = snapshots.tolist()
+
+                last_state, stable_since, state = [None] * n, [None] * n, [False] * n
+                st = perf_counter()
+                for t, raw in enumerate(raw_lists):
+                    legacy_tick(raw, t * 0.1, last_state, stable_since, state, 2.0)
+                legacy_us = (perf_counter() - st) / ticks * 1e6
+
+                conditioner = SignalConditioner([str(i) for i in range(n)], rise_s=2.0, arm_on_start=False)
+                edges = 0
+                st = perf_counter()
+                for t, raw in enumerate(snapshots):
+                    edges += len(conditioner.update(raw, now=t * 0.1))
+                engine_us = (perf_counter() - st) / ticks * 1e6
+
+                print(
+                    f"{n:5d} входов: по входу {legacy_us:8.1f} us/тик, пачкой {engine_us:6.1f} us/тик, "
+                    f"фронтов {edges / ticks:5.2f}/тик, совпадение состояний {state == conditioner.state.tolist()}"
+                )
+    main()
@@ -1,11 +1,38 @@
 # src/vision_guided_robot_navigation/orchestration/runtime/tripods/__init__.py
 from .interfaces import TripodAvailabilityProvider
+from .registry import TripodRegistry, as_registry
+from .capacity import TripodCapacitySignal
+from .policies import (
+    TripodSelectionPolicy,
+    FirstAvailablePolicy,
+    StickyPolicy,
+    FillFirstPolicy,
+    RoundRobinPolicy,
+    NearestToDumpPolicy,
+    TRIPOD_POLICIES,
+    make_tripod_policy,
+)
 from .monitor import TripodMonitor
 from .refresher import TripodRefresher
 
 __all__ = [
     # Inrterfaces
     "TripodAvailabilityProvider",
+    "TripodCapacitySignal",
+
+    # Registry
+    "TripodRegistry",
+    "as_registry",
+
+    # Policies
+    "TripodSelectionPolicy",
+    "FirstAvailablePolicy",
+    "StickyPolicy",
+    "FillFirstPolicy",
+    "RoundRobinPolicy",
+    "NearestToDumpPolicy",
+    "TRIPOD_POLICIES",
+    "make_tripod_policy",
 
     # Refresher
     "TripodRefresher",
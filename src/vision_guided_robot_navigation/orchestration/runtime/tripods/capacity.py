@@ -0,0 +1,28 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/tripods/capacity.py
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.registry import TripodRegistry
+
+
+class TripodCapacitySignal(ABC):
+    """
+    Ожидание свободного трипода без опроса.
+
+    Штативы сами публикуют изменения в TripodRegistry, поток робота спит в
+    wait_for_available_tripod() до первого события, после которого политика
+    выбора наследника (get_available_tripod_name) возвращает трипод.
+    Класс-примесь: наследник хранит реестр в self.tripods и обязан реализовать
+    get_available_tripod_name — без неё экземпляр не создаётся.
+    """
+
+    tripods: TripodRegistry
+
+    @abstractmethod
+    def get_available_tripod_name(self) -> str | None:
+        """Политика выбора: имя доступного трипода или None."""
+
+    def wait_for_available_tripod(self, timeout: float | None = None) -> str | None:
+        """Имя доступного трипода, как только он появится; None — за timeout не появился."""
+        return self.tripods.wait_for_available(timeout, select=self.get_available_tripod_name)
@@ -6,6 +6,9 @@ class TripodAvailabilityProvider(Protocol):
     def get_available_tripod_name(self) -> str | None:
         ...
 
+    def wait_for_available_tripod(self, timeout: float | None = None) -> str | None:
+        ...
+
 class SensorReader(Protocol):
     def read(self, name: str) -> bool:
         ...
\ No newline at end of file
@@ -9,8 +9,12 @@ from typing import Dict
 from src.vision_guided_robot_navigation.domain import Tripod, SensorConfig, RobotRole
 from src.vision_guided_robot_navigation.devices import CellRobot
 from src.vision_guided_robot_navigation.orchestration.runtime import read_sensor
+from src.vision_guided_robot_navigation.orchestration.runtime.signals import SignalConditioner
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.capacity import TripodCapacitySignal
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.registry import TripodRegistry, as_registry
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.policies import TripodSelectionPolicy, StickyPolicy
 
-class TripodMonitor(threading.Thread):
+class TripodMonitor(TripodCapacitySignal, threading.Thread):
     """
     Поток мониторинга триподов.
 
@@ -21,128 +25,107 @@ class TripodMonitor(threading.Thread):
 
     def __init__(
         self,
-        tripods: Dict[str, Tripod],
+        tripods: Dict[str, Tripod] | TripodRegistry,
         tripod_sensors: Dict[str, SensorConfig],
         robots: Dict[RobotRole, CellRobot],
         logger: logging.Logger,
         stop_event: threading.Event,
         debounce_seconds: float = 2.0,
         poll_interval: float = 0.1,
+        policy: TripodSelectionPolicy | None = None,
     ):
         super().__init__(daemon=True)
-        self.tripods = tripods                  # ключ = имя трипода ("1", "2", ...)
+        self.tripods = as_registry(tripods, logger)     # ключ = имя трипода ("1", "2", ...)
         self.tripod_sensors = tripod_sensors    # ключ = то же имя трипода
         self.robots = robots
         self.logger = logger
         self.debounce_seconds = debounce_seconds
         self.poll_interval = poll_interval
-        self._selected_tripod: str | None = None # текущий "закреплённый" трипод
-
-        # Предыдущее состояние датчика: None = ещё не знаем
-        self._last_state: Dict[str, bool | None] = {
-            name: None for name in self.tripods.keys()
-        }
+        self.policy = (policy or StickyPolicy()).bind(self.tripods)    # по умолчанию "закреплённый" трипод
 
         self.stop_event = stop_event
 
-        # Время, с которого сигнал по триподам стабильно True
-        self._stable_since: Dict[str, float | None] = {
-            name: None for name in self.tripods.keys()
-        }
-
-    def _update_tripod_from_sensor(self, name: str, tripod: Tripod, sensor: SensorConfig) -> None:
-        raw_state = read_sensor(sensor, self.robots)  # True / False
-        prev_state = self._last_state[name]
-
-        # Первый запуск: просто запомнили состояние и ничего не делаем
-        if prev_state is None:
-            self._last_state[name] = raw_state
-            # Если хочешь, можно здесь сразу сбросить трипод,
-            # чтобы гарантировать "старт с нуля":
-            if raw_state is False:
-                tripod.set_tubes(Tripod.MIN_TUBES)
-                tripod.set_availability(False)
-            return
-
-        # -------- СИГНАЛ 0 (False) --------
-        if not raw_state:
-            # Моментальный сброс доступности
-            if tripod.availability or tripod.get_tubes() != Tripod.MIN_TUBES:
-                tripod.set_tubes(Tripod.MIN_TUBES)
-                tripod.set_availability(False)
-                self.logger.info(f"[{name}] Трипод недоступен (датчик False)")
-
-            # сбрасываем таймер устойчивого True
-            self._stable_since[name] = None
-
-            # если этот трипод был выбран — отжимаем
-            if self._selected_tripod == name:
-                self._selected_tripod = None
-
-            self._last_state[name] = raw_state
-            return
-
-        # -------- СИГНАЛ 1 (True) --------
-        now = time.perf_counter()
-
-        # Обнаружили переход 0 → 1: начинаем отсчёт debounce
-        if prev_state is False and raw_state is True:
-            self._stable_since[name] = now
-            self._last_state[name] = raw_state
-            return
-
-        # Если раньше не фиксировали 0→1 — игнорируем текущий True
-        if self._stable_since[name] is None:
-            self._last_state[name] = raw_state
-            return
-
-        # Проверяем, сколько времени держится True после перехода 0→1
-        if (now - self._stable_since[name]) >= self.debounce_seconds:
-            if not tripod.availability:
-                tripod.set_availability(True)
-                self.logger.info(
-                    f"[{name}] Трипод стал доступен после {self.debounce_seconds} с устойчивого сигнала (после перехода 0→1)"
-                )
-
-        self._last_state[name] = raw_state
+        # Все датчики обрабатываются одним снимком: debounce только на подъём,
+        # отсчёт — от перехода 0→1 после старта (стоявший при запуске трипод надо переставить)
+        self._sensor_names = [name for name in self.tripods if name in self.tripod_sensors]
+        self._signals = SignalConditioner(
+            self._sensor_names,
+            rise_s=debounce_seconds,
+            arm_on_start=False,
+            clock=time.perf_counter,
+        )
+        # Последнее прочитанное значение каждого датчика: не прочитанный в этом тике
+        # держит его (до первого удачного чтения — False, штатив недоступен)
+        self._last_raw = [False] * len(self._sensor_names)
+        self._failed_sensors: set[str] = set()
+
+    def _read_snapshot(self) -> list[bool]:
+        """
+        Состояния всех датчиков. Ошибка чтения одного датчика не останавливает остальные:
+        его канал держит прошлое значение, ошибка логируется на входе в сбой и выходе из него.
+        """
+        for i, name in enumerate(self._sensor_names):
+            try:
+                self._last_raw[i] = read_sensor(self.tripod_sensors[name], self.robots)  # True / False
+            except Exception as e:
+                if name not in self._failed_sensors:
+                    self._failed_sensors.add(name)
+                    self.logger.error(f"[{name}] Ошибка при чтении датчика трипода: {e}")
+                continue
+            if name in self._failed_sensors:
+                self._failed_sensors.discard(name)
+                self.logger.info(f"[{name}] Датчик трипода снова читается")
+        return list(self._last_raw)
+
+    def _reset_tripod(self, tripod: Tripod) -> None:
+        tripod.set_tubes(Tripod.MIN_TUBES)
+        tripod.set_availability(False)
+
+    def _update_tripods_from_sensors(self) -> None:
+        snapshot = self._read_snapshot()
+
+        # Первый снимок: триподы без сигнала сбрасываем, чтобы гарантировать "старт с нуля"
+        if self._signals.ticks == 0:
+            for name, raw_state in zip(self._sensor_names, snapshot):
+                if not raw_state:
+                    self._reset_tripod(self.tripods[name])
+            # стоявший при запуске штатив — принятая 1 без отсчёта: его снятие даёт спад и сброс,
+            # а доступным он станет только после перестановки (0→1)
+            self._signals.state[:] = snapshot
+
+        for edge in self._signals.update(snapshot):
+            tripod = self.tripods[edge.name]
+            try:
+                if not edge.rising:
+                    # -------- СИГНАЛ 0: моментальный сброс доступности --------
+                    if tripod.availability or tripod.get_tubes() != Tripod.MIN_TUBES:
+                        self._reset_tripod(tripod)
+                        self.logger.info(f"[{edge.name}] Трипод недоступен (датчик False)")
+                elif not tripod.availability:
+                    # -------- СИГНАЛ 1 держится >= debounce_seconds после перехода 0→1 --------
+                    tripod.set_availability(True)
+                    self.logger.info(
+                        f"[{edge.name}] Трипод стал доступен после {self.debounce_seconds} с устойчивого сигнала (после перехода 0→1)"
+                    )
+            except Exception as e:
+                self.logger.error(f"[{edge.name}] Ошибка при обновлении трипода: {e}")
 
     def run(self) -> None:
         """Основной цикл потока."""
         self.logger.info(f"Поток [{threading.current_thread().name}] запущен")
         try:
             while not self.stop_event.is_set():
-                for name, tripod in self.tripods.items():
-                    sensor = self.tripod_sensors.get(name)
-                    if sensor is None:
-                        continue  # нет датчика для этого трипода
-
-                    try:
-                        self._update_tripod_from_sensor(name, tripod, sensor)
-                    except Exception as e:
-                        self.logger.error(f"[{name}] Ошибка при обновлении трипода: {e}")
+                self._update_tripods_from_sensors()
 
-                time.sleep(self.poll_interval)
+                # Датчики опрашиваются (прерываний нет), но ожидающие штатив
+                # узнают об изменении из реестра сразу, а не через poll_interval
+                self.stop_event.wait(self.poll_interval)
         finally:
             self.logger.info(f"Поток [{threading.current_thread().name}] остановлен")
 
     def get_available_tripod_name(self) -> str | None:
         """
-        Возвращает "закреплённый" трипод, если он ещё доступен.
-        Если нет выбранного или выбранный стал недоступен — выбирает новый.
+        Возвращает трипод по политике выбора (по умолчанию — "закреплённый",
+        пока он доступен) или None, если доступных триподов нет.
         """
-        # 1) если уже есть выбранный и он всё ещё доступен — держимся за него
-        if self._selected_tripod is not None:
-            tripod = self.tripods.get(self._selected_tripod)
-            if tripod is not None and tripod.availability:
-                return self._selected_tripod
-            # если он пропал/стал недоступен — освобождаем
-            self._selected_tripod = None
-
-        # 2) ищем первый доступный трипод и закрепляем его
-        for name, tripod in self.tripods.items():
-            if tripod.availability:
-                self._selected_tripod = name
-                return name
-
-        # 3) вообще нет доступных триподов
-        return None
+        return self.policy.select()
@@ -0,0 +1,245 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/tripods/policies.py
+"""
+Политики выбора штатива для установки пробирок.
+
+Политика подписана на события TripodRegistry и держит выбранный штатив в кэше:
+get_available_tripod_name() на горячем пути — O(1), пересчёт только когда событие
+касается выбранного штатива или освободился штатив, а выбора нет.
+
+- first      — первый доступный в порядке имён (прежнее поведение TripodRefresher)
+- sticky     — держится за выбранный, пока он доступен (прежнее поведение TripodMonitor)
+- fill_first — самый заполненный из доступных: штативы заполняются по одному,
+               оператор меняет их по очереди, пока робот работает с остальными
+- round_robin— следующий доступный после каждой установки: заполнение равномерное
+- nearest    — ближайший к свалу (центр штатива по LayoutGeometry), затем следующий
+"""
+from __future__ import annotations
+
+import threading
+from typing import Mapping
+
+import numpy as np
+
+from src.vision_guided_robot_navigation.domain import (
+    FixtureKind,
+    LayoutGeometry,
+    Tripod,
+    TripodChange,
+)
+
+
+class TripodSelectionPolicy:
+    """Базовая политика: кэш выбора + множество доступных штативов, обновляемое событиями."""
+
+    name = "first"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._order: dict[str, int] = {}           # ранг штатива: меньше — предпочтительнее
+        self._available: set[str] = set()
+        self._tubes: dict[str, int | None] = {}
+        self._selected: str | None = None
+        self._dirty = True
+        self.recomputes = 0                          # сколько раз выбор пересчитывался
+
+    def bind(self, tripods: Mapping[str, Tripod]) -> "TripodSelectionPolicy":
+        """Снимок текущего состояния; дальше политика живёт на событиях (subscribe реестра)."""
+        with self._lock:
+            self._order = {name: i for i, name in enumerate(self._rank(list(tripods)))}
+            self._available = {name for name, t in tripods.items() if t.availability}
+            self._tubes = {name: t.get_tubes() for name, t in tripods.items()}
+            self._selected = None
+            self._dirty = True
+        if hasattr(tripods, "subscribe"):
+            tripods.subscribe(self.on_change)
+        return self
+
+    def _rank(self, names: list[str]) -> list[str]:
+        return names
+
+    def on_change(self, change: TripodChange) -> None:
+        with self._lock:
+            was_available = change.name in self._available
+            if change.availability:
+                self._available.add(change.name)
+            else:
+                self._available.discard(change.name)
+            self._tubes[change.name] = change.tubes
+            if self._invalidates(change, was_available):
+                self._dirty = True
+
+    def _invalidates(self, change: TripodChange, was_available: bool) -> bool:
+        """Нужно ли пересчитывать выбор после события."""
+        if change.name == self._selected:
+            return not change.availability
+        return self._selected is None or (change.availability and not was_available)
+
+    def _choose(self) -> str | None:
+        return min(self._available, key=self._order.__getitem__, default=None)
+
+    def select(self) -> str | None:
+        with self._lock:
+            if self._dirty:
+                self._selected = self._choose()
+                self._dirty = False
+                self.recomputes += 1
+            return self._selected
+
+
+class FirstAvailablePolicy(TripodSelectionPolicy):
+    name = "first"
+
+
+class StickyPolicy(TripodSelectionPolicy):
+    """Новый доступный штатив не перехватывает выбор, пока выбранный не закончится."""
+
+    name = "sticky"
+
+    def _invalidates(self, change: TripodChange, was_available: bool) -> bool:
+        if change.name == self._selected:
+            return not change.availability
+        return self._selected is None and change.availability
+
+
+class FillFirstPolicy(TripodSelectionPolicy):
+    """
+    Самый заполненный доступный штатив. Установка в выбранный только увеличивает
+    его заполнение, поэтому выбор пересчитывается лишь при появлении/пропаже штативов.
+    """
+
+    name = "fill_first"
+
+    def _choose(self) -> str | None:
+        return min(
+            self._available,
+            key=lambda name: (-(self._tubes.get(name) or 0), self._order[name]),
+            default=None,
+        )
+
+
+class RoundRobinPolicy(TripodSelectionPolicy):
+    """После каждой установки — следующий доступный штатив по кругу."""
+
+    name = "round_robin"
+
+    def _invalidates(self, change: TripodChange, was_available: bool) -> bool:
+        if change.name == self._selected:
+            return True
+        return self._selected is None
+
+    def _choose(self) -> str | None:
+        if not self._available:
+            return None
+        if self._selected is None:
+            return min(self._available, key=self._order.__getitem__)
+        current = self._order[self._selected]
+        return min(self._available, key=lambda name: (self._order[name] - current - 1) % len(self._order))
+
+
+class NearestToDumpPolicy(StickyPolicy):
+    """Sticky, но при пересчёте предпочитаются штативы ближе к свалу (короче путь pick -> place)."""
+
+    name = "nearest"
+
+    def __init__(self, geometry: LayoutGeometry):
+        super().__init__()
+        self.geometry = geometry
+
+    def _rank(self, names: list[str]) -> list[str]:
+        def distance(name: str) -> float:
+            center = self.geometry.fixture_table(FixtureKind.LOADING_TRIPOD, name)[:, 0:3].mean(axis=0)
+            return float(np.linalg.norm(center - self.geometry.dump_center))
+        return sorted(names, key=distance)
+
+
+TRIPOD_POLICIES: dict[str, type[TripodSelectionPolicy]] = {
+    policy.name: policy
+    for policy in (FirstAvailablePolicy, StickyPolicy, FillFirstPolicy, RoundRobinPolicy, NearestToDumpPolicy)
+}
+
+def make_tripod_policy(name: str, geometry: LayoutGeometry | None = None) -> TripodSelectionPolicy:
+    try:
+        policy_cls = TRIPOD_POLICIES[name]
+    except KeyError:
+        raise ValueError(f"Неизвестная политика выбора штатива '{name}', доступны: {', '.join(TRIPOD_POLICIES)}") from None
+    if policy_cls is NearestToDumpPolicy:
+        if geometry is None:
+            raise ValueError("Политика 'nearest' требует geometry в layout.yaml")
+        return NearestToDumpPolicy(geometry)
+    return policy_cls()
+
+
+if __name__ == "__main__":
+    def main():
+        """
+        Симуляция смены штативов оператором: робот ставит пробирку за cycle_s
+        (handling + путь свал -> слот), оператор приходит через response_s после
+        первого заполненного штатива и меняет все заполненные за один визит.
+        """
+        from time import perf_counter
+        from src.vision_guided_robot_navigation.config import load_system_layout_config
+        from src.vision_guided_robot_navigation.domain import LoadingTripod
+        from src.vision_guided_robot_navigation.orchestration.runtime.tripods.registry import TripodRegistry
+
+        geometry = LayoutGeometry(load_system_layout_config().geometry)
+        names = geometry.fixture_names(FixtureKind.LOADING_TRIPOD)
+        handling_s, speed_mm_s = 1.5, 500.0
+        hours = 8.0
+
+        def simulate(policy_name: str, response_s: float, seed: int = 0):
+            rng = np.random.default_rng(seed)
+            tripods = TripodRegistry({name: LoadingTripod(name) for name in names})
+            for tripod in tripods.values():
+                tripod.set_availability(True)
+            policy = make_tripod_policy(policy_name, geometry).bind(tripods)
+
+            now = idle = travel = 0.0
+            visits = swaps = picks = 0
+            operator_at: float | None = None
+            while now < hours * 3600:
+                if operator_at is not None and now >= operator_at:
+                    visits += 1
+                    for tripod in tripods.values():
+                        if not tripod.availability:
+                            tripod.set_availability(True)
+                            swaps += 1
+                    operator_at = None
+
+                name = policy.select()
+                if name is None:
+                    idle += operator_at - now          # робот ждёт оператора
+                    now = operator_at
+                    continue
+
+                tripod = tripods[name]
+                slot = geometry.slot_pose(FixtureKind.LOADING_TRIPOD, name, tripod.get_tubes())
+                distance = float(np.linalg.norm(np.asarray(slot[:3]) - geometry.dump_center)) * 2
+                travel += distance
+                now += handling_s + distance / speed_mm_s
+                tripod.place_tube()
+                picks += 1
+                if not tripod.availability and operator_at is None:
+                    operator_at = now + rng.exponential(response_s)
+
+            return visits / hours, swaps / hours, idle / hours / 60, picks / hours, travel / picks, policy.recomputes / picks
+
+        for response_s in (60.0, 300.0):
+            print(f"--- оператор приходит в среднем через {response_s:.0f} с, {len(names)} штатива x {Tripod.MAX_TUBES}")
+            for policy_name in TRIPOD_POLICIES:
+                visits, swaps, idle_min, picks, travel, recompute = simulate(policy_name, response_s)
+                print(
+                    f"{policy_name:<12} визитов {visits:5.1f}/ч, замен {swaps:5.1f}/ч, "
+                    f"простой {idle_min:5.1f} мин/ч, {picks:6.0f} пик/ч, путь {travel:6.1f} мм/пик, "
+                    f"пересчётов выбора {recompute * 100:5.1f} % вызовов"
+                )
+
+        tripods = TripodRegistry({name: LoadingTripod(name) for name in names})
+        for tripod in tripods.values():
+            tripod.set_availability(True)
+        for policy_name in TRIPOD_POLICIES:
+            policy = make_tripod_policy(policy_name, geometry).bind(tripods)
+            st = perf_counter()
+            for _ in range(100_000):
+                policy.select()
+            print(f"{(perf_counter()-st) / 100_000 * 1e6:.3f} us --- {policy_name}.select")
+    main()
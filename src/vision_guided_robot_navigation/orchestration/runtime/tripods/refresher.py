@@ -1,12 +1,15 @@
 # src/vision_guided_robot_navigation/orchestration/runtime/tripods/refresher.py
 import threading
-import time
 import logging
 from typing import Dict
 
 from src.vision_guided_robot_navigation.domain import Tripod, LoadingTripod, UnloadingTripod
+from src.vision_guided_robot_navigation.orchestration.runtime.watchdog import Heartbeat
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.capacity import TripodCapacitySignal
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.registry import TripodRegistry, as_registry
+from src.vision_guided_robot_navigation.orchestration.runtime.tripods.policies import TripodSelectionPolicy, FirstAvailablePolicy
 
-class TripodRefresher(threading.Thread):
+class TripodRefresher(TripodCapacitySignal, threading.Thread):
     """
     Поток обновления доступности триподов по команде оператора.
 
@@ -18,18 +21,21 @@ class TripodRefresher(threading.Thread):
     
     def __init__(
             self,
-            tripods: Dict[str, Tripod],
+            tripods: Dict[str, Tripod] | TripodRegistry,
             refresh_event:threading.Event,
             stop_event:threading.Event,
             logger: logging.Logger,
+            policy: TripodSelectionPolicy | None = None,
     ):
         super().__init__(daemon=True)
 
-        self.tripods = tripods
+        self.tripods = as_registry(tripods, logger)
+        self.policy = (policy or FirstAvailablePolicy()).bind(self.tripods)
         self.refresh_event = refresh_event
         self.stop_event = stop_event
         self._last_refresh_state = False
         self.logger = logger
+        self.heartbeat = Heartbeat("idle")      # виток на каждый цикл ожидания команды оператора
 
     def _refresh_tripod_availability(self):
         for name, tripod, in self.tripods.items():
@@ -40,7 +46,10 @@ class TripodRefresher(threading.Thread):
     def run(self) -> None:
         """Основной цикл потока."""
         while not self.stop_event.is_set():
-            if self.refresh_event.is_set():
+            self.heartbeat.beat("idle")
+            # Спим до команды оператора; timeout только чтобы заметить stop_event
+            if self.refresh_event.wait(timeout=0.5):
+                self.heartbeat.enter("refresh")
                 try:
                     first_tripod = next(iter(self.tripods.values()))
 
@@ -61,17 +70,13 @@ class TripodRefresher(threading.Thread):
                     self.logger.critical(f"Во время обновления доступности штативов произошла критическая ошибка {e}")
                 finally:
                     self.refresh_event.clear()
-            time.sleep(0.3)
 
     def get_available_tripod_name(self) -> str | None:
         """
-        Возвращает имя первого доступного трипода в системе 
-        или None, если такого трипода нет.
+        Возвращает имя доступного трипода по политике выбора
+        (по умолчанию первый доступный) или None, если такого трипода нет.
         """
-        for name, tripod in self.tripods.items():
-            if  tripod.availability:
-                return name
-        return None
+        return self.policy.select()
 
     def get_refresh_state(self) -> bool:
         """
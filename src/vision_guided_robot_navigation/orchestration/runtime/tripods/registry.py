@@ -0,0 +1,94 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/tripods/registry.py
+from __future__ import annotations
+
+import threading
+import logging
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator
+
+from src.vision_guided_robot_navigation.domain import Tripod, TripodChange, TripodListener
+
+
+class TripodRegistry(Mapping[str, Tripod]):
+    """
+    Наблюдаемый набор штативов.
+
+    Ведёт себя как Dict[str, Tripod] (только чтение), но подписан на каждый штатив:
+    любое set_availability / set_tubes / place_tube / grab_tube будит ожидающих
+    в wait_for_available() и вызывает колбэки подписчиков.
+    """
+
+    def __init__(self, tripods: Dict[str, Tripod], logger: logging.Logger | None = None):
+        self._tripods = dict(tripods)
+        self._changed = threading.Condition()
+        self._listeners: list[TripodListener] = []
+        self.version = 0        # растёт на каждое событие: "что-то поменялось с момента X?"
+        self.logger = logger
+
+        for tripod in self._tripods.values():
+            tripod.subscribe(self._on_change)
+
+    def __getitem__(self, name: str) -> Tripod:
+        return self._tripods[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._tripods)
+
+    def __len__(self) -> int:
+        return len(self._tripods)
+
+    def _on_change(self, change: TripodChange) -> None:
+        # колбэки вызываются вне блокировки и в потоке, изменившем штатив;
+        # до пробуждения ожидающих — чтобы политики выбора уже видели событие
+        for listener in list(self._listeners):
+            try:
+                listener(change)
+            except Exception as e:
+                if self.logger is not None:
+                    self.logger.error(f"[{change.name}] Ошибка в подписчике штативов: {e}")
+
+        with self._changed:
+            self.version += 1
+            self._changed.notify_all()
+
+    def subscribe(self, listener: TripodListener) -> Callable[[], None]:
+        """Подписка на изменения любого штатива. Возвращает функцию отписки."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def first_available(self) -> str | None:
+        for name, tripod in self._tripods.items():
+            if tripod.availability:
+                return name
+        return None
+
+    def wait_for_available(
+        self,
+        timeout: float | None = None,
+        select: Callable[[], str | None] | None = None,
+    ) -> str | None:
+        """
+        Блокирует до появления доступного штатива (или timeout).
+        select — своя политика выбора (по умолчанию первый доступный).
+        """
+        select = select or self.first_available
+        name: str | None = None
+
+        def available() -> bool:
+            nonlocal name
+            name = select()
+            return name is not None
+
+        with self._changed:
+            self._changed.wait_for(available, timeout)
+        return name
+
+    def wait_for_change(self, since_version: int, timeout: float | None = None) -> int:
+        """Ждёт любое событие после since_version. Возвращает текущую версию."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != since_version, timeout)
+            return self.version
+
+
+def as_registry(tripods: Dict[str, Tripod] | TripodRegistry, logger: logging.Logger | None = None) -> TripodRegistry:
+    return tripods if isinstance(tripods, TripodRegistry) else TripodRegistry(tripods, logger)
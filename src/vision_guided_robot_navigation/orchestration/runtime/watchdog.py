@@ -0,0 +1,307 @@
+# src/vision_guided_robot_navigation/orchestration/runtime/watchdog.py
+"""
+Сторож рабочих потоков.
+
+Поток публикует Heartbeat: beat() на каждом витке цикла / опросе ожидания и текущую
+фазу (enter). Watchdog раз в check_s проверяет каждый наблюдаемый поток:
+- поток завершился (исключение, выход из run) — перезапуск из factory(старый поток)
+  с растущей паузой (Backoff); если перезапускать нечем или поток падает снова и снова
+  (max_restarts подряд, каждый прожил меньше healthy_s) — failed, ячейка останавливается;
+- нет beat() дольше stall_s — зависание: в лог фаза, сколько в ней и стек потока
+  (перезапустить зависший поток нельзя — он всё ещё держит робота / сокет);
+- частота витков выше max_rate_hz — холостой цикл без ожидания.
+as_dict() — живость, фаза, частота витков и счётчики по каждому потоку.
+"""
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.vision_guided_robot_navigation.orchestration.runtime.backoff import Backoff
+
+
+class Heartbeat:
+    """Пишет рабочий поток, читает сторож; только присваивания — без блокировок."""
+
+    __slots__ = ("beats", "last_beat", "phase", "phase_since")
+
+    def __init__(self, phase: str = "init"):
+        now = time.monotonic()
+        self.beats = 0
+        self.last_beat = now
+        self.phase = phase
+        self.phase_since = now
+
+    def beat(self, phase: str | None = None) -> None:
+        now = time.monotonic()
+        self.beats += 1
+        self.last_beat = now
+        if phase is not None and phase != self.phase:
+            self.phase = phase
+            self.phase_since = now
+
+    def enter(self, phase: str) -> None:
+        self.beat(phase)
+
+
+@dataclass
+class WatchedThread:
+    name: str
+    thread: threading.Thread
+    factory: Callable[[threading.Thread], threading.Thread] | None
+    stall_s: float
+    max_rate_hz: float | None
+    backoff: Backoff
+    started_at: float = field(default_factory=time.monotonic)
+    restarts: int = 0
+    consecutive: int = 0            # перезапуски подряд, после которых поток прожил меньше healthy_s
+    stalls: int = 0
+    stalled: bool = False
+    busy: bool = False
+    failed: bool = False
+    restart_at: float | None = None
+    rate_hz: float = 0.0
+    rate_beats: int = 0
+    rate_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def heartbeat(self) -> Heartbeat | None:
+        return getattr(self.thread, "heartbeat", None)
+
+
+class Watchdog(threading.Thread):
+    def __init__(
+        self,
+        stop_event: threading.Event,
+        logger: logging.Logger,
+        *,
+        check_s: float = 1.0,
+        max_restarts: int = 5,
+        healthy_s: float = 60.0,
+        restart_backoff_s: float = 1.0,
+        restart_backoff_max_s: float = 30.0,
+    ):
+        super().__init__(daemon=True, name="Watchdog")
+        self.stop_event = stop_event
+        self.logger = logger
+        self.check_s = check_s
+        self.max_restarts = max_restarts
+        self.healthy_s = healthy_s
+        self.restart_backoff_s = restart_backoff_s
+        self.restart_backoff_max_s = restart_backoff_max_s
+        self.failed = threading.Event()         # поток не восстановить — ячейка должна остановиться
+        self.failure: str | None = None
+        self._watched: dict[str, WatchedThread] = {}
+        self._lock = threading.Lock()
+
+    # ---------- регистрация ----------
+    def watch(
+        self,
+        name: str,
+        thread: threading.Thread,
+        *,
+        factory: Callable[[threading.Thread], threading.Thread] | None = None,
+        stall_s: float = 10.0,
+        max_rate_hz: float | None = None,
+    ) -> None:
+        """factory(старый поток) -> новый, ещё не запущенный поток той же конфигурации."""
+        with self._lock:
+            self._watched[name] = WatchedThread(
+                name, thread, factory, stall_s, max_rate_hz,
+                Backoff(self.restart_backoff_s, self.restart_backoff_max_s),
+            )
+
+    def thread(self, name: str) -> threading.Thread:
+        """Текущий экземпляр потока (после перезапусков — последний)."""
+        return self._watched[name].thread
+
+    # ---------- проверка ----------
+    def check(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            watched = list(self._watched.values())
+        for w in watched:
+            if w.failed:
+                continue
+            if w.restart_at is not None:
+                if now >= w.restart_at:
+                    self._restart(w)
+                continue
+            if not w.thread.is_alive():
+                self._on_dead(w, now)
+                continue
+            heartbeat = w.heartbeat
+            if heartbeat is None:
+                continue
+            self._check_rate(w, heartbeat, now)
+            self._check_stall(w, heartbeat, now)
+
+    def _check_rate(self, w: WatchedThread, heartbeat: Heartbeat, now: float) -> None:
+        elapsed = now - w.rate_at
+        if elapsed <= 0:
+            return
+        w.rate_hz = (heartbeat.beats - w.rate_beats) / elapsed
+        w.rate_beats, w.rate_at = heartbeat.beats, now
+        if w.max_rate_hz is None:
+            return
+        busy = w.rate_hz > w.max_rate_hz
+        if busy and not w.busy:
+            self.logger.warning(
+                f"[{self.name}] {w.name}: {w.rate_hz:.0f} витков/с в фазе '{heartbeat.phase}' "
+                f"(порог {w.max_rate_hz:.0f}) — цикл без ожидания"
+            )
+        w.busy = busy
+
+    def _check_stall(self, w: WatchedThread, heartbeat: Heartbeat, now: float) -> None:
+        silent_s = now - heartbeat.last_beat
+        if silent_s > w.stall_s:
+            if not w.stalled:
+                w.stalled = True
+                w.stalls += 1
+                self.logger.error(
+                    f"[{self.name}] {w.name}: нет отклика {silent_s:.1f} с, фаза '{heartbeat.phase}' "
+                    f"{now - heartbeat.phase_since:.1f} с. Стек:\n{self._stack(w.thread)}"
+                )
+        elif w.stalled:
+            w.stalled = False
+            self.logger.info(f"[{self.name}] {w.name}: снова отвечает, фаза '{heartbeat.phase}'")
+
+    def _on_dead(self, w: WatchedThread, now: float) -> None:
+        if self.stop_event.is_set():
+            return
+        heartbeat = w.heartbeat
+        phase = heartbeat.phase if heartbeat is not None else "?"
+        lived_s = now - w.started_at
+        failure = getattr(w.thread, "failure", None)
+        self.logger.error(
+            f"[{self.name}] {w.name}: поток завершился в фазе '{phase}', прожив {lived_s:.1f} с"
+            f"{f': {type(failure).__name__}: {failure}' if failure is not None else ''}"
+        )
+        if lived_s >= self.healthy_s:
+            w.consecutive = 0
+            w.backoff.reset()
+        if w.factory is None:
+            self._fail(w, f"{w.name}: поток завершился, перезапуск не предусмотрен")
+            return
+        if w.consecutive >= self.max_restarts:
+            self._fail(w, f"{w.name}: {w.consecutive} перезапусков подряд не помогли")
+            return
+        delay = w.backoff.next_delay()
+        w.restart_at = now + delay
+        self.logger.warning(f"[{self.name}] {w.name}: перезапуск через {delay:.1f} с")
+
+    def _restart(self, w: WatchedThread) -> None:
+        w.restart_at = None
+        if self.stop_event.is_set():
+            return
+        try:
+            thread = w.factory(w.thread)
+            thread.start()
+        except Exception as e:
+            self._fail(w, f"{w.name}: не удалось пересоздать поток: {type(e).__name__}: {e}")
+            return
+        now = time.monotonic()
+        w.thread = thread
+        w.started_at = now
+        w.restarts += 1
+        w.consecutive += 1
+        w.stalled = w.busy = False
+        w.rate_beats, w.rate_at = 0, now
+        self.logger.warning(f"[{self.name}] {w.name}: перезапущен ({w.restarts}-й раз за сеанс)")
+
+    def _fail(self, w: WatchedThread, reason: str) -> None:
+        w.failed = True
+        self.failure = reason
+        self.logger.critical(f"[{self.name}] {reason} — остановка ячейки")
+        self.failed.set()
+
+    @staticmethod
+    def _stack(thread: threading.Thread) -> str:
+        frame = sys._current_frames().get(thread.ident)
+        return "".join(traceback.format_stack(frame)[-8:]) if frame is not None else "<нет стека>"
+
+    # ---------- метрики ----------
+    def as_dict(self) -> dict[str, dict[str, object]]:
+        now = time.monotonic()
+        metrics = {}
+        with self._lock:
+            watched = list(self._watched.values())
+        for w in watched:
+            heartbeat = w.heartbeat
+            metrics[w.name] = {
+                "alive": w.thread.is_alive(),
+                "phase": heartbeat.phase if heartbeat is not None else None,
+                "phase_s": round(now - heartbeat.phase_since, 1) if heartbeat is not None else None,
+                "silent_s": round(now - heartbeat.last_beat, 2) if heartbeat is not None else None,
+                "rate_hz": round(w.rate_hz, 1),
+                "restarts": w.restarts,
+                "stalls": w.stalls,
+                "failed": w.failed,
+            }
+        return metrics
+
+    def run(self) -> None:
+        self.logger.info(f"Поток [{self.name}] запущен")
+        try:
+            while not self.stop_event.wait(self.check_s):
+                self.check()
+        finally:
+            self.logger.info(f"Поток [{self.name}] остановлен, {self.as_dict()}")
+
+
+if __name__ == "__main__":
+    def main():
+        """Падающий поток (перезапуск), зависший (стек в лог) и холостой цикл (частота витков)."""
+        logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+        logger = logging.getLogger("watchdog")
+        stop = threading.Event()
+
+        class Worker(threading.Thread):
+            def __init__(self, mode: str, crash_after_s: float | None = None):
+                super().__init__(daemon=True, name=f"worker-{mode}")
+                self.mode = mode
+                self.crash_after_s = crash_after_s
+                self.heartbeat = Heartbeat()
+                self.failure = None
+
+            def run(self):
+                started = time.monotonic()
+                try:
+                    while not stop.is_set():
+                        if self.crash_after_s is not None and time.monotonic() - started > self.crash_after_s:
+                            raise ConnectionRefusedError("vision недоступен")
+                        if self.mode == "stall" and time.monotonic() - started > 0.5:
+                            self.heartbeat.enter("recv")
+                            time.sleep(2.5)             # блокирующий вызов без таймаута
+                        self.heartbeat.beat("loop")
+                        if self.mode != "busy":
+                            stop.wait(0.05)
+                except Exception as e:
+                    self.failure = e
+
+        watchdog = Watchdog(stop, logger, check_s=0.25, restart_backoff_s=0.5, healthy_s=2.0)
+        crashing = Worker("crash", crash_after_s=0.7)
+        stalling = Worker("stall")
+        busy = Worker("busy")
+        for worker in (crashing, stalling, busy):
+            worker.start()
+        # после перезапуска поток работает нормально
+        watchdog.watch("crash", crashing, factory=lambda old: Worker("crash"), stall_s=1.0)
+        watchdog.watch("stall", stalling, stall_s=1.0)
+        watchdog.watch("busy", busy, stall_s=1.0, max_rate_hz=1000)
+        watchdog.start()
+        time.sleep(4.0)
+        metrics = watchdog.as_dict()
+        stop.set()
+        watchdog.join()
+        for name, values in metrics.items():
+            print(name, values)
+        assert metrics["crash"]["restarts"] == 1 and metrics["crash"]["alive"]
+        assert metrics["stall"]["stalls"] == 1
+        assert not watchdog.failed.is_set()
+    main()
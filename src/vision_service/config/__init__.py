@@ -0,0 +1,13 @@
+# src/vision_service/config/__init__.py
+
+"""
+Публичный интерфейс загрузки конфигураций vision-сервиса.
+"""
+
+from .cameras import load_cameras_config, CameraConfig, CamerasConfig
+
+__all__ = (
+    "load_cameras_config",
+    "CameraConfig",
+    "CamerasConfig",
+)
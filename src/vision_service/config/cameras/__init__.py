@@ -0,0 +1,8 @@
+# src/vision_service/config/cameras/__init__.py
+from .config import load_cameras_config, CameraConfig, CamerasConfig
+
+__all__ = [
+    "load_cameras_config",
+    "CameraConfig",
+    "CamerasConfig",
+]
@@ -0,0 +1,60 @@
+# src/vision_service/config/cameras/config.py
+from dataclasses import dataclass
+from pathlib import Path
+import yaml
+
+from vision_service.inference.tiling import TilingConfig
+
+
+CONFIG_PATH = Path(__file__).with_name("cameras.yaml")
+
+@dataclass(frozen=True)
+class CameraConfig:
+    name: str
+    roi: tuple[int, int, int, int] | None   # x0, y0, x1, y1 в пикселях кадра
+    tiling: TilingConfig | None             # None — тайлинг выключен
+
+@dataclass(frozen=True)
+class CamerasConfig:
+    default_camera: str
+    cameras: dict[str, CameraConfig]
+
+    def get(self, name: str | None) -> CameraConfig:
+        """KeyError, если камеры нет в конфиге."""
+        return self.cameras[name or self.default_camera]
+
+def _parse_roi(raw, camera: str) -> tuple[int, int, int, int] | None:
+    if raw is None:
+        return None
+    if len(raw) != 4 or raw[2] <= raw[0] or raw[3] <= raw[1]:
+        raise ValueError(f"cameras.{camera}.roi: ожидается [x0, y0, x1, y1] с x1 > x0, y1 > y0, получено {raw}")
+    return tuple(int(v) for v in raw)
+
+def _parse_tiling(raw: dict | None) -> TilingConfig | None:
+    if not raw or not raw.get("enabled", False):
+        return None
+    return TilingConfig(
+        tile_size=tuple(int(v) for v in raw.get("tile_size", TilingConfig.tile_size)),
+        overlap=float(raw.get("overlap", TilingConfig.overlap)),
+        max_tiles=int(raw.get("max_tiles", TilingConfig.max_tiles)),
+        iou_threshold=float(raw.get("iou_threshold", TilingConfig.iou_threshold)),
+    )
+
+def load_cameras_config(path: Path | None = None) -> CamerasConfig:
+    cfg_path = path or CONFIG_PATH
+    with cfg_path.open("r", encoding="utf-8") as f:
+        raw = yaml.safe_load(f)
+
+    cameras = {
+        name: CameraConfig(
+            name=name,
+            roi=_parse_roi(camera_raw.get("roi"), name),
+            tiling=_parse_tiling(camera_raw.get("tiling")),
+        )
+        for name, camera_raw in raw["cameras"].items()
+    }
+    default_camera = raw.get("default_camera") or next(iter(cameras))
+    if default_camera not in cameras:
+        raise ValueError(f"default_camera '{default_camera}' нет в списке камер")
+
+    return CamerasConfig(default_camera=default_camera, cameras=cameras)
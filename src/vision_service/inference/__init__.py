@@ -0,0 +1,16 @@
+# src/vision_service/inference/__init__.py
+from .model import TubePoseModel, WarmupReport, warm_up
+from .preprocessing import PreprocessConfig, PreprocessResult, Preprocessor
+from .result_cache import ResultCache
+from .tiling import TilingConfig
+
+__all__ = [
+    "PreprocessConfig",
+    "PreprocessResult",
+    "Preprocessor",
+    "ResultCache",
+    "TilingConfig",
+    "TubePoseModel",
+    "WarmupReport",
+    "warm_up",
+]
\ No newline at end of file
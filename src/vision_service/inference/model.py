@@ -0,0 +1,214 @@
+# src/vision_service/inference/model.py
+"""
+Модель поиска пробирок в свале.
+
+Пока это заглушка со случайными координатами, но жизненный цикл у неё уже
+как у настоящей модели: load() -> warm_up() -> predict().
+"""
+from __future__ import annotations
+
+import io
+import random
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+from PIL import Image
+
+from .preprocessing import Box, PreprocessConfig, Preprocessor, TileTransform, clip_box, synthetic_jpeg
+from .result_cache import ResultCache, content_key, dhash
+from .tiling import TilingConfig, make_tiles, nms
+
+
+def generate_tube_coordinates():
+    """
+    Генерирует словарь tube_coordinates со случайными значениями для тестов.
+    Все координаты - числа с плавающей точкой.
+    """
+    tube_coordinates = {
+        "x": float(random.randint(-50, 50) + 300),      # float
+        "y": float(random.randint(-50, 50)),            # float
+        "z": float(random.randint(-50, 50) + 300),      # float
+        "a": round(random.uniform(-20, 20), 1),         # уже float
+        "b": round(random.uniform(-20, 20), 1),         # уже float
+        "c": round(random.uniform(-20, 20), 1) + 90     # уже float
+    }
+    return tube_coordinates
+
+def generate_candidates(max_candidates: int = 5) -> list[dict[str, float]]:
+    """
+    Набор кандидатов, отсортированный по убыванию confidence — как будет у реальной модели.
+    """
+    candidates = []
+    for _ in range(random.randint(1, max_candidates)):
+        candidate = generate_tube_coordinates()
+        candidate["confidence"] = round(random.uniform(0.5, 1.0), 3)
+        candidates.append(candidate)
+    candidates.sort(key=lambda c: c["confidence"], reverse=True)
+    return candidates
+
+
+class TubePoseModel:
+    """Обёртка модели: загрузка весов один раз, затем только predict()."""
+
+    def __init__(
+        self,
+        inference_time_s: float = 0.05,
+        cpu_bound: bool = False,
+        preprocess: PreprocessConfig | None = None,
+        cache: ResultCache | None = None,
+    ):
+        self.inference_time_s = inference_time_s
+        self.cpu_bound = cpu_bound      # заглушка держит GIL, как пре/пост-обработка на Python
+        self.preprocess_cfg = preprocess or PreprocessConfig()
+        self.preprocessor: Preprocessor | None = None
+        self.cache = cache
+        self.loaded = False
+
+    def load(self) -> None:
+        # здесь будет загрузка весов и перенос на устройство
+        self.preprocessor = Preprocessor(self.preprocess_cfg)
+        self.loaded = True
+
+    def predict(
+        self,
+        image_bytes: bytes,
+        roi: Box | None = None,
+        tiling: TilingConfig | None = None,
+    ) -> list[dict[str, float]]:
+        """
+        roi — область кадра (пиксели исходного кадра), None — весь кадр.
+        tiling — резать ROI на перекрывающиеся тайлы и сливать детекции NMS.
+        ValueError — кадр не декодируется или ROI вне кадра.
+        """
+        if not self.loaded:
+            raise RuntimeError("TubePoseModel: модель не загружена")
+        if self.cache is None:
+            return self._run(image_bytes, roi, tiling)[0]
+
+        # Тот же кадр с теми же параметрами — ни декода, ни модели
+        key = content_key(image_bytes, repr((roi, tiling)).encode())
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+
+        result, fingerprint = self._run(image_bytes, roi, tiling)
+        self.cache.put(key, result, fingerprint)
+        return result
+
+    def _run(
+        self,
+        image_bytes: bytes,
+        roi: Box | None,
+        tiling: TilingConfig | None,
+    ) -> tuple[list[dict[str, float]], int | None]:
+        """Результат и dHash батча (если включён поиск «почти того же» кадра)."""
+        regions = None
+        if roi is not None or tiling is not None:
+            try:
+                with Image.open(io.BytesIO(image_bytes)) as header:     # только заголовок, без декода
+                    size = header.size
+            except (OSError, Image.DecompressionBombError) as e:
+                raise ValueError(f"не удалось декодировать кадр: {e}") from e
+            frame_roi = clip_box(roi or (0, 0, *size), size)
+            regions = make_tiles(frame_roi, tiling) if tiling is not None else [frame_roi]
+
+        fingerprint = None
+        with self.preprocessor.process(image_bytes, regions) as batch:
+            # Почти тот же кадр — декод уже сделан, пропускаем только модель
+            if self.cache is not None and self.cache.near_enabled:
+                fingerprint = dhash(batch.tensor)
+                cached = self.cache.get_near(fingerprint)
+                if cached is not None:
+                    return cached, fingerprint
+
+            per_tile = self._infer(batch.tensor, batch.tiles)
+            result = self._merge(per_tile, batch.tiles, tiling)
+        return result, fingerprint
+
+    def _infer(self, tensor: np.ndarray, tiles: tuple[TileTransform, ...]) -> list[list[dict[str, float]]]:
+        """
+        Батч (N, 3, H, W) -> детекции по каждому тайлу, bbox в пикселях входа модели.
+        Заглушка: время — как у одного прохода на батч (GPU), детекции случайные,
+        но только в пределах картинки — в полях letterbox настоящая модель ничего не найдёт.
+        """
+        if self.cpu_bound:
+            deadline = time.perf_counter() + self.inference_time_s
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            time.sleep(self.inference_time_s)
+
+        per_tile = []
+        for tile in tiles:
+            x0, y0, x1, y1 = tile.region
+            width, height = (x1 - x0) * tile.scale, (y1 - y0) * tile.scale     # картинка внутри полей
+            size = min(40.0, width, height)
+            detections = generate_candidates()
+            for d in detections:
+                u = tile.pad[0] + random.uniform(0, width - size)
+                v = tile.pad[1] + random.uniform(0, height - size)
+                d["bbox"] = [u, v, u + size, v + size]
+            per_tile.append(detections)
+        return per_tile
+
+    @staticmethod
+    def _merge(
+        per_tile: list[list[dict[str, float]]],
+        tiles: tuple[TileTransform, ...],
+        tiling: TilingConfig | None,
+    ) -> list[dict[str, float]]:
+        """bbox -> пиксели исходного кадра, дубликаты на стыках тайлов убираются NMS."""
+        detections = []
+        for tile, tile_detections in zip(tiles, per_tile):
+            x0, y0, x1, y1 = tile.region
+            for d in tile_detections:
+                u0, v0 = tile.to_source(d["bbox"][0], d["bbox"][1])
+                u1, v1 = tile.to_source(d["bbox"][2], d["bbox"][3])
+                if not (x0 <= (u0 + u1) / 2 < x1 and y0 <= (v0 + v1) / 2 < y1):
+                    continue    # центр в полях letterbox — не часть кадра
+                detections.append({**d, "bbox": [round(u0, 1), round(v0, 1), round(u1, 1), round(v1, 1)]})
+
+        if len(tiles) > 1 and detections:
+            boxes = np.array([d["bbox"] for d in detections], dtype=np.float64)
+            scores = np.array([d["confidence"] for d in detections], dtype=np.float64)
+            detections = [detections[i] for i in nms(boxes, scores, tiling.iou_threshold)]
+
+        detections.sort(key=lambda d: d["confidence"], reverse=True)
+        return detections
+
+
+@dataclass
+class WarmupReport:
+    load_ms: float = 0.0
+    runs_ms: list[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "load_ms": round(self.load_ms, 1),
+            "warmup_runs_ms": [round(t, 1) for t in self.runs_ms],
+            "first_inference_ms": round(self.runs_ms[0], 1) if self.runs_ms else None,
+            "steady_inference_ms": round(self.runs_ms[-1], 1) if self.runs_ms else None,
+        }
+
+
+def warm_up(model: TubePoseModel, image_bytes: bytes, runs: int) -> WarmupReport:
+    """Загружает модель и прогоняет runs инференсов, чтобы первый боевой кадр не платил за старт."""
+    report = WarmupReport()
+    image_bytes = image_bytes or synthetic_jpeg()
+
+    st = time.perf_counter()
+    model.load()
+    report.load_ms = (time.perf_counter() - st) * 1000
+
+    # прогрев должен проходить через модель, а не через кэш
+    cache, model.cache = model.cache, None
+    try:
+        for _ in range(runs):
+            st = time.perf_counter()
+            model.predict(image_bytes)
+            report.runs_ms.append((time.perf_counter() - st) * 1000)
+    finally:
+        model.cache = cache
+
+    return report
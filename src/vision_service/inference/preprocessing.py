@@ -0,0 +1,316 @@
+# src/vision_service/inference/preprocessing.py
+"""
+Подготовка кадра для модели: JPEG -> области кадра -> letterbox -> нормализованный
+батч (N, 3, H, W) float32. Область — весь кадр, ROI или тайлы ROI.
+
+Быстрый путь:
+- JPEG декодируется сразу в уменьшенном масштабе (draft: 1/2, 1/4, 1/8 средствами
+  libjpeg), достаточном для самой мелкой области, — полноразмерный кадр в памяти
+  появляется, только если он действительно нужен (тайлы);
+- уменьшение до входа модели делает PIL (C), без промежуточных float-массивов;
+- нормализация (x / 255 - mean) / std — один проход через таблицу на 256 значений
+  на канал прямо в тензор из пула, без временных массивов;
+- тензоры берутся из пула и возвращаются в него после инференса.
+
+process() вызывается из нескольких потоков (threadpool FastAPI, executor /stream):
+пул и счётчики stats под одной блокировкой, сама обработка кадра — без неё.
+"""
+from __future__ import annotations
+
+import io
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Sequence
+
+import numpy as np
+from PIL import Image
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+PREPROCESS_STAGES = ("decode", "resize", "normalize")
+
+Box = tuple[int, int, int, int]     # (x0, y0, x1, y1) в пикселях исходного кадра
+
+
+@dataclass(frozen=True)
+class PreprocessConfig:
+    input_size: tuple[int, int] = (640, 640)        # (ширина, высота) входа модели
+    mean: tuple[float, float, float] = IMAGENET_MEAN
+    std: tuple[float, float, float] = IMAGENET_STD
+    pad_value: int = 114                            # цвет полей letterbox до нормализации
+    pool_size: int = 4                              # ≈ число одновременных инференсов
+
+
+@dataclass
+class _TensorSlot:
+    tensor: np.ndarray                              # (N, 3, H, W) float32
+    layouts: list[tuple[int, int, int, int] | None] # (x, y, w, h) картинки внутри полей при прошлом использовании
+
+
+@dataclass(frozen=True)
+class TileTransform:
+    region: Box                     # область исходного кадра, попавшая в этот элемент батча
+    scale: float                    # пиксели входа модели / пиксели исходного кадра
+    pad: tuple[int, int]            # смещение картинки внутри letterbox (x, y)
+
+    def to_source(self, u: float, v: float) -> tuple[float, float]:
+        """Точка во входе модели -> точка исходного кадра."""
+        return (
+            self.region[0] + (u - self.pad[0]) / self.scale,
+            self.region[1] + (v - self.pad[1]) / self.scale,
+        )
+
+
+@dataclass(frozen=True)
+class PreprocessResult:
+    tensor: np.ndarray              # (N, 3, H, W) float32, живёт до выхода из Preprocessor.process()
+    tiles: tuple[TileTransform, ...]
+    source_size: tuple[int, int]    # (ширина, высота) исходного кадра
+    timings_ms: dict[str, float]
+
+
+@dataclass
+class PreprocessStats:
+    frames: int = 0
+    tiles: int = 0
+    pool_misses: int = 0            # кадров, для которых в пуле не нашлось тензора
+    total_ms: dict[str, float] = field(default_factory=lambda: dict.fromkeys(PREPROCESS_STAGES, 0.0))
+
+    def as_dict(self) -> dict[str, object]:
+        mean_ms = {k: round(v / self.frames, 3) if self.frames else None for k, v in self.total_ms.items()}
+        return {"frames": self.frames, "tiles": self.tiles, "pool_misses": self.pool_misses, "mean_ms": mean_ms}
+
+
+def clip_box(box: Sequence[float], size: tuple[int, int]) -> Box:
+    """Область в пределах кадра; ValueError, если от неё ничего не осталось."""
+    width, height = size
+    x0, y0 = max(0, int(box[0])), max(0, int(box[1]))
+    x1, y1 = min(width, int(round(box[2]))), min(height, int(round(box[3])))
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"область {tuple(box)} вне кадра {width}x{height}")
+    return x0, y0, x1, y1
+
+
+class Preprocessor:
+    def __init__(self, cfg: PreprocessConfig | None = None):
+        self.cfg = cfg or PreprocessConfig()
+        width, height = self.cfg.input_size
+        self._shape = (3, height, width)
+
+        # lut[c][v] = (v / 255 - mean[c]) / std[c]
+        mean = np.asarray(self.cfg.mean, dtype=np.float32)[:, None]
+        std = np.asarray(self.cfg.std, dtype=np.float32)[:, None]
+        self._lut = ((np.arange(256, dtype=np.float32)[None, :] / 255.0 - mean) / std).astype(np.float32)
+        self._pad = self._lut[:, self.cfg.pad_value].copy()
+
+        # отдельный пул на каждый размер батча: 1 — весь кадр/ROI, N — тайлы
+        self._lock = threading.Lock()
+        self._pools: dict[int, queue.SimpleQueue[_TensorSlot]] = {1: queue.SimpleQueue()}
+        for _ in range(self.cfg.pool_size):
+            self._pools[1].put(self._new_slot(1))
+        self.stats = PreprocessStats()
+
+    # ---------------------- ПУЛ ----------------------
+    def _new_slot(self, batch: int) -> _TensorSlot:
+        return _TensorSlot(np.empty((batch, *self._shape), dtype=np.float32), [None] * batch)
+
+    def _acquire(self, batch: int) -> _TensorSlot:
+        with self._lock:
+            if batch not in self._pools:
+                # новый размер батча (другая раскладка тайлов) — пул заводится при первом кадре
+                self._pools[batch] = queue.SimpleQueue()
+            else:
+                try:
+                    return self._pools[batch].get_nowait()
+                except queue.Empty:
+                    # больше одновременных кадров, чем pool_size: не блокируем, а выделяем ещё один
+                    self.stats.pool_misses += 1
+        return self._new_slot(batch)
+
+    def _release(self, slot: _TensorSlot) -> None:
+        with self._lock:
+            pool = self._pools[slot.tensor.shape[0]]
+            if pool.qsize() < self.cfg.pool_size:
+                pool.put(slot)
+
+    # ---------------------- ЭТАПЫ ----------------------
+    def _region_scale(self, region: Box) -> float:
+        width, height = self.cfg.input_size
+        return min(width / (region[2] - region[0]), height / (region[3] - region[1]))
+
+    def _decode(self, image: Image.Image, scale: float) -> Image.Image:
+        """Декодирует кадр в масштабе не меньше scale (draft выбирает ближайший масштаб libjpeg)."""
+        if scale < 1.0:
+            image.draft("RGB", (max(1, int(image.width * scale)), max(1, int(image.height * scale))))
+        image.load()
+        return image if image.mode == "RGB" else image.convert("RGB")
+
+    def _fill_padding(self, tensor: np.ndarray, layout: tuple[int, int, int, int]) -> None:
+        x, y, w, h = layout
+        for c in range(3):
+            tensor[c, :y, :] = self._pad[c]
+            tensor[c, y + h:, :] = self._pad[c]
+            tensor[c, y:y + h, :x] = self._pad[c]
+            tensor[c, y:y + h, x + w:] = self._pad[c]
+
+    @contextmanager
+    def process(self, image_bytes: bytes, regions: Sequence[Sequence[float]] | None = None) -> Iterator[PreprocessResult]:
+        """
+        regions — области исходного кадра (ROI или тайлы), None — весь кадр.
+        Тензор действителен только внутри with — потом он возвращается в пул.
+        """
+        t0 = time.perf_counter()
+        try:
+            source = Image.open(io.BytesIO(image_bytes))
+        except (OSError, Image.DecompressionBombError) as e:
+            raise ValueError(f"не удалось декодировать кадр: {e}") from e
+        with source:
+            try:
+                source_size = source.size
+                boxes = [clip_box(r, source_size) for r in regions] if regions else [(0, 0, *source_size)]
+                image = self._decode(source, max(self._region_scale(b) for b in boxes))
+            except (OSError, Image.DecompressionBombError) as e:
+                raise ValueError(f"не удалось декодировать кадр: {e}") from e
+            decoded_ratio = image.width / source_size[0]
+            t1 = time.perf_counter()
+
+            # np.asarray копирует пиксели: после выхода из with кадр не нужен
+            width, height = self.cfg.input_size
+            crops: list[tuple[np.ndarray, TileTransform]] = []
+            for box in boxes:
+                scale = self._region_scale(box)
+                new_w = max(1, min(width, round((box[2] - box[0]) * scale)))
+                new_h = max(1, min(height, round((box[3] - box[1]) * scale)))
+                crop = image
+                if box != (0, 0, *source_size):
+                    crop = image.crop(tuple(round(v * decoded_ratio) for v in box))
+                if crop.size != (new_w, new_h):
+                    crop = crop.resize((new_w, new_h), Image.BILINEAR)
+                pad = ((width - new_w) // 2, (height - new_h) // 2)
+                crops.append((np.asarray(crop), TileTransform(box, scale, pad)))     # (h, w, 3) uint8
+        t2 = time.perf_counter()
+
+        slot = self._acquire(len(crops))
+        try:
+            for i, (pixels, tile) in enumerate(crops):
+                h, w = pixels.shape[:2]
+                x, y = tile.pad
+                layout = (x, y, w, h)
+                if slot.layouts[i] != layout:
+                    self._fill_padding(slot.tensor[i], layout)
+                    slot.layouts[i] = layout
+                for c in range(3):
+                    np.take(self._lut[c], pixels[:, :, c], out=slot.tensor[i, c, y:y + h, x:x + w], mode="clip")
+            t3 = time.perf_counter()
+
+            timings = {
+                "decode": (t1 - t0) * 1e3,
+                "resize": (t2 - t1) * 1e3,
+                "normalize": (t3 - t2) * 1e3,
+            }
+            with self._lock:
+                self.stats.frames += 1
+                self.stats.tiles += len(crops)
+                for stage, ms in timings.items():
+                    self.stats.total_ms[stage] += ms
+
+            yield PreprocessResult(
+                tensor=slot.tensor,
+                tiles=tuple(tile for _, tile in crops),
+                source_size=source_size,
+                timings_ms=timings,
+            )
+        finally:
+            self._release(slot)
+
+
+def synthetic_jpeg(size: tuple[int, int] = (640, 480), quality: int = 90) -> bytes:
+    """Кадр для прогрева, если тестового кадра на диске нет."""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(size[1], size[0], 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+if __name__ == "__main__":
+    def preprocess_naive(image_bytes: bytes, cfg: PreprocessConfig) -> np.ndarray:
+        """Прямолинейный вариант «как обычно пишут»: полный декод и новые массивы на каждом шаге."""
+        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+        width, height = cfg.input_size
+        scale = min(width / image.width, height / image.height)
+        new_w, new_h = round(image.width * scale), round(image.height * scale)
+        pixels = np.asarray(image.resize((new_w, new_h), Image.BILINEAR))
+        normalized = (pixels.astype(np.float32) / 255.0 - np.array(cfg.mean, dtype=np.float32)) / np.array(cfg.std, dtype=np.float32)
+        canvas = np.full((height, width, 3), cfg.pad_value / 255.0, dtype=np.float32)
+        canvas = (canvas - np.array(cfg.mean, dtype=np.float32)) / np.array(cfg.std, dtype=np.float32)
+        x, y = (width - new_w) // 2, (height - new_h) // 2
+        canvas[y:y + new_h, x:x + new_w] = normalized
+        return np.ascontiguousarray(canvas.transpose(2, 0, 1))
+
+    def main():
+        import tracemalloc
+        from pathlib import Path
+
+        frame = Path(__file__).resolve().parents[3] / "test_data" / "frame.jpg"
+        image_bytes = frame.read_bytes()
+        cfg = PreprocessConfig()
+        preprocessor = Preprocessor(cfg)
+        runs = 20
+
+        with preprocessor.process(image_bytes) as result:
+            fast = result.tensor[0].copy()
+        naive = preprocess_naive(image_bytes, cfg)
+        print(f"кадр {frame.name}: {len(image_bytes) / 1024:.0f} KB, {result.source_size[0]}x{result.source_size[1]} -> {cfg.input_size}")
+        print(f"расхождение с прямым вариантом: max |d| = {np.abs(fast - naive).max():.3f} (draft-декод + другой путь ресайза)")
+
+        def measure(name: str, fn) -> None:
+            fn()                                    # прогрев: пул, таблицы, кэши libjpeg
+            tracemalloc.start()
+            peaks = []
+            st = time.perf_counter()
+            for _ in range(runs):
+                tracemalloc.reset_peak()
+                before, _ = tracemalloc.get_traced_memory()
+                fn()
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            elapsed = (time.perf_counter() - st) / runs * 1e3
+            tracemalloc.stop()
+            print(f"{name:<10} {elapsed:7.2f} ms/кадр, пик выделений Python/NumPy {max(peaks) / 2**20:6.2f} MB/кадр")
+
+        def fast_path():
+            with preprocessor.process(image_bytes):
+                pass
+
+        def naive_path():
+            preprocess_naive(image_bytes, cfg)
+
+        measure("до", naive_path)
+        measure("после", fast_path)
+
+        # по этапам: только быстрый путь размечен таймерами
+        preprocessor.stats = PreprocessStats()
+        for _ in range(runs):
+            fast_path()
+        print(f"этапы после, ms: {preprocessor.stats.as_dict()['mean_ms']}")
+
+        # этапы прямого варианта, вручную
+        stages = dict.fromkeys(PREPROCESS_STAGES, 0.0)
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+            t1 = time.perf_counter()
+            scale = min(cfg.input_size[0] / image.width, cfg.input_size[1] / image.height)
+            pixels = np.asarray(image.resize((round(image.width * scale), round(image.height * scale)), Image.BILINEAR))
+            t2 = time.perf_counter()
+            (pixels.astype(np.float32) / 255.0 - np.array(cfg.mean, dtype=np.float32)) / np.array(cfg.std, dtype=np.float32)
+            t3 = time.perf_counter()
+            for stage, (a, b) in zip(PREPROCESS_STAGES, ((t0, t1), (t1, t2), (t2, t3))):
+                stages[stage] += (b - a) * 1e3
+        print(f"этапы до, ms:    { {k: round(v / runs, 3) for k, v in stages.items()} }")
+        print("декод PIL (libjpeg) не виден tracemalloc: полный кадр — "
+              f"{result.source_size[0] * result.source_size[1] * 3 / 2**20:.1f} MB, после draft — в 16 раз меньше")
+    main()
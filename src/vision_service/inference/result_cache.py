@@ -0,0 +1,206 @@
+# src/vision_service/inference/result_cache.py
+"""
+Кэш результатов инференса по содержимому кадра.
+
+Пока свал не меняется (робот ждёт штатив, пробирок нет), приходят одни и те же
+кадры. Два уровня:
+- точное совпадение байтов кадра (blake2b) — пропускаются и декод, и модель;
+- «почти тот же» кадр (dHash 64 бита по уже подготовленному тензору, расстояние
+  Хэмминга <= near_max_distance) — пропускается только модель. По умолчанию
+  выключен: снятая пробирка может почти не изменить dHash, а старая поза опаснее
+  лишнего инференса.
+Записи живут не дольше ttl_s, при переполнении вытесняется давно не использованная.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+Result = list[dict[str, float]]
+
+
+def content_key(image_bytes: bytes, *extra: bytes) -> bytes:
+    """extra — параметры запроса (ROI, тайлинг): тот же кадр с другим ROI — другой результат."""
+    h = hashlib.blake2b(image_bytes, digest_size=16)
+    for part in extra:
+        h.update(part)
+    return h.digest()
+
+def dhash(tensor: np.ndarray) -> int:
+    """
+    Разностный хэш по зелёному каналу батча (N, 3, H, W): 64 бита на элемент батча.
+    Средние по блокам сетки 8x9, бит = яркость растёт слева направо.
+    """
+    channel = tensor[:, 1]
+    n, h, w = channel.shape
+    bh, bw = h // 8, w // 9
+    blocks = channel[:, :bh * 8, :bw * 9].reshape(n, 8, bh, 9, bw).mean(axis=(2, 4))
+    bits = (blocks[:, :, 1:] > blocks[:, :, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+@dataclass
+class _Entry:
+    result: Result
+    fingerprint: int | None
+    expires_at: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    near_hits: int = 0
+    misses: int = 0
+    evictions: int = 0          # вытеснено по размеру
+    expirations: int = 0        # выброшено по TTL
+
+    def as_dict(self) -> dict[str, object]:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.near_hits) / lookups, 3) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int = 64,
+        ttl_s: float = 1.0,
+        near_max_distance: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.near_max_distance = near_max_distance
+        self._clock = clock
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    @property
+    def near_enabled(self) -> bool:
+        return self.near_max_distance > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Result | None:
+        """Точное совпадение. Промах не считается, если дальше будет поиск по dHash."""
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= now:
+                del self._entries[key]
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                if not self.near_enabled:
+                    self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.result
+
+    def get_near(self, fingerprint: int) -> Result | None:
+        """Ближайший по dHash живой результат в пределах near_max_distance."""
+        now = self._clock()
+        with self._lock:
+            best_key, best_distance = None, self.near_max_distance + 1
+            for key, entry in self._entries.items():
+                if entry.fingerprint is None or entry.expires_at <= now:
+                    continue
+                distance = (entry.fingerprint ^ fingerprint).bit_count()
+                if distance < best_distance:
+                    best_key, best_distance = key, distance
+            if best_key is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.stats.near_hits += 1
+            return self._entries[best_key].result
+
+    def put(self, key: bytes, result: Result, fingerprint: int | None = None) -> None:
+        now = self._clock()
+        with self._lock:
+            self._entries[key] = _Entry(result, fingerprint, now + self.ttl_s)
+            self._entries.move_to_end(key)
+            # сначала просроченные, затем самые давние
+            for stale in [k for k, e in self._entries.items() if e.expires_at <= now]:
+                del self._entries[stale]
+                self.stats.expirations += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "near_max_distance": self.near_max_distance,
+            **self.stats.as_dict(),
+        }
+
+
+if __name__ == "__main__":
+    def main():
+        import io
+        from pathlib import Path
+        from PIL import Image
+        from vision_service.inference.model import TubePoseModel
+
+        frame = (Path(__file__).resolve().parents[3] / "test_data" / "frame.jpg").read_bytes()
+        # тот же кадр, но пережатый: байты другие, картинка та же (как шум сенсора)
+        buffer = io.BytesIO()
+        Image.open(io.BytesIO(frame)).save(buffer, format="JPEG", quality=85)
+        noisy = [frame, buffer.getvalue()]
+        period_s, frames = 0.1, 100         # тестовый цикл робота: кадр каждые 100 мс
+
+        for name, ttl_s, near_bits, source in (
+            ("без кэша", None, 0, [frame]),
+            ("TTL 1 с", 1.0, 0, [frame]),
+            ("TTL 5 с", 5.0, 0, [frame]),
+            ("шум, точный", 1.0, 0, noisy),
+            ("шум, dHash<=4", 1.0, 4, noisy),
+        ):
+            # виртуальные часы: кадр приходит каждые period_s, ждать по-настоящему не нужно
+            now = [0.0]
+            cache = None
+            if ttl_s is not None:
+                cache = ResultCache(ttl_s=ttl_s, near_max_distance=near_bits, clock=lambda: now[0])
+            model = TubePoseModel(cache=cache)
+            model.load()
+
+            busy = 0.0
+            for i in range(frames):
+                st = time.perf_counter()
+                model.predict(source[i % len(source)])
+                busy += time.perf_counter() - st
+                now[0] += period_s
+
+            print(
+                f"{name:<14} {busy / frames * 1e3:7.2f} ms/кадр в среднем, "
+                f"загрузка воркера {busy / (frames * period_s) * 100:5.1f} %"
+                + (f", hit rate {cache.stats.as_dict()['hit_rate']}" if cache is not None else "")
+            )
+
+        st = time.perf_counter()
+        for _ in range(100):
+            content_key(frame)
+        print(f"blake2b {len(frame) / 1024:.0f} KB: {(time.perf_counter() - st) * 10:.3f} ms")
+    main()
@@ -0,0 +1,107 @@
+# src/vision_service/inference/tiling.py
+"""
+Тайлинг ROI и слияние детекций.
+
+Мелкие пробирки теряются, когда весь кадр 3440x1440 ужимается до входа модели.
+В режиме тайлов ROI режется на перекрывающиеся квадраты примерно размера входа
+модели, тайлы идут в модель одним батчем, а детекции на стыках сливаются NMS.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .preprocessing import Box
+
+
+@dataclass(frozen=True)
+class TilingConfig:
+    tile_size: tuple[int, int] = (640, 640)     # (ширина, высота) тайла в пикселях исходного кадра
+    overlap: float = 0.2                        # доля перекрытия соседних тайлов
+    max_tiles: int = 8                          # больше — тайлы укрупняются
+    iou_threshold: float = 0.5                  # NMS при слиянии тайлов
+
+
+def _axis_starts(start: int, length: int, tile: int, overlap: float) -> list[int]:
+    if length <= tile:
+        return [start]
+    stride = tile * (1.0 - overlap)
+    count = math.ceil((length - tile) / stride) + 1
+    return [round(v) for v in np.linspace(start, start + length - tile, count)]
+
+def make_tiles(roi: Box, cfg: TilingConfig) -> list[Box]:
+    """Перекрывающиеся тайлы, покрывающие ROI целиком; крайние тайлы прижаты к границам ROI."""
+    x0, y0, x1, y1 = roi
+    tile_w, tile_h = cfg.tile_size
+    while True:
+        xs = _axis_starts(x0, x1 - x0, tile_w, cfg.overlap)
+        ys = _axis_starts(y0, y1 - y0, tile_h, cfg.overlap)
+        if len(xs) * len(ys) <= cfg.max_tiles:
+            break
+        tile_w, tile_h = math.ceil(tile_w * 1.25), math.ceil(tile_h * 1.25)
+    return [
+        (x, y, min(x + tile_w, x1), min(y + tile_h, y1))
+        for y in ys
+        for x in xs
+    ]
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Жадный NMS: индексы оставленных боксов по убыванию score.
+    boxes — (N, 4) x0, y0, x1, y1.
+    """
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+    x0, y0, x1, y1 = boxes.T
+    areas = (x1 - x0) * (y1 - y0)
+    order = np.argsort(scores)[::-1]
+
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = np.clip(np.minimum(x1[i], x1[rest]) - np.maximum(x0[i], x0[rest]), 0, None)
+        h = np.clip(np.minimum(y1[i], y1[rest]) - np.maximum(y0[i], y0[rest]), 0, None)
+        inter = w * h
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+if __name__ == "__main__":
+    def main():
+        import time
+        from pathlib import Path
+        from vision_service.inference.model import TubePoseModel
+
+        frame = (Path(__file__).resolve().parents[3] / "test_data" / "frame.jpg").read_bytes()
+        model = TubePoseModel()
+        model.load()
+        roi = (1000, 200, 2400, 1300)       # пример: свал занимает ~30 % кадра 3440x1440
+        tube_px = 20                        # диаметр пробирки в пикселях исходного кадра
+
+        for name, view_roi, tiling in (
+            ("весь кадр", None, None),
+            ("ROI", roi, None),
+            ("ROI + тайлы", roi, TilingConfig()),
+        ):
+            model.predict(frame, view_roi, tiling)      # прогрев пула под этот размер батча
+            runs = 10
+            st = time.perf_counter()
+            for _ in range(runs):
+                model.predict(frame, view_roi, tiling)
+            elapsed = (time.perf_counter() - st) / runs * 1e3
+
+            region = view_roi or (0, 0, 3440, 1440)
+            tiles = make_tiles(region, tiling) if tiling else [region]
+            scale = min(min(640 / (t[2] - t[0]), 640 / (t[3] - t[1])) for t in tiles)
+            source_px = (region[2] - region[0]) * (region[3] - region[1])
+            print(
+                f"{name:<12} {elapsed:7.1f} ms/кадр (вкл. {model.inference_time_s * 1e3:.0f} ms модели), "
+                f"тайлов {len(tiles)}, пикселей кадра {source_px / 1e6:4.2f} MP, "
+                f"пробирка {tube_px} px -> {tube_px * scale:4.1f} px на входе модели"
+            )
+    main()
@@ -1,39 +1,147 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from contextlib import asynccontextmanager
+from pathlib import Path
+import asyncio
+import math
 import uvicorn
 import os
-import time
 from typing import Any
 
-import random
+from vision_service.config import load_cameras_config
+from vision_service.inference import ResultCache, TilingConfig, TubePoseModel, WarmupReport, warm_up
+from vision_service.orchestration.app.readiness import ReadyNotifyingServer, exit_with_parent
+from vision_service.orchestration.app.streaming import serve_stream
 
-def generate_tube_coordinates():
-    """
-    Генерирует словарь tube_coordinates со случайными значениями для тестов.
-    Все координаты - числа с плавающей точкой.
-    """
-    tube_coordinates = {
-        "x": float(random.randint(-50, 50) + 300),      # float
-        "y": float(random.randint(-50, 50)),            # float
-        "z": float(random.randint(-50, 50) + 300),      # float
-        "a": round(random.uniform(-20, 20), 1),         # уже float
-        "b": round(random.uniform(-20, 20), 1),         # уже float
-        "c": round(random.uniform(-20, 20), 1) + 90     # уже float
-    }
-    return tube_coordinates
+REPO_ROOT = Path(__file__).resolve().parents[4]
+CAMERAS_CFG = load_cameras_config()
+
+# Прогрев модели: сколько инференсов и на каком кадре
+VISION_WARMUP_RUNS = int(os.getenv("VISION_WARMUP_RUNS", "3"))
+VISION_WARMUP_IMAGE = Path(os.getenv("VISION_WARMUP_IMAGE", str(REPO_ROOT / "test_data" / "frame.jpg")))
+
+# Сколько кадров /stream держит в очереди на соединение (лишние вытесняются, старые первыми)
+VISION_STREAM_BUFFER = int(os.getenv("VISION_STREAM_BUFFER", "1"))
+
+# Кэш результатов по содержимому кадра: размер (0 — выключен), время жизни,
+# допустимое расстояние dHash для «почти того же» кадра (0 — только точное совпадение)
+VISION_CACHE_SIZE = int(os.getenv("VISION_CACHE_SIZE", "64"))
+VISION_CACHE_TTL_S = float(os.getenv("VISION_CACHE_TTL_S", "1.0"))
+VISION_CACHE_NEAR_BITS = int(os.getenv("VISION_CACHE_NEAR_BITS", "0"))
+
+# Заглушка модели нагружает CPU вместо sleep (для бенчмарков масштабирования)
+VISION_STUB_CPU_BOUND = os.getenv("VISION_STUB_CPU_BOUND") == "1"
 
-app = FastAPI()
+class ModelLifecycle:
+    """Состояние модели: загрузка и прогрев идут в фоне, сервер при этом уже отвечает на /health."""
+
+    def __init__(self, model: TubePoseModel):
+        self.model = model
+        self.report: WarmupReport | None = None
+        self.error: str | None = None
+        self.ready = asyncio.Event()
+        self.finished = asyncio.Event()     # прогрев завершён: ready или error
+
+    async def start(self) -> None:
+        try:
+            image_bytes = VISION_WARMUP_IMAGE.read_bytes() if VISION_WARMUP_IMAGE.exists() else b""
+            self.report = await run_in_threadpool(warm_up, self.model, image_bytes, VISION_WARMUP_RUNS)
+            print(f"Модель готова: {self.report.as_dict()}")
+            self.ready.set()
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"Ошибка прогрева модели: {self.error}")
+        finally:
+            self.finished.set()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    cache = None
+    if VISION_CACHE_SIZE > 0:
+        cache = ResultCache(
+            max_entries=VISION_CACHE_SIZE,
+            ttl_s=VISION_CACHE_TTL_S,
+            near_max_distance=VISION_CACHE_NEAR_BITS,
+        )
+    lifecycle = ModelLifecycle(TubePoseModel(cpu_bound=VISION_STUB_CPU_BOUND, cache=cache))
+    app.state.lifecycle = lifecycle
+    warmup_task = asyncio.create_task(lifecycle.start())
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+
+app = FastAPI(lifespan=lifespan)
 
 @app.get("/health")
 def health():
+    """Процесс жив и принимает запросы (модель может быть ещё не готова)."""
     return {"ok": True}
 
+@app.get("/ready")
+def ready():
+    """Модель загружена и прогрета — первый боевой кадр пройдёт с установившейся задержкой."""
+    lifecycle: ModelLifecycle = app.state.lifecycle
+    if not lifecycle.ready.is_set():
+        return JSONResponse(
+            status_code=503,
+            content={"ready": False, "error": lifecycle.error},
+        )
+    return {
+        "ready": True,
+        **lifecycle.report.as_dict(),
+        "preprocess": lifecycle.model.preprocessor.stats.as_dict(),
+    }
+
+@app.get("/stats")
+def stats():
+    """Счётчики кэша результатов и времени предобработки."""
+    model = app.state.lifecycle.model
+    return {
+        "cache": model.cache.as_dict() if model.cache is not None else None,
+        "preprocess": model.preprocessor.stats.as_dict() if model.preprocessor is not None else None,
+    }
+
+def resolve_view(camera: str | None, roi: str | None) -> tuple[tuple[int, int, int, int] | None, TilingConfig | None]:
+    """
+    ROI и тайлинг запроса: ROI камеры из конфига, сужаемый подсказкой робота
+    ("x0,y0,x1,y1" в пикселях кадра). ValueError — неизвестная камера или плохая подсказка.
+    """
+    try:
+        camera_cfg = CAMERAS_CFG.get(camera)
+    except KeyError:
+        raise ValueError(f"unknown camera '{camera}'")
+    if not roi:
+        return camera_cfg.roi, camera_cfg.tiling
+
+    try:
+        values = tuple(float(v) for v in roi.split(","))
+        if len(values) != 4 or not all(math.isfinite(v) for v in values):
+            raise ValueError
+    except ValueError:
+        raise ValueError(f"roi must be 'x0,y0,x1,y1', got '{roi}'")
+    x0, y0, x1, y1 = (int(v) for v in values)
+    if camera_cfg.roi is not None:
+        cx0, cy0, cx1, cy1 = camera_cfg.roi
+        x0, y0, x1, y1 = max(x0, cx0), max(y0, cy0), min(x1, cx1), min(y1, cy1)
+    if x1 <= x0 or y1 <= y0:
+        raise ValueError(f"roi {roi} is outside camera '{camera_cfg.name}' roi {camera_cfg.roi}")
+    return (x0, y0, x1, y1), camera_cfg.tiling
+
 @app.post("/predict")
-async def predict(image: UploadFile = File(...)) -> dict[str, Any]:
+async def predict(
+    image: UploadFile = File(...),
+    camera: str | None = Form(None),
+    roi: str | None = Form(None),
+) -> dict[str, Any]:
     """
     ТЕСТОВЫЙ predict:
     - принимает файл изображения
     - "делает вид", что обработал
-    - возвращает координаты tube_coordinates в формате, который ждёт robot
+    - возвращает координаты tube_coordinates в формате, который ждёт robot:
+      лучший кандидат в корне ответа + все кандидаты в "candidates"
+    camera — ключ в cameras.yaml (ROI, тайлинг), roi — подсказка робота "x0,y0,x1,y1".
     """
     try:
         content = await image.read()
@@ -42,15 +150,52 @@ async def predict(image: UploadFile = File(...)) -> dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"bad image: {e}")
 
-    # имитация времени инференса
-    time.sleep(0.05)
+    lifecycle: ModelLifecycle = app.state.lifecycle
+    if not lifecycle.ready.is_set():
+        raise HTTPException(status_code=503, detail="model is not ready")
+
+    try:
+        view_roi, tiling = resolve_view(camera, roi)
+        candidates = await run_in_threadpool(lifecycle.model.predict, content, view_roi, tiling)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"bad request: {e}")
+    if not candidates:
+        raise HTTPException(status_code=404, detail="no tubes found")
+    return {**candidates[0], "candidates": candidates}
 
-    return generate_tube_coordinates()
+@app.websocket("/stream")
+async def stream(websocket: WebSocket):
+    """
+    Непрерывный поток кадров без накладных расходов multipart-запроса на каждый кадр.
+    Формат сообщений — в vision_service.orchestration.app.streaming.
+    ROI и камера задаются на всё соединение: /stream?camera=dump&roi=x0,y0,x1,y1
+    """
+    lifecycle: ModelLifecycle = app.state.lifecycle
+    if not lifecycle.ready.is_set():
+        await websocket.close(code=1013, reason="model is not ready")   # 1013: try again later
+        return
+    try:
+        view_roi, tiling = resolve_view(websocket.query_params.get("camera"), websocket.query_params.get("roi"))
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))                 # 1008: policy violation
+        return
+    await serve_stream(
+        websocket,
+        lambda image_bytes: lifecycle.model.predict(image_bytes, view_roi, tiling),
+        capacity=VISION_STREAM_BUFFER,
+    )
 
 def main():
     host = os.getenv("VISION_HOST", "127.0.0.1")
     port = int(os.getenv("VISION_PORT", "8010"))
-    uvicorn.run(app, host=host, port=port, log_level="info")
+    exit_with_parent()
+    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    # прогрев упал -> "failed" родителю и код выхода 1 (см. ReadyNotifyingServer)
+    ReadyNotifyingServer(
+        config,
+        wait_ready=lambda: app.state.lifecycle.finished.wait(),
+        failure=lambda: app.state.lifecycle.error,
+    ).run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,100 @@
+# src/vision_service/orchestration/app/readiness.py
+"""
+Связь vision-процесса с тем, кто его запустил (main.py или супервизор флота).
+"""
+import asyncio
+import os
+import socket
+import sys
+import threading
+from typing import Awaitable, Callable, Optional
+
+import uvicorn
+
+FAILED_MESSAGE_MAX = 240        # байт; родитель читает сигнал одним recv(256)
+
+
+def _notify(message: str) -> None:
+    addr = os.getenv("VISION_READY_ADDR")
+    if not addr:
+        return
+    host, ready_port = addr.rsplit(":", 1)
+    try:
+        with socket.create_connection((host, int(ready_port)), timeout=2.0) as sock:
+            sock.sendall(f"{message}\n".encode())
+    except OSError as e:
+        print(f"Не удалось отправить сигнал на {addr}: {e}")
+
+
+def notify_ready(port: int) -> None:
+    """
+    Сигнал готовности родительскому процессу через сокет из VISION_READY_ADDR,
+    чтобы тот не опрашивал /health по таймеру. Порт нужен супервизору флота.
+    """
+    _notify(f"ready {port}")
+
+
+def notify_failed(port: int, reason: str) -> None:
+    """
+    "failed <port> <причина>" — готовности не будет (например, прогрев модели упал):
+    родитель перестаёт ждать сразу, а не по таймауту. Причина — в одну строку.
+    """
+    message = f"failed {port} {' '.join(reason.split())}".encode()[:FAILED_MESSAGE_MAX]
+    _notify(message.decode(errors="ignore"))
+
+
+class ReadyNotifyingServer(uvicorn.Server):
+    """
+    uvicorn.Server, который сообщает о готовности, когда сокет уже слушает
+    и приложение готово (wait_ready завершился, например модель прогрета).
+    Если после wait_ready failure() вернул причину — родителю уходит "failed",
+    сервер останавливается и run() завершает процесс с кодом 1: main.py перестаёт
+    ждать сразу, супервизор флота перезапускает воркер.
+    """
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        wait_ready: Callable[[], Awaitable[object]],
+        failure: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        super().__init__(config)
+        self._wait_ready = wait_ready
+        self._failure = failure
+        self.failure: Optional[str] = None
+
+    def run(self, sockets=None) -> None:
+        super().run(sockets=sockets)
+        if self.failure is not None:
+            sys.exit(1)
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        if self.started:
+            self._notify_task = asyncio.create_task(self._notify_when_ready())
+
+    async def _notify_when_ready(self) -> None:
+        await self._wait_ready()
+        failure = self._failure() if self._failure is not None else None
+        if failure is None:
+            notify_ready(self.config.port)
+            return
+        self.failure = failure
+        print(f"Готовности не будет: {failure}, процесс завершается")
+        notify_failed(self.config.port, failure)
+        self.should_exit = True
+
+
+def exit_with_parent() -> None:
+    """
+    Если VISION_EXIT_WITH_PARENT=1, процесс завершается, как только родитель закрыл
+    stdin (в том числе при его аварийном завершении) — работает и на Windows,
+    где terminate() родителя не доходит до дочерних процессов.
+    """
+    if os.getenv("VISION_EXIT_WITH_PARENT") != "1":
+        return
+
+    def _watch() -> None:
+        sys.stdin.read()
+        os._exit(0)
+
+    threading.Thread(target=_watch, name="ParentWatch", daemon=True).start()
@@ -0,0 +1,98 @@
+# src/vision_service/orchestration/app/streaming.py
+"""
+Потоковый приём кадров по WebSocket (/stream).
+
+Протокол:
+- клиент -> сервер: бинарное сообщение = 8 байт frame_id (big-endian uint64) + JPEG
+- сервер -> клиент: JSON {"frame_id", "latency_ms", "dropped", ...результат predict}
+  или {"frame_id", "error"}
+
+Обратное давление: буфер кадров ограничен, при переполнении выбрасывается самый
+старый кадр — инференс всегда работает по самому свежему кадру, а не копит очередь.
+"""
+import asyncio
+import struct
+import time
+from collections import deque
+from typing import Any, Callable
+
+from fastapi import WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
+
+FRAME_HEADER = struct.Struct(">Q")
+
+
+class LatestFrameBuffer:
+    """Ограниченный буфер кадров с вытеснением самого старого."""
+
+    def __init__(self, capacity: int = 1):
+        self._frames: deque[tuple[int, float, bytes]] = deque(maxlen=capacity)
+        self._available = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, frame_id: int, payload: bytes) -> None:
+        if len(self._frames) == self._frames.maxlen:
+            self.dropped += 1       # deque сам вытеснит самый старый кадр
+        self._frames.append((frame_id, time.perf_counter(), payload))
+        self._available.set()
+
+    async def get(self) -> tuple[int, float, bytes]:
+        while not self._frames:
+            self._available.clear()
+            await self._available.wait()
+        return self._frames.popleft()
+
+
+async def serve_stream(
+    websocket: WebSocket,
+    predict: Callable[[bytes], list[dict[str, Any]]],
+    *,
+    capacity: int = 1,
+) -> None:
+    """
+    Обслуживает одно WebSocket-соединение: приём кадров и инференс идут
+    параллельно, результаты отправляются по мере готовности с frame_id кадра.
+    """
+    await websocket.accept()
+    buffer = LatestFrameBuffer(capacity)
+
+    async def receive_frames() -> None:
+        while True:
+            message = await websocket.receive_bytes()
+            if len(message) <= FRAME_HEADER.size:
+                await websocket.send_json({"frame_id": None, "error": "frame too short"})
+                continue
+            (frame_id,) = FRAME_HEADER.unpack_from(message)
+            buffer.put(frame_id, message[FRAME_HEADER.size:])
+
+    async def infer_frames() -> None:
+        while True:
+            frame_id, received_at, payload = await buffer.get()
+            try:
+                candidates = await run_in_threadpool(predict, payload)
+            except Exception as e:
+                await websocket.send_json({"frame_id": frame_id, "error": f"{type(e).__name__}: {e}"})
+                continue
+
+            result: dict[str, Any] = {
+                "frame_id": frame_id,
+                "latency_ms": round((time.perf_counter() - received_at) * 1e3, 3),
+                "dropped": buffer.dropped,
+            }
+            if candidates:
+                result.update({**candidates[0], "candidates": candidates})
+            else:
+                result["candidates"] = []
+            await websocket.send_json(result)
+
+    receiver = asyncio.create_task(receive_frames())
+    worker = asyncio.create_task(infer_frames())
+    try:
+        done, _ = await asyncio.wait({receiver, worker}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
+    finally:
+        receiver.cancel()
+        worker.cancel()
@@ -0,0 +1,8 @@
+# src/vision_service/orchestration/fleet/__init__.py
+from .supervisor import FleetConfig, FleetSupervisor, WorkerHandle
+
+__all__ = [
+    "FleetConfig",
+    "FleetSupervisor",
+    "WorkerHandle",
+]
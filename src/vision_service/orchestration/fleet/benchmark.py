@@ -0,0 +1,112 @@
+# src/vision_service/orchestration/fleet/benchmark.py
+"""
+Бенчмарк масштабирования флота: пропускная способность и задержки при 1..8 воркерах.
+
+Модель-заглушка работает в режиме VISION_STUB_CPU_BOUND=1 (держит GIL, как
+настоящий инференс на CPU), клиенты шлют кадры с фиксированной параллельностью.
+Запуск: PYTHONPATH=src python -m vision_service.orchestration.fleet.benchmark
+"""
+from __future__ import annotations
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+DISPATCHER_MODULE = "vision_service.orchestration.fleet.bootstrap"
+
+
+def _start_fleet(workers: int, port: int) -> tuple[subprocess.Popen, socket.socket]:
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+
+    env = os.environ.copy()
+    env.update({
+        "PYTHONPATH": str(REPO_ROOT / "src"),
+        "VISION_PORT": str(port),
+        "VISION_WORKERS": str(workers),
+        "VISION_READY_ADDR": "{}:{}".format(*listener.getsockname()),
+        "VISION_EXIT_WITH_PARENT": "1",
+        "VISION_STUB_CPU_BOUND": "1",
+        "VISION_WARMUP_RUNS": "1",
+        "VISION_CACHE_SIZE": "0",       # один и тот же кадр иначе отдавался бы из кэша
+    })
+    proc = subprocess.Popen(
+        [sys.executable, "-m", DISPATCHER_MODULE],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return proc, listener
+
+def _wait_ready(listener: socket.socket, timeout_s: float = 60.0) -> float:
+    st = time.perf_counter()
+    listener.settimeout(timeout_s)
+    conn, _ = listener.accept()
+    with conn:
+        conn.recv(64)
+    return time.perf_counter() - st
+
+def _load(url: str, image: bytes, concurrency: int, duration_s: float) -> list[float]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration_s
+
+    def client() -> None:
+        local: list[float] = []
+        with httpx.Client(timeout=10.0) as http:
+            while time.perf_counter() < deadline:
+                st = time.perf_counter()
+                r = http.post(url, files={"image": ("frame.jpg", image, "image/jpeg")})
+                r.raise_for_status()
+                local.append(time.perf_counter() - st)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies
+
+
+if __name__ == "__main__":
+    def main():
+        port = 18010
+        concurrency = 8
+        duration_s = 5.0
+        frame = REPO_ROOT / "test_data" / "frame.jpg"
+        image = frame.read_bytes() if frame.exists() else b"\xff\xd8" + bytes(50_000)
+
+        print(f"cpu={os.cpu_count()}, клиентов {concurrency}, {duration_s:.0f} с на замер")
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            proc, listener = _start_fleet(workers, port)
+            try:
+                ready_s = _wait_ready(listener)
+                lat = _load(f"http://127.0.0.1:{port}/predict", image, concurrency, duration_s)
+            finally:
+                listener.close()
+                proc.stdin.close()      # воркеры и диспетчер выходят вслед за родителем
+                proc.wait(timeout=10)
+
+            rps = len(lat) / duration_s
+            baseline = baseline or rps
+            q = statistics.quantiles(lat, n=20)
+            print(
+                f"workers={workers}: {rps:6.1f} req/s (x{rps / baseline:.2f}), "
+                f"p50 {statistics.median(lat) * 1e3:6.1f} ms, p95 {q[18] * 1e3:6.1f} ms, "
+                f"старт {ready_s:.1f} с"
+            )
+            port += 100
+    main()
@@ -0,0 +1,209 @@
+# src/vision_service/orchestration/fleet/bootstrap.py
+"""
+Режим флота: N процессов-воркеров с моделью за одним диспетчером на VISION_PORT.
+
+Диспетчер отправляет каждый /predict наименее загруженному готовому воркеру
+(меньше всего запросов в работе), /stream проксируется в один воркер на всё
+время соединения, /health и /ready агрегируют состояние флота.
+Запуск: python -m vision_service.orchestration.fleet.bootstrap (VISION_WORKERS=N).
+"""
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+import asyncio
+import os
+
+import httpx
+import uvicorn
+import websockets
+
+from vision_service.orchestration.app.readiness import ReadyNotifyingServer, exit_with_parent
+from vision_service.orchestration.fleet.supervisor import FleetConfig, FleetSupervisor, WorkerHandle
+
+VISION_HOST = os.getenv("VISION_HOST", "127.0.0.1")
+VISION_PORT = int(os.getenv("VISION_PORT", "8010"))
+VISION_WORKERS = int(os.getenv("VISION_WORKERS", "2"))
+VISION_WORKER_BASE_PORT = int(os.getenv("VISION_WORKER_BASE_PORT", str(VISION_PORT + 1)))
+VISION_WORKER_TIMEOUT_S = float(os.getenv("VISION_WORKER_TIMEOUT_S", "5.0"))
+
+
+def worker_json(r: httpx.Response) -> object | None:
+    """Тело ответа воркера как JSON; None — не JSON (например, HTML/текст 500 от uvicorn)."""
+    try:
+        return r.json()
+    except ValueError:
+        return None
+
+
+class FleetState:
+    def __init__(self, supervisor: FleetSupervisor, client: httpx.AsyncClient):
+        self.supervisor = supervisor
+        self.client = client
+        self.startup_done = asyncio.Event()     # все воркеры готовы или супервизор отказался от запуска
+
+    def pick_worker(self, exclude: set[int]) -> WorkerHandle | None:
+        """Наименее загруженный готовый воркер; при равенстве — тот, кто обслужил меньше."""
+        workers = [w for w in self.supervisor.ready_workers() if w.index not in exclude]
+        if not workers:
+            return None
+        return min(workers, key=lambda w: (w.inflight, w.served))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    loop = asyncio.get_running_loop()
+    state: FleetState | None = None
+
+    def on_change() -> None:
+        # вызывается из потоков супервизора
+        if state is not None and (state.supervisor.all_ready() or state.supervisor.failure is not None):
+            loop.call_soon_threadsafe(state.startup_done.set)
+
+    supervisor = FleetSupervisor(
+        FleetConfig(workers=VISION_WORKERS, base_port=VISION_WORKER_BASE_PORT),
+        on_change=on_change,
+    )
+    limits = httpx.Limits(max_connections=VISION_WORKERS * 16, max_keepalive_connections=VISION_WORKERS * 4)
+    state = FleetState(supervisor, httpx.AsyncClient(timeout=VISION_WORKER_TIMEOUT_S, limits=limits))
+    app.state.fleet = state
+
+    supervisor.start()
+    try:
+        yield
+    finally:
+        await state.client.aclose()
+        await asyncio.to_thread(supervisor.stop)
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/health")
+def health():
+    """Диспетчер жив; ok — хотя бы один воркер жив."""
+    state: FleetState = app.state.fleet
+    workers = [w.as_dict() for w in state.supervisor.workers]
+    return {"ok": any(w["alive"] for w in workers), "workers": workers}
+
+@app.get("/ready")
+def ready():
+    state: FleetState = app.state.fleet
+    ready_count = len(state.supervisor.ready_workers())
+    content = {
+        "ready": ready_count > 0,
+        "ready_workers": ready_count,
+        "workers": len(state.supervisor.workers),
+    }
+    return JSONResponse(status_code=200 if ready_count else 503, content=content)
+
+@app.get("/stats")
+async def stats():
+    """/stats каждого готового воркера."""
+    state: FleetState = app.state.fleet
+
+    async def fetch(worker: WorkerHandle) -> dict[str, object]:
+        try:
+            r = await state.client.get(f"http://127.0.0.1:{worker.port}/stats")
+        except httpx.TransportError as e:
+            return {"index": worker.index, "error": str(e)}
+        body = worker_json(r)
+        if not isinstance(body, dict):
+            return {"index": worker.index, "error": f"HTTP {r.status_code}: ответ не JSON-объект"}
+        return {"index": worker.index, **body}
+
+    return {"workers": await asyncio.gather(*(fetch(w) for w in state.supervisor.ready_workers()))}
+
+@app.post("/predict")
+async def predict(
+    image: UploadFile = File(...),
+    camera: str | None = Form(None),
+    roi: str | None = Form(None),
+):
+    state: FleetState = app.state.fleet
+    fields = {k: v for k, v in (("camera", camera), ("roi", roi)) if v is not None}
+    content = await image.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="empty image")
+
+    tried: set[int] = set()
+    while True:
+        worker = state.pick_worker(exclude=tried)
+        if worker is None:
+            raise HTTPException(status_code=503, detail="no ready vision workers")
+
+        worker.inflight += 1
+        try:
+            r = await state.client.post(
+                f"http://127.0.0.1:{worker.port}/predict",
+                files={"image": (image.filename or "frame.jpg", content, image.content_type or "image/jpeg")},
+                data=fields,
+            )
+        except httpx.TransportError:
+            # воркер упал или завис — убираем из ротации и пробуем следующий
+            state.supervisor.mark_unready(worker)
+            tried.add(worker.index)
+            continue
+        finally:
+            worker.inflight -= 1
+
+        worker.served += 1
+        body = worker_json(r)
+        if body is None:
+            raise HTTPException(
+                status_code=502,
+                detail=f"vision worker #{worker.index} returned HTTP {r.status_code} without JSON body",
+            )
+        return JSONResponse(status_code=r.status_code, content=body)
+
+@app.websocket("/stream")
+async def stream(websocket: WebSocket):
+    """Поток кадров целиком обслуживает один воркер; соединение считается как запрос в работе."""
+    state: FleetState = app.state.fleet
+    worker = state.pick_worker(exclude=set())
+    if worker is None:
+        await websocket.close(code=1013, reason="no ready vision workers")
+        return
+
+    worker.inflight += 1
+    try:
+        query = f"?{websocket.url.query}" if websocket.url.query else ""
+        async with websockets.connect(f"ws://127.0.0.1:{worker.port}/stream{query}", max_size=None) as upstream:
+            await websocket.accept()
+
+            async def client_to_worker() -> None:
+                while True:
+                    await upstream.send(await websocket.receive_bytes())
+
+            async def worker_to_client() -> None:
+                async for message in upstream:
+                    await websocket.send_text(message)
+                    worker.served += 1
+
+            tasks = {asyncio.create_task(client_to_worker()), asyncio.create_task(worker_to_client())}
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in pending:
+                task.cancel()
+            for task in done:
+                exc = task.exception()
+                if exc is not None and not isinstance(exc, (WebSocketDisconnect, websockets.ConnectionClosed)):
+                    raise exc
+    except websockets.InvalidStatus as e:
+        # воркер отклонил соединение (неизвестная камера, плохой roi) — воркер исправен
+        await websocket.close(code=1008, reason=f"stream rejected: {e.response.status_code}")
+    except (OSError, websockets.WebSocketException):
+        state.supervisor.mark_unready(worker)
+        await websocket.close(code=1011, reason="vision worker failed")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        worker.inflight -= 1
+
+def main():
+    exit_with_parent()
+    config = uvicorn.Config(app, host=VISION_HOST, port=VISION_PORT, log_level="info")
+    ReadyNotifyingServer(
+        config,
+        wait_ready=lambda: app.state.fleet.startup_done.wait(),
+        failure=lambda: app.state.fleet.supervisor.failure,
+    ).run()
+
+if __name__ == "__main__":
+    main()
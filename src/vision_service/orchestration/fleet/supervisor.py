@@ -0,0 +1,227 @@
+# src/vision_service/orchestration/fleet/supervisor.py
+"""
+Супервизор флота vision-воркеров.
+
+Каждый воркер — отдельный процесс vision_service.orchestration.app.bootstrap
+со своей копией модели и своим GIL, слушает 127.0.0.1:<base_port + i>.
+Готовность воркеры присылают на общий сокет (VISION_READY_ADDR), упавшие
+воркеры перезапускаются с нарастающей задержкой. Воркер, который ни разу не стал
+готовым и упал max_start_failures раз подряд (например, прогрев модели падает
+всегда), больше не перезапускается: флот не запустится, причина — в failure.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Callable
+
+WORKER_MODULE = "vision_service.orchestration.app.bootstrap"
+
+
+@dataclass
+class WorkerHandle:
+    index: int
+    port: int
+    proc: subprocess.Popen | None = None
+    ready: bool = False
+    started_at: float = 0.0
+    restarts: int = 0
+    crash_streak: int = 0
+    next_restart_at: float = 0.0
+    suspect: bool = False       # диспетчер получил ошибку соединения, нужна проверка /ready
+    ever_ready: bool = False
+    start_failures: int = 0     # падений подряд, пока воркер ни разу не был готов
+    last_failure: str | None = None     # причина из последнего 'failed'
+    given_up: bool = False      # больше не перезапускается
+    # счётчики маршрутизации, меняются только из event loop диспетчера
+    inflight: int = 0
+    served: int = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "index": self.index,
+            "port": self.port,
+            "pid": self.proc.pid if self.proc else None,
+            "alive": self.alive,
+            "ready": self.ready,
+            "inflight": self.inflight,
+            "served": self.served,
+            "restarts": self.restarts,
+        }
+
+
+@dataclass
+class FleetConfig:
+    workers: int
+    base_port: int
+    watch_interval_s: float = 0.5
+    stable_after_s: float = 10.0        # воркер, проживший дольше, сбрасывает серию падений
+    max_backoff_s: float = 30.0
+    max_start_failures: int = 3         # падений подряд до первой готовности, после — отказ флота
+    extra_env: dict[str, str] = field(default_factory=dict)
+
+
+class FleetSupervisor:
+    def __init__(self, cfg: FleetConfig, on_change: Callable[[], None] | None = None):
+        self.cfg = cfg
+        self.workers = [WorkerHandle(index=i, port=cfg.base_port + i) for i in range(cfg.workers)]
+        self._by_port = {w.port: w for w in self.workers}
+        self._on_change = on_change or (lambda: None)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.failure: str | None = None     # супервизор отказался от воркера — флот не будет готов
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(cfg.workers)
+        self._ready_addr = "{}:{}".format(*self._listener.getsockname())
+
+    # ---------------------- ЗАПУСК / ОСТАНОВКА ----------------------
+    def start(self) -> None:
+        for worker in self.workers:
+            self._spawn(worker)
+        threading.Thread(target=self._ready_loop, name="FleetReady", daemon=True).start()
+        threading.Thread(target=self._watch_loop, name="FleetWatch", daemon=True).start()
+
+    def stop(self, grace_s: float = 5.0) -> None:
+        self._stop.set()
+        self._listener.close()
+        with self._lock:
+            procs = [w.proc for w in self.workers if w.alive]
+        for proc in procs:
+            proc.terminate()
+        deadline = time.monotonic() + grace_s
+        for proc in procs:
+            try:
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    def _spawn(self, worker: WorkerHandle) -> None:
+        env = os.environ.copy()
+        env.update(self.cfg.extra_env)
+        env["VISION_HOST"] = "127.0.0.1"
+        env["VISION_PORT"] = str(worker.port)
+        env["VISION_READY_ADDR"] = self._ready_addr
+        env["VISION_EXIT_WITH_PARENT"] = "1"
+
+        with self._lock:
+            worker.ready = False
+            worker.suspect = False
+            worker.started_at = time.monotonic()
+            worker.proc = subprocess.Popen(
+                [sys.executable, "-m", WORKER_MODULE],
+                env=env,
+                stdin=subprocess.PIPE,      # закрытие pipe = сигнал воркеру завершиться
+            )
+        print(f"[fleet] воркер #{worker.index} запущен на порту {worker.port} (pid {worker.proc.pid})")
+
+    # ---------------------- ФОНОВЫЕ ПОТОКИ ----------------------
+    def _ready_loop(self) -> None:
+        """Принимает 'ready <port>' / 'failed <port> <причина>' от воркеров."""
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return      # сокет закрыт в stop()
+            with conn:
+                conn.settimeout(1.0)
+                try:
+                    message = conn.recv(256).decode(errors="replace").split(maxsplit=2)
+                except OSError:
+                    continue
+            try:
+                kind, worker = message[0], self._by_port.get(int(message[1]))
+            except (IndexError, ValueError):
+                # мусор на сокете не должен останавливать приём сигналов остальных воркеров
+                print(f"[fleet] некорректный сигнал готовности: {' '.join(message)!r}")
+                continue
+            if kind == "ready" and len(message) == 2:
+                if worker is not None:
+                    worker.ready = worker.ever_ready = True
+                    print(f"[fleet] воркер #{worker.index} готов")
+                    self._on_change()
+            elif kind == "failed":
+                # воркер завершается с кодом 1, _watch_loop перезапустит его с задержкой
+                if worker is not None:
+                    worker.ready = False
+                    worker.last_failure = " ".join(message[2:]) or None
+                    print(f"[fleet] воркер #{worker.index} не смог запуститься: {worker.last_failure}")
+                    self._on_change()
+
+    def _watch_loop(self) -> None:
+        """Перезапуск упавших воркеров с экспоненциальной задержкой."""
+        while not self._stop.wait(self.cfg.watch_interval_s):
+            now = time.monotonic()
+            for worker in self.workers:
+                if worker.alive and worker.suspect:
+                    self._probe(worker)
+                if worker.proc is None or worker.alive or worker.given_up:
+                    continue
+
+                if worker.next_restart_at == 0.0:
+                    # Только что заметили падение — планируем перезапуск
+                    if not worker.ever_ready:
+                        worker.start_failures += 1
+                        if worker.start_failures >= self.cfg.max_start_failures:
+                            self._give_up(worker)
+                            continue
+                    lifetime = now - worker.started_at
+                    worker.crash_streak = 0 if lifetime >= self.cfg.stable_after_s else worker.crash_streak + 1
+                    delay = min(self.cfg.max_backoff_s, 0.5 * 2 ** worker.crash_streak)
+                    worker.ready = False
+                    worker.next_restart_at = now + delay
+                    print(
+                        f"[fleet] воркер #{worker.index} завершился с кодом {worker.proc.returncode}, "
+                        f"перезапуск через {delay:.1f} с"
+                    )
+                    self._on_change()
+                elif now >= worker.next_restart_at and not self._stop.is_set():
+                    worker.next_restart_at = 0.0
+                    worker.restarts += 1
+                    self._spawn(worker)
+
+    def _give_up(self, worker: WorkerHandle) -> None:
+        worker.given_up = True
+        worker.ready = False
+        self.failure = (
+            f"воркер #{worker.index} не запустился {worker.start_failures} раз подряд "
+            f"(код {worker.proc.returncode}): {worker.last_failure or 'причина не сообщена'}"
+        )
+        print(f"[fleet] {self.failure}, перезапусков больше не будет")
+        self._on_change()
+
+    def _probe(self, worker: WorkerHandle) -> None:
+        """Живой, но подозрительный воркер возвращается в ротацию, если /ready снова отвечает."""
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{worker.port}/ready", timeout=0.5) as r:
+                ok = r.status == 200
+        except OSError:
+            ok = False
+        if ok:
+            worker.suspect = False
+            worker.ready = True
+            self._on_change()
+
+    # ---------------------- СОСТОЯНИЕ ----------------------
+    def ready_workers(self) -> list[WorkerHandle]:
+        return [w for w in self.workers if w.ready and w.alive]
+
+    def all_ready(self) -> bool:
+        return all(w.ready and w.alive for w in self.workers)
+
+    def mark_unready(self, worker: WorkerHandle) -> None:
+        """Диспетчер не смог достучаться до воркера — до следующего 'ready' не маршрутизируем."""
+        worker.ready = False
+        worker.suspect = True
+        self._on_change()
@@ -0,0 +1,156 @@
+# tests/test_protocol_codec.py
+"""
+Кодеки команды выгрузки robot_regs_v1/v2/v3: round-trip, ширина полей SR v1,
+диапазоны номеров, число осей позы и нумерация банков v3 (encode / reset_writes).
+"""
+import random
+
+import pytest
+
+pytest.importorskip("Agilebot")     # пакет orchestration тянет SDK робота
+
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.protocol.codec import (
+    UnloaderCommand,
+    get_unloader_codec,
+)
+from src.vision_guided_robot_navigation.orchestration.runtime.robots.protocol.registry import ProtocolError
+
+POSE = (450.0, -42.0, 110.0, 180.0, 0.0, 90.0)
+WIDE_POSE = (450.0, -420.0, 110.0, 180.0, 0.0, 90.0)    # -420.000 — 8 знаков, шире поля v1
+
+
+@pytest.fixture(scope="module")
+def codecs():
+    return {n: get_unloader_codec(f"robot_regs_v{n}") for n in (1, 2, 3)}
+
+
+def random_commands(count: int, limit: float):
+    rng = random.Random(0)
+
+    def pose(lim: float):
+        return tuple(round(rng.uniform(-lim, lim), 3) for _ in range(6))
+
+    return [UnloaderCommand(rng.randint(0, 99), rng.randint(0, 99), pose(limit), pose(900.0)) for _ in range(count)]
+
+
+# ---------- round-trip ----------
+@pytest.mark.parametrize("version", [1, 2])
+def test_round_trip(codecs, version):
+    codec = codecs[version]
+    for command in random_commands(2000, 99.0):
+        assert codec.decode(codec.encode(command)) == command
+
+
+def test_round_trip_v3(codecs):
+    codec = codecs[3]
+    for seq, command in enumerate(random_commands(2000, 99.0), start=1):
+        assert codec.decode(codec.encode(command, seq)) == command
+
+
+def test_round_trip_without_place_pose(codecs):
+    command = UnloaderCommand(1, 3, POSE)
+    assert codecs[1].decode(codecs[1].encode(command)) == command
+    assert codecs[2].decode(codecs[2].encode(command)) == command
+    assert codecs[3].decode(codecs[3].encode(command, 1)) == command
+
+
+def test_v2_keeps_full_precision(codecs):
+    command = UnloaderCommand(1, 3, (450.123456, -420.5, 110.0, 180.0, 0.0, 90.0))
+    assert codecs[2].decode(codecs[2].encode(command)) == command
+
+
+# ---------- ширина и диапазоны ----------
+def test_v1_rejects_value_wider_than_field(codecs):
+    with pytest.raises(ProtocolError, match="y=-420.000"):
+        codecs[1].encode(UnloaderCommand(1, 3, WIDE_POSE))
+
+
+def test_v2_accepts_value_too_wide_for_v1(codecs):
+    command = UnloaderCommand(1, 3, WIDE_POSE)
+    assert codecs[2].decode(codecs[2].encode(command)) == command
+
+
+@pytest.mark.parametrize(
+    "version, tripod, slot",
+    [
+        (1, 100, 0),
+        (1, 0, 100),
+        (1, -1, 0),         # "%02d" % -1 == "-1" — ширина совпадает, диапазон нет
+        (1, 0, -1),
+        (2, 1000, 0),
+        (2, 0, -1),
+        (3, 1000, 0),
+        (1, 1.0, 0),        # номер — только целое
+        (2, 1, 2.5),
+    ],
+)
+def test_index_out_of_range(codecs, version, tripod, slot):
+    codec = codecs[version]
+    command = UnloaderCommand(tripod, slot, POSE)
+    with pytest.raises(ProtocolError):
+        codec.encode(command, 1) if version == 3 else codec.encode(command)
+
+
+@pytest.mark.parametrize("version", [1, 2, 3])
+@pytest.mark.parametrize("axes", [5, 7])
+def test_wrong_axis_count(codecs, version, axes):
+    codec = codecs[version]
+    command = UnloaderCommand(1, 3, tuple(float(i) for i in range(axes)))
+    with pytest.raises(ProtocolError, match="6 осей"):
+        codec.encode(command, 1) if version == 3 else codec.encode(command)
+
+
+def test_v1_decode_rejects_broken_string(codecs):
+    codec = codecs[1]
+    writes = codec.encode(UnloaderCommand(1, 3, POSE))
+    (register,) = writes.sr
+    writes.sr[register] = writes.sr[register][:-1]
+    with pytest.raises(ProtocolError):
+        codec.decode(writes)
+
+
+# ---------- банки v3 ----------
+def banks(codec):
+    return [
+        (
+            codec.registers.require("nr", f"tripod_{b}", f"slot_{b}", f"bank_seq_{b}"),
+            codec.registers.require("pr", f"tube_dump_{b}", f"tripod_place_{b}"),
+        )
+        for b in range(codec.BANKS)
+    ]
+
+
+@pytest.mark.parametrize("seq", [1, 2, 3, 4, 101])
+def test_v3_writes_into_bank_seq_mod_banks(codecs, seq):
+    codec = codecs[3]
+    command = UnloaderCommand(2, 7, POSE, WIDE_POSE)
+    writes = codec.encode(command, seq)
+    (tripod, slot, bank_seq), (tube_dump, tripod_place) = banks(codec)[seq % codec.BANKS]
+    assert writes.nr == {tripod: 2, slot: 7}
+    assert writes.pr == {tube_dump: POSE, tripod_place: WIDE_POSE}
+    assert writes.commit == {bank_seq: seq}     # номер команды — последней записью
+    assert writes.sr == {}
+
+
+def test_v3_rejects_seq_below_one(codecs):
+    with pytest.raises(ProtocolError):
+        codecs[3].encode(UnloaderCommand(1, 3, POSE), 0)
+
+
+def test_v3_reset_writes_precede_first_command_of_each_bank(codecs):
+    codec = codecs[3]
+    reset = codec.reset_writes()
+    bank_layout = banks(codec)
+    assert reset.nr == {} and reset.pr == {} and reset.sr == {}
+    # контроллер ждёт команду N, пока bank_seq её банка == N - BANKS
+    for seq in range(1, 2 * codec.BANKS + 1):
+        (_, _, bank_seq), _ = bank_layout[seq % codec.BANKS]
+        previous = reset.commit[bank_seq] if seq <= codec.BANKS else seq - codec.BANKS
+        assert previous == seq - codec.BANKS
+
+
+def test_v3_decode_without_commit(codecs):
+    writes = codecs[3].encode(UnloaderCommand(1, 3, POSE), 1)
+    writes.commit.clear()
+    with pytest.raises(ProtocolError):
+        codecs[3].decode(writes)